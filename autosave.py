@@ -0,0 +1,103 @@
+"""
+Debounced background autosave.
+
+GameApp collects a save payload on the Tk thread at the end of every turn
+(cheap: strings and dicts it already holds) and hands it to AutosaveService.
+The service waits until no new payload has arrived for `delay` seconds, then
+writes only the newest one on its own thread, so a burst of quick turns costs
+one write and the Tk loop never waits on the disk.
+
+All writes, background or not, go through the same lock, so an explicit save
+(returning to the menu, closing the window) simply waits for an autosave that
+is already running and replaces any that is still pending.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+AUTOSAVE_THREAD_NAME = "autosave"
+
+
+class AutosaveService:
+    def __init__(self, write_fn: Callable[[dict], None], delay: float = 2.0):
+        self.write_fn = write_fn
+        self.delay = delay
+        self.write_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._pending: Optional[tuple] = None
+        self._due = 0.0
+        self._stopped = False
+        # Payloads are numbered so a stale one can never overwrite a newer save
+        self._seq = 0
+        self._written_seq = 0
+
+        # Stats
+        self.last_save_ms: Optional[float] = None
+        self.last_error: Optional[Exception] = None
+        self.saves = 0
+        self.coalesced = 0
+
+        self._thread = threading.Thread(target=self._run, name=AUTOSAVE_THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    # ---------- Scheduling ----------
+
+    def request(self, payload: dict) -> None:
+        """Queues payload for writing after the debounce delay; replaces any pending payload."""
+        with self._cond:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._seq += 1
+            self._pending = (self._seq, payload)
+            self._due = time.monotonic() + self.delay
+            self._cond.notify()
+
+    def cancel(self) -> None:
+        """Drops a pending (not yet started) autosave."""
+        with self._cond:
+            self._pending = None
+
+    def save_now(self, payload: dict) -> None:
+        """Writes payload on the calling thread, superseding any pending autosave."""
+        with self._cond:
+            self._pending = None
+            self._seq += 1
+            seq = self._seq
+        self._write(seq, payload)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    # ---------- Worker ----------
+
+    def _write(self, seq: int, payload: dict) -> None:
+        with self.write_lock:
+            if seq < self._written_seq:
+                return
+            self._written_seq = seq
+            start = time.perf_counter()
+            try:
+                self.write_fn(payload)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                print(f"Save failed: {e}")
+                return
+            self.last_save_ms = (time.perf_counter() - start) * 1000
+            self.saves += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped and (self._pending is None or time.monotonic() < self._due):
+                    timeout = None if self._pending is None else max(0.0, self._due - time.monotonic())
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                (seq, payload), self._pending = self._pending, None
+            self._write(seq, payload)
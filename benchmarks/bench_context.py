@@ -0,0 +1,113 @@
+"""
+Context serializer benchmark.
+
+Builds a synthetic game state (200 inventory items by default, plus skills and
+tasks) and compares the tab text the prompt used to carry (tabulate grids, as
+rendered by the tabs' get_text) with context_serializer's compact sections:
+estimated tokens per section, serialization time, and a cached turn.
+
+    python benchmarks/bench_context.py [items]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabulate import tabulate  # noqa: E402
+
+from context_serializer import (ContextSerializer, estimate_tokens, serialize_inventory,  # noqa: E402
+                                serialize_processing, serialize_skills)
+from inventory_model import Item, ItemMeta  # noqa: E402
+
+ADJECTIVES = ["Rusty", "Fine", "Heavy", "Elven", "Cracked", "Gleaming", "Old", "Small", "Large", "Sturdy"]
+NOUNS = ["Sword", "Shield", "Potion", "Rope", "Lantern", "Dagger", "Helmet", "Ring", "Bread", "Hammer"]
+CATEGORIES = ["Weapons", "Armor", "Tools", "Materials", "Food", "Valuables"]
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"  {label:<42} {ms:10.4f} ms")
+    return result
+
+
+def build_state(n_items):
+    rng = random.Random(42)
+    inventory = {}
+    for i in range(n_items):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        meta = ItemMeta(type="food", meals=rng.randint(1, 4), spoil_day=f"Day {rng.randint(2, 9)}",
+                        spoil_time="6:00 PM") if category == "Food" else None
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}"
+        inventory.setdefault(category, []).append(
+            Item(name, "A synthetic benchmark item with a short description.", rng.randint(1, 20), f"{rng.randint(1, 99)} Bits", meta))
+    skills = [{"Name": f"Skill {i}", "Level": rng.randint(0, 5), "XP": rng.randint(0, 4), "Threshold": 5} for i in range(15)]
+    tasks = [{"type": "process", "name": f"Tanning {i}", "desc": "Curing hides.", "status": "ACTIVE",
+              "target_abs_minutes": 3000 + 60 * i, "yield": "2 Leather"} for i in range(5)]
+    return inventory, skills, tasks
+
+
+# The tabs' get_text() output, which used to be sent as-is
+
+def old_inventory_text(data):
+    text = "INVENTORY\n"
+    for category in sorted(data.keys()):
+        rows = []
+        for item in data[category]:
+            desc = item.desc
+            if item.meta is not None and item.meta.meals is not None:
+                desc += f" [Meals: {item.meta.meals}, Spoils: Day {item.meta.spoil_day} at {item.meta.spoil_time}.]"
+            rows.append((item.name, desc, item.amount_display, item.value.raw))
+        text += f"\n{category}\n" + tabulate(rows, ["Name", "Description", "Amount", "Value (each)"], tablefmt="simple_grid") + "\n"
+    return text
+
+
+def old_skills_text(data):
+    rows = [(s["Name"], f"+{s['Level']}", s["XP"], s["Threshold"]) for s in data]
+    return "SKILLS\n" + tabulate(rows, ["Skill", "Level", "XP", "Threshold"], tablefmt="simple_grid")
+
+
+def main():
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    inventory, skills, tasks = build_state(n_items)
+
+    print(f"{n_items:,} items, {len(skills)} skills, {len(tasks)} tasks")
+    print("Estimated tokens (tab text -> compact)")
+    pairs = [
+        ("Inventory", old_inventory_text(inventory), serialize_inventory(inventory)),
+        ("Skills", old_skills_text(skills), serialize_skills(skills)),
+    ]
+    total_old = total_new = 0
+    for name, old, new in pairs:
+        old_tokens, new_tokens = estimate_tokens(old), estimate_tokens(new)
+        total_old += old_tokens
+        total_new += new_tokens
+        print(f"  {name:<12} {old_tokens:8,} -> {new_tokens:8,}  ({new_tokens / old_tokens:.0%})")
+    print(f"  {'total':<12} {total_old:8,} -> {total_new:8,}  ({total_new / total_old:.0%})")
+
+    print("Serialization (per turn)")
+    timed("tab text (old)", lambda: (old_inventory_text(inventory), old_skills_text(skills)), repeat=20)
+    timed("compact, all sections", lambda: (serialize_inventory(inventory), serialize_skills(skills),
+                                            serialize_processing(tasks)), repeat=20)
+
+    context = ContextSerializer()
+    revision = [0]
+
+    def turn():
+        # Only the inventory "changes" every turn; the other sections come from the cache
+        revision[0] += 1
+        context.section("Inventory", revision[0], lambda: serialize_inventory(inventory))
+        context.section("Skills", 0, lambda: serialize_skills(skills))
+        context.section("Processing", 0, lambda: serialize_processing(tasks))
+
+    timed("compact, inventory changed", turn, repeat=20)
+    print(f"  rebuilds: {dict(context.rebuilds)}")
+
+
+if __name__ == "__main__":
+    main()
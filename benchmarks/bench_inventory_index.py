@@ -0,0 +1,90 @@
+"""
+Inventory name index benchmark.
+
+Builds a synthetic inventory (100k items by default) and compares the old
+linear scans with InventoryIndex: building the index, exact lookups, fuzzy
+lookups for model-style names, and keeping the index in step with adds/removes.
+
+    python benchmarks/bench_inventory_index.py [items]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inventory_index import InventoryIndex  # noqa: E402
+from inventory_model import Item  # noqa: E402
+
+ADJECTIVES = ["Rusty", "Fine", "Heavy", "Elven", "Cracked", "Gleaming", "Old", "Small", "Large", "Sturdy"]
+NOUNS = ["Sword", "Shield", "Potion", "Rope", "Lantern", "Dagger", "Helmet", "Ring", "Bread", "Hammer"]
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"  {label:<42} {ms:10.4f} ms")
+    return result
+
+
+def build_inventory(n_items):
+    rng = random.Random(42)
+    inventory = {}
+    for i in range(n_items):
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}"
+        inventory.setdefault(f"Category{i % 50}", []).append(Item(name, "A synthetic benchmark item.", 1, "3 Bits"))
+    return inventory
+
+
+def linear_exact(data, name):
+    for cat, items in data.items():
+        for item in items:
+            if item.name.lower() == name.lower():
+                return cat, item
+    return None
+
+
+def main():
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    data = build_inventory(n_items)
+    names = [item.name for items in data.values() for item in items]
+    rng = random.Random(7)
+    probes = [rng.choice(names) for _ in range(200)]
+
+    print(f"{n_items:,} items")
+    index = InventoryIndex()
+    timed("build index", lambda: index.rebuild(data))
+
+    print("Exact lookup (per call)")
+    it = iter(probes * 50)
+    timed("linear scan (old)", lambda: linear_exact(data, next(it)), repeat=20)
+    timed("index.resolve", lambda: index.resolve(next(it)), repeat=1000)
+
+    print("Fuzzy lookup (per call)")
+    fuzzy = [p.lower().replace("sword", "swrod") for p in probes[:20]] + [f"the {p}" for p in probes[:20]]
+    timed("first call (builds trigram postings)", lambda: index.resolve(fuzzy[-1]))
+    queries = iter(fuzzy)
+    timed("index.resolve (typos / extra words)", lambda: index.resolve(next(queries)), repeat=len(fuzzy))
+    results = [index.resolve(q) for q in fuzzy]
+    hits = sum(1 for r in results if r.match is not None)
+    print(f"  resolved {hits}/{len(fuzzy)} fuzzy names")
+
+    print("Maintenance (per mutation)")
+    cat = "Category0"
+
+    def add_remove():
+        item = Item(f"Benchmark Item {rng.random()}", "", 1, "0")
+        data[cat].append(item)
+        index.added(cat, item)
+        data[cat].pop()
+        index.removed(cat, item)
+
+    timed("add + remove", add_remove, repeat=1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Inventory item representation benchmark: raw dicts vs inventory_model.Item.
+
+Measures memory per item (tracemalloc) for a synthetic inventory (100k items by
+default), the cost of stacking/removing amounts the way the tag handlers do,
+and the decode/encode cost paid at the serialization boundary.
+
+    python benchmarks/bench_item_model.py [items]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inventory_model import decode_inventory, encode_inventory  # noqa: E402
+
+DESCRIPTIONS = ["A sturdy tool.", "Smells faintly of smoke.", "Standard issue.", "Hand-made by a local smith."]
+VALUES = ["3 Bits", "5 Marks", "1 Crown", "N/A", "12 Bits"]
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"  {label:<42} {ms:10.3f} ms")
+    return result
+
+
+def build_raw(n_items):
+    rng = random.Random(42)
+    inventory = {}
+    for i in range(n_items):
+        item = {"name": f"Item {i}", "desc": rng.choice(DESCRIPTIONS), "amount": str(rng.randint(1, 9)),
+                "value": rng.choice(VALUES)}
+        if i % 10 == 0:
+            item["meta"] = {"type": "food", "meals": 3, "spoil_day": "Day 12", "spoil_time": "6:00 PM"}
+        inventory.setdefault(f"Category{i % 50}", []).append(item)
+    # Round-trip through JSON so strings are separate objects, as they are after loading a save
+    return json.loads(json.dumps(inventory))
+
+
+def measure(label, build, n_items):
+    tracemalloc.start()
+    data = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<42} {size / n_items:10.1f} bytes/item")
+    return data
+
+
+def main():
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    text = json.dumps(build_raw(n_items))
+    print(f"{n_items:,} items")
+
+    print("Memory")
+    raw = measure("dicts (json.loads)", lambda: json.loads(text), n_items)
+    typed = measure("Items (json.loads + decode)", lambda: decode_inventory(json.loads(text)), n_items)
+
+    print("Mutations (stack +2 then remove 2, every item)")
+
+    def dict_mutations():
+        for items in raw.values():
+            for item in items:
+                item["amount"] = str(int(item["amount"]) + 2)
+                item["amount"] = str(int(item["amount"]) - 2)
+
+    def item_mutations():
+        for items in typed.values():
+            for item in items:
+                item.amount += 2
+                item.amount -= 2
+
+    timed("dicts (int()/str() per change)", dict_mutations)
+    timed("Items (int fields)", item_mutations)
+
+    print("Value parsing (sum of prices)")
+    timed("dicts (split + int per read)", lambda: sum(
+        int(i["value"].split()[0]) for items in raw.values() for i in items if i["value"][0].isdigit()))
+    timed("Items (pre-parsed)", lambda: sum(
+        i.value.amount for items in typed.values() for i in items if i.value.amount is not None))
+
+    print("Serialization boundary")
+    timed("decode (dicts -> Items)", lambda: decode_inventory(raw))
+    timed("encode (Items -> dicts)", lambda: encode_inventory(typed))
+
+
+if __name__ == "__main__":
+    main()
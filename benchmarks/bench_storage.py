@@ -0,0 +1,132 @@
+"""
+JSON vs SQLite storage benchmark.
+
+Builds a synthetic adventure (100k inventory items, 1M history lines by default)
+in a temp folder and times the operations the game actually performs:
+load, a case-insensitive item lookup, a due-task query, reading the history tail
+and committing one mutation. Each commit changes one item first: JSON rewrites the
+whole file, SQLite writes only the rows that differ from what it stored.
+
+    python benchmarks/bench_storage.py [items] [history_lines]
+"""
+
+import itertools
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlite_store  # noqa: E402
+from state_store import atomic_write_json  # noqa: E402
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"  {label:<38} {ms:10.2f} ms")
+    return result
+
+
+def build_fixture(folder, n_items, n_history):
+    rng = random.Random(42)
+    inventory = {}
+    for i in range(n_items):
+        cat = f"Category{i % 50}"
+        inventory.setdefault(cat, []).append(
+            {"name": f"Item {i}", "desc": "A synthetic benchmark item.", "amount": str(rng.randint(1, 9)), "value": "3 Bits"}
+        )
+    tasks = [
+        {"name": f"Task {i}", "desc": "", "type": "process", "yield": "x", "status": "In Progress",
+         "duration_hours": 1.0, "start_abs_minutes": 0, "target_abs_minutes": rng.randint(0, 100000)}
+        for i in range(2000)
+    ]
+    history = [f"GM: line {i} of the adventure so far." for i in range(n_history)]
+
+    atomic_write_json(os.path.join(folder, "inventory.json"), inventory)
+    atomic_write_json(os.path.join(folder, "skills.json"), [{"Name": "Carpentry", "Level": 2, "XP": 0, "Threshold": 9}])
+    atomic_write_json(os.path.join(folder, "processing.json"), tasks)
+    atomic_write_json(os.path.join(folder, "savegame.json"), {"Chat History": history, "Status": {"turn": "1"}, "is_creating": False})
+
+
+_changes = itertools.count(1)
+
+
+def change_one_item(inventory):
+    """Bumps the amount of one item, a different one each call, like a turn's single mutation."""
+    items = inventory["Category0"]
+    item = items[next(_changes) % len(items)]
+    item["amount"] = str(int(item["amount"]) % 9 + 1)
+
+
+def bench_json(folder, target):
+    print("JSON")
+    inv_path = os.path.join(folder, "inventory.json")
+
+    def load_inventory():
+        with open(inv_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    inventory = timed("load inventory.json", load_inventory)
+
+    def lookup():
+        for cat, items in inventory.items():
+            for item in items:
+                if item["name"].lower() == target.lower():
+                    return cat, item
+        return None
+
+    timed("lookup item by name (linear scan)", lookup, repeat=20)
+
+    def due_tasks():
+        with open(os.path.join(folder, "processing.json"), "r", encoding="utf-8") as f:
+            tasks = json.load(f)
+        return [t for t in tasks if t["status"] == "In Progress" and t["target_abs_minutes"] <= 5000]
+
+    timed("due tasks (load + scan)", due_tasks)
+
+    def history_tail():
+        with open(os.path.join(folder, "savegame.json"), "r", encoding="utf-8") as f:
+            return json.load(f)["Chat History"][-100:]
+
+    timed("history tail (100 lines)", history_tail)
+    timed("commit one changed item (rewrite)", lambda: (change_one_item(inventory), atomic_write_json(inv_path, inventory)),
+          repeat=5)
+
+
+def bench_sqlite(folder, target):
+    print("SQLite (WAL)")
+    timed("migrate JSON -> adventure.db", lambda: sqlite_store.migrate_json_to_sqlite(folder))
+    db = sqlite_store.SqliteAdventureStore.for_folder(folder)
+
+    inventory = timed("load inventory section", db.load_inventory)
+    timed("lookup item by name (index)", lambda: db.find_items(target), repeat=20)
+    timed("due tasks (index)", lambda: db.due_tasks(5000))
+    timed("history tail (100 lines)", lambda: db.history_tail(100))
+    timed("commit one changed item (diffed rows)", lambda: (change_one_item(inventory), db.save_inventory(inventory)),
+          repeat=5)
+    sqlite_store.close_all()
+
+
+def main():
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_history = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    folder = tempfile.mkdtemp(prefix="ai_adventure_bench_")
+    try:
+        print(f"Fixture: {n_items} items, {n_history} history lines")
+        build_fixture(folder, n_items, n_history)
+        target = f"ITEM {n_items - 1}"
+        bench_json(folder, target)
+        bench_sqlite(folder, target)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
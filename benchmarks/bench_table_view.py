@@ -0,0 +1,116 @@
+"""
+Inventory table rendering benchmark.
+
+Builds a synthetic inventory (10k rows by default) and compares the old refresh
+(tabulate the whole inventory, replace the textbox contents) with TableView:
+the initial load, and the cost of reflecting a single changed item.
+
+Needs a display (Tk window); it is created withdrawn.
+
+    python benchmarks/bench_table_view.py [rows]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tkinter as tk  # noqa: E402
+
+import customtkinter as ctk  # noqa: E402
+from tabulate import tabulate  # noqa: E402
+
+from ui.table_view import TableView  # noqa: E402
+
+HEADERS = ["Name", "Description", "Amount", "Value (each)"]
+NOUNS = ["Sword", "Shield", "Potion", "Rope", "Lantern", "Dagger", "Helmet", "Ring", "Bread", "Hammer"]
+
+
+def timed(label, fn, repeat=1, root=None):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+        if root is not None:
+            # Include Tk's own redraw in the measurement
+            root.update_idletasks()
+    ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"  {label:<42} {ms:10.4f} ms")
+    return result
+
+
+def build_inventory(n_rows):
+    rng = random.Random(42)
+    inventory = {}
+    for i in range(n_rows):
+        row = [f"{rng.choice(NOUNS)} {i}", "A synthetic benchmark item.", rng.randint(1, 20), f"{rng.randint(1, 99)} Bits"]
+        inventory.setdefault(f"Category{i % 20}", []).append(row)
+    return inventory
+
+
+def textbox_refresh(display, data):
+    # The pre-TableView refresh_display: one tabulate per category, whole text replaced
+    parts = []
+    for cat, rows in data.items():
+        parts.append(f"\n{cat.upper()}\n")
+        parts.append(tabulate(rows, headers=HEADERS, tablefmt="simple_grid"))
+    display.configure(state="normal")
+    display.delete("0.0", "end")
+    display.insert("0.0", "\n".join(parts))
+    display.configure(state="disabled")
+
+
+def table_load(table, data):
+    table.clear()
+    for cat, rows in data.items():
+        group = f"cat:{cat}"
+        table.upsert(group, [cat.upper(), "", "", ""], group=True)
+        for i, row in enumerate(rows):
+            table.upsert(f"item:{cat}:{i}", row, parent=group)
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    try:
+        root = ctk.CTk()
+    except tk.TclError as e:
+        print(f"No display available ({e}); this benchmark needs a Tk window.")
+        return
+    root.withdraw()
+
+    data = build_inventory(n_rows)
+    display = ctk.CTkTextbox(root, font=("Consolas", 14), wrap="none", state="disabled")
+    display.pack()
+    table = TableView(root, "INVENTORY", HEADERS)
+    table.pack()
+    rng = random.Random(7)
+    cat = "Category0"
+
+    print(f"{n_rows:,} rows")
+    print("Full render")
+    timed("textbox + tabulate (old)", lambda: textbox_refresh(display, data), root=root)
+    timed("TableView initial load", lambda: table_load(table, data), root=root)
+
+    print("One item changed (per refresh)")
+
+    def change_one():
+        row = rng.choice(data[cat])
+        row[2] = int(row[2]) + 1
+        return data[cat].index(row)
+
+    timed("textbox + tabulate (old)", lambda: (change_one(), textbox_refresh(display, data)), repeat=5, root=root)
+
+    def table_update():
+        i = change_one()
+        table.upsert(f"item:{cat}:{i}", data[cat][i], parent=f"cat:{cat}")
+
+    table.reset_ops()
+    timed("TableView.upsert", table_update, repeat=200, root=root)
+    print(f"  Tk row operations: {dict(table.ops)}")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Token budget for the per-turn prompt.
+
+Each candidate section lists variants, from the fullest to the smallest:
+
+    Inventory   full list -> items relevant to this turn -> category counts
+    History     every line we have -> as many recent lines as fit ("tail")
+    World       summary -> left out
+
+plan() works in two passes over the sections, which are given in priority order:
+
+    1. every section starts at its smallest variant, kept even over budget
+       (droppable sections end with an empty "left out" variant)
+    2. highest priority first, each section is upgraded to the fullest variant
+       that still fits in what is left; tail sections are cut to fit
+
+So the lowest-priority sections are the first to lose detail, and the
+degradation order is simply the reverse of the priority order. A section may
+be listed again further down with bigger variants: the inventory's relevant
+slice is placed before the recent history, its full list only after it.
+Variants may be callables, evaluated only when the planner looks at them.
+
+turn_sections() is the per-turn priority order GameApp plans with.
+
+Tokens are counted with context_serializer.estimate_tokens.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple, Union
+
+from context_serializer import estimate_tokens
+
+Text = Union[str, Callable[[], str]]
+
+
+@dataclass
+class Section:
+    name: str
+    variants: List[Tuple[str, Text]]      # (label, text), fullest first; "" means left out
+    tail: bool = False                    # the fullest variant may be cut to its last lines
+
+    def __post_init__(self):
+        self._resolved = {}
+
+    def variant(self, i: int) -> Tuple[str, str, int]:
+        """(label, text, tokens) of variant i."""
+        if i not in self._resolved:
+            label, text = self.variants[i]
+            text = text() if callable(text) else text
+            self._resolved[i] = (label, text or "", estimate_tokens(text or ""))
+        return self._resolved[i]
+
+
+@dataclass
+class Allocation:
+    name: str
+    label: str
+    text: str
+    tokens: int
+    full_tokens: int          # what the fullest variant would have cost
+
+
+@dataclass
+class ContextPlan:
+    budget: int
+    reserved: int
+    allocations: List[Allocation] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.reserved + sum(a.tokens for a in self.allocations)
+
+    def get(self, name: str) -> str:
+        for a in self.allocations:
+            if a.name == name:
+                return a.text
+        return ""
+
+    def summary(self) -> str:
+        parts = [f"rules={self.reserved}"]
+        for a in self.allocations:
+            part = f"{a.name}={a.tokens}"
+            if a.tokens != a.full_tokens:
+                part += f"/{a.full_tokens} ({a.label})"
+            parts.append(part)
+        return f"{self.total}/{self.budget} tokens: " + ", ".join(parts)
+
+
+def _fit_tail(text: str, tokens: int) -> Tuple[str, int]:
+    """The longest run of final lines of text within `tokens`."""
+    kept, used = [], 0
+    for line in reversed(text.split("\n")):
+        cost = estimate_tokens(line)
+        if used + cost > tokens:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(reversed(kept)), used
+
+
+class ContextBudget:
+    def __init__(self, budget_tokens: int):
+        self.budget = budget_tokens
+
+    def plan(self, sections: List[Section], reserved: int = 0) -> ContextPlan:
+        """sections in priority order, highest first. reserved: tokens already spent (the rules)."""
+        chosen = {}
+        for section in sections:
+            # A repeated name upgrades the first entry, which sets the starting variant
+            if section.name not in chosen:
+                chosen[section.name] = section.variant(len(section.variants) - 1)
+
+        left = self.budget - reserved - sum(tokens for _, _, tokens in chosen.values())
+        for section in sections:
+            current = chosen[section.name][2]
+            for i in range(len(section.variants)):
+                label, text, tokens = section.variant(i)
+                if tokens <= current:
+                    continue        # no upgrade, but a later variant may still be larger and fit
+                if tokens - current <= left:
+                    chosen[section.name] = (label, text, tokens)
+                    left -= tokens - current
+                    break
+                if i == 0 and section.tail:
+                    text, tokens = _fit_tail(text, current + left)
+                    if tokens > current:
+                        chosen[section.name] = ("trimmed", text, tokens)
+                        left -= tokens - current
+                        break
+
+        full_tokens = {}
+        for section in sections:
+            full_tokens[section.name] = max(full_tokens.get(section.name, 0), section.variant(0)[2])
+        plan = ContextPlan(self.budget, reserved)
+        for name, (label, text, tokens) in chosen.items():
+            plan.allocations.append(Allocation(name, label, text, tokens, full_tokens[name]))
+        return plan
+
+
+def turn_sections(status: Text, spoiling: Text, processing: Text, inventory: Text, relevant_inventory: Text,
+                  inventory_counts: Text, wealth: Text, skills: Text, history: Text,
+                  notes: Dict[str, Text]) -> List[Section]:
+    """
+    The sections of one turn's prompt in priority order: status, processes, the inventory items
+    relevant to this turn, recent history, then the full inventory, skills and notes.
+    """
+    return [
+        Section("Status", [("full", status)]),
+        Section("Spoiling", [("full", spoiling)]),
+        Section("Processing", [("full", processing), ("left out", "")]),
+        Section("Inventory", [("relevant", relevant_inventory), ("counts", inventory_counts)]),
+        Section("Wealth", [("full", wealth), ("left out", "")]),
+        Section("History", [("full", history), ("left out", "")], tail=True),
+        Section("Inventory", [("full", inventory)]),
+        Section("Skills", [("full", skills), ("left out", "")]),
+    ] + [Section(name, [("full", text), ("left out", "")]) for name, text in notes.items()]
@@ -0,0 +1,212 @@
+"""
+Delta-state prompting (config.CONTEXT_MODE = "delta").
+
+Instead of re-sending the whole state every turn, the full state sections are
+sent once as a snapshot. The snapshot sits in a cached prefix together with
+the rules. Each turn then only carries what changed since the snapshot:
+
+    [CHANGES SINCE STATE SNAPSHOT]
+    + Inventory/Weapons: Iron Sword | A heavy blade. | 1 | 5 Marks
+    ~ Inventory/Food: Bread | Rye loaf. | 1 | 1 Bits | meals 1 | spoils Day 4 6:00 PM
+    - Inventory/Junk: Pebble
+    ~ Skills: Swordsmanship +2 (1/5 xp)
+    + Processing: Tanning | Curing hides. | done Day 3 6:00 PM | yield Leather
+
+DeltaTracker builds the diff from the events the tag handlers already emit
+for the event log (see event_log.py). It keeps only the latest line per entity,
+so the per-turn prompt grows with the number of things changed, not with the
+state. Removals carry just an index, so the tracker mirrors entry names per
+inventory category and for the task list, from the snapshot onwards.
+
+The snapshot is remade (and the diff cleared) every DELTA_REFRESH_TURNS
+prompts, when the diff outgrows DELTA_MAX_TOKENS, or when a tab's data was
+replaced wholesale (load, rewind).
+
+PrefixCache puts rules + snapshot into a Gemini context cache so the per-turn
+request only ships the diff. If the cache can't be created (e.g. the prefix is
+under the model's minimum cacheable size), the snapshot is sent inline ahead
+of the diff. The prefix is then still byte-identical from turn to turn, which
+implicit prefix caching picks up.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from google.genai import types
+
+from context_serializer import estimate_tokens, inventory_line, processing_line, skill_text
+from inventory_model import Item
+
+ADDED, CHANGED, REMOVED = "+", "~", "-"
+HEADER = "[CHANGES SINCE STATE SNAPSHOT]"
+# The diff right after a new snapshot
+NO_CHANGES = f"{HEADER}\n(none)"
+
+
+class DeltaTracker:
+    def __init__(self):
+        self.snapshot = ""
+        self.turns = 0                                  # prompts sent against this snapshot
+        self._sources: Tuple = ()                       # data objects the snapshot was taken from
+        self._notes: Dict[str, str] = {}                # notes section -> text in the snapshot
+        self._names: Dict[str, List[str]] = {}          # inventory category -> item names, in order
+        self._tasks: List[str] = []                     # task names, in order
+        self._base: set = set()                         # entity keys present in the snapshot
+        self._changes: Dict[Tuple, Tuple[str, str]] = {}  # key -> (op, text), in first-change order
+        self._text: Optional[str] = None
+        self.lock = threading.Lock()
+
+    # ---------- Snapshot ----------
+
+    def reset(self, snapshot: str, inventory: dict, skills: list, processing: list, notes: Dict[str, str]) -> None:
+        """Takes a new snapshot. Must run before any event that happens after it."""
+        with self.lock:
+            self.snapshot = snapshot
+            self.turns = 0
+            self._sources = (inventory, skills, processing)
+            self._notes = dict(notes)
+            self._names = {category: [item.name for item in items] for category, items in inventory.items()}
+            self._tasks = [entry.get("name", "") for entry in processing]
+            self._base = {("Inventory", category, name) for category, names in self._names.items() for name in names}
+            self._base.update(("Processing", name) for name in self._tasks)
+            self._base.update(("Skills", skill["Name"]) for skill in skills)
+            self._changes = {}
+            self._text = None
+
+    def stale(self, inventory: dict, skills: list, processing: list) -> bool:
+        """True if a tab's data was replaced since the snapshot, so the events no longer line up."""
+        sources = (inventory, skills, processing)
+        return len(self._sources) != 3 or any(a is not b for a, b in zip(self._sources, sources))
+
+    # ---------- Events (from GameApp._record_event) ----------
+
+    def record(self, kind: str, payload: dict) -> None:
+        with self.lock:
+            if kind == "item_added":
+                category, item = payload["category"], Item.from_dict(payload["item"])
+                names = self._names.setdefault(category, [])
+                names.insert(min(int(payload["index"]), len(names)), item.name)
+                self._put(("Inventory", category, item.name), f"Inventory/{category}: {inventory_line(item)}")
+            elif kind in ("item_modified", "food_consumed"):
+                category, item = payload["category"], Item.from_dict(payload["item"])
+                names = self._names.setdefault(category, [])
+                idx = int(payload["index"])
+                if 0 <= idx < len(names) and names[idx] != item.name:
+                    # Renamed: the old name is gone
+                    self._drop(("Inventory", category, names[idx]), f"Inventory/{category}: {names[idx]}",
+                               left=names.count(names[idx]) - 1)
+                    names[idx] = item.name
+                self._put(("Inventory", category, item.name), f"Inventory/{category}: {inventory_line(item)}")
+            elif kind == "item_removed":
+                category = payload["category"]
+                names = self._names.get(category, [])
+                idx = int(payload["index"])
+                if 0 <= idx < len(names):
+                    name = names.pop(idx)
+                    self._drop(("Inventory", category, name), f"Inventory/{category}: {name}", left=names.count(name))
+            elif kind == "process_started":
+                entry = payload["entry"]
+                self._tasks.append(entry.get("name", ""))
+                self._put(("Processing", entry.get("name", "")), f"Processing: {processing_line(entry)}")
+            elif kind in ("process_updated", "process_completed"):
+                entry = payload["entry"]
+                self._put(("Processing", entry.get("name", "")), f"Processing: {processing_line(entry)}")
+            elif kind == "process_removed":
+                idx = int(payload["index"])
+                if 0 <= idx < len(self._tasks):
+                    name = self._tasks.pop(idx)
+                    self._drop(("Processing", name), f"Processing: {name}", left=self._tasks.count(name))
+            elif kind == "skill_changed":
+                skill = payload["skill"]
+                self._put(("Skills", skill["Name"]), f"Skills: {skill_text(skill)}")
+            else:
+                # Status and stats are sent in full every turn
+                return
+            self._text = None
+
+    def _put(self, key, text: str) -> None:
+        op = self._changes.get(key, (None,))[0]
+        if op is None or op == REMOVED:
+            op = CHANGED if key in self._base else ADDED
+        self._changes[key] = (op, text)
+
+    def _drop(self, key, text: str, left: int) -> None:
+        if left:
+            # Another entry with the same name remains (unstacked food)
+            self._changes[key] = (CHANGED, f"{text} (one removed, {left} left)")
+        elif key in self._base:
+            self._changes[key] = (REMOVED, text)
+        else:
+            self._changes.pop(key, None)
+
+    # ---------- Prompt ----------
+
+    def diff(self, notes: Dict[str, str]) -> str:
+        """The changes since the snapshot; notes sections whose text changed are repeated in full."""
+        with self.lock:
+            if self._text is None:
+                lines = [f"{op} {text}" for op, text in self._changes.values()]
+                self._text = "\n".join([HEADER] + lines) if lines else NO_CHANGES
+            text = self._text
+        updated = [body for name, body in notes.items() if self._notes.get(name) != body]
+        return "\n\n".join([text] + updated)
+
+    def tokens(self) -> int:
+        return estimate_tokens(self.diff({}))
+
+
+class PrefixCache:
+    """
+    One Gemini context cache holding (rules, snapshot). ensure() returns the cache
+    name to pass as cached_content, or None to send the prefix inline.
+    """
+
+    def __init__(self, client, model: str, ttl_seconds: int):
+        self.client = client
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self.name: Optional[str] = None
+        self._key = None
+        self._created = 0.0
+        self._failed = None             # last key whose cache couldn't be created
+        self.lock = threading.Lock()
+
+    def ensure(self, rules: str, snapshot: str) -> Optional[str]:
+        key = (rules, snapshot)
+        with self.lock:
+            fresh = time.monotonic() - self._created < self.ttl_seconds * 0.9
+            if key == self._key and self.name and fresh:
+                return self.name
+            if key == self._failed:
+                return None
+            self._drop()
+            try:
+                cache = self.client.caches.create(
+                    model=self.model,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=rules,
+                        contents=[snapshot],
+                        ttl=f"{self.ttl_seconds}s",
+                    ),
+                )
+            except Exception as e:
+                print(f"Context cache unavailable, sending the state inline: {e}")
+                self._failed = key
+                return None
+            self.name, self._key, self._created = cache.name, key, time.monotonic()
+            return self.name
+
+    def _drop(self) -> None:
+        if self.name:
+            try:
+                self.client.caches.delete(name=self.name)
+            except Exception:
+                pass
+        self.name, self._key = None, None
+
+    def close(self) -> None:
+        with self.lock:
+            self._drop()
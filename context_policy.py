@@ -0,0 +1,147 @@
+"""
+Per-section rules for what reaches the model's context (config.CONTEXT_POLICY).
+
+    include             the section as is (default)
+    exclude             never sent (the Journal: player-only notes)
+    summarize           a summary of the section, see below
+    include_if_changed  the full text only when it changed since it was last sent
+
+Summaries are made once per distinct text. They are cached by a hash of the
+section text in the save folder (context_summaries.json), so reloading a save
+or an unchanged World tab costs nothing. When the text changes, a new summary
+is requested on a background thread. Until it arrives the prompt keeps using
+the previous summary, or the full text if there has never been one. Short
+sections (under SUMMARIZE_MIN_WORDS) are sent in full, since a summary would
+not be much shorter.
+
+The summarizer is a callable (name, text) -> summary supplied by GameApp; it
+runs off the Tk thread.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, Optional, Set
+
+from state_store import atomic_write_json
+
+INCLUDE = "include"
+EXCLUDE = "exclude"
+SUMMARIZE = "summarize"
+INCLUDE_IF_CHANGED = "include_if_changed"
+POLICIES = (INCLUDE, EXCLUDE, SUMMARIZE, INCLUDE_IF_CHANGED)
+
+SUMMARY_FILE = "context_summaries.json"
+
+Summarizer = Callable[[str, str], str]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """{section: {"hash": ..., "summary": ...}} kept in the save folder. Thread-safe."""
+
+    def __init__(self):
+        self.path = ""
+        self.entries: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def open(self, folder: str) -> None:
+        path = os.path.join(folder, SUMMARY_FILE)
+        entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except Exception:
+                entries = {}
+        with self.lock:
+            self.path = path
+            self.entries = entries if isinstance(entries, dict) else {}
+
+    def get(self, name: str, digest: Optional[str] = None) -> Optional[str]:
+        """The summary for `name` (only if it was made from text with `digest`, when given)."""
+        with self.lock:
+            entry = self.entries.get(name)
+        if not entry or (digest is not None and entry.get("hash") != digest):
+            return None
+        return entry.get("summary")
+
+    def put(self, name: str, digest: str, summary: str, path: str) -> None:
+        """Stores a summary made for the cache at `path`; dropped if another adventure was opened since."""
+        with self.lock:
+            if not path or path != self.path:
+                return
+            self.entries[name] = {"hash": digest, "summary": summary}
+            atomic_write_json(path, self.entries)
+
+
+class ContextPolicy:
+    def __init__(self, policies: Dict[str, str], summarizer: Summarizer, min_words: int = 0):
+        for name, policy in policies.items():
+            if policy not in POLICIES:
+                raise ValueError(f"Unknown context policy for {name}: {policy!r} (expected one of {POLICIES})")
+        self.policies = dict(policies)
+        self.summarizer = summarizer
+        self.min_words = min_words
+        self.summaries = SummaryCache()
+        self._sent: Dict[str, str] = {}          # section -> hash of the text last sent (include_if_changed)
+        self._pending: Set[str] = set()          # "section:hash" summaries being generated
+        self._lock = threading.Lock()
+
+    def open(self, folder: str) -> None:
+        """Switches to another adventure's summary cache."""
+        self.summaries.open(folder)
+        self._sent.clear()
+
+    def policy(self, name: str) -> str:
+        return self.policies.get(name, INCLUDE)
+
+    def render(self, name: str, text: str, peek: bool = False) -> Optional[str]:
+        """
+        What to send for section `name` whose current text is `text`; None to leave it out.
+        peek: don't count it as sent (a prompt built for speculation, see speculation.py).
+        """
+        policy = self.policy(name)
+        if policy == EXCLUDE or not text:
+            return None
+        if policy == INCLUDE_IF_CHANGED:
+            digest = text_hash(text)
+            if self._sent.get(name) == digest:
+                return None
+            if not peek:
+                self._sent[name] = digest
+            return text
+        if policy == SUMMARIZE and len(text.split()) >= self.min_words:
+            digest = text_hash(text)
+            summary = self.summaries.get(name, digest)
+            if summary is None:
+                self._request_summary(name, text, digest)
+                # Stale summary (or the full text) until the new one lands
+                summary = self.summaries.get(name) or text
+            return summary
+        return text
+
+    def _request_summary(self, name: str, text: str, digest: str) -> None:
+        job = f"{name}:{digest}"
+        with self._lock:
+            if job in self._pending:
+                return
+            self._pending.add(job)
+        threading.Thread(target=self._summarize, args=(name, text, digest, job, self.summaries.path), daemon=True).start()
+
+    def _summarize(self, name: str, text: str, digest: str, job: str, path: str) -> None:
+        try:
+            summary = (self.summarizer(name, text) or "").strip()
+            if summary:
+                self.summaries.put(name, digest, summary, path)
+        except Exception as e:
+            print(f"Summary error ({name}): {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(job)
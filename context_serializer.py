@@ -0,0 +1,164 @@
+"""
+Compact, line-oriented state sections for the model's context.
+
+The tabs render their data for people, as tables with column padding; sent
+as text grids those cost the model several tokens per cell for no
+information. The serializers here write the same facts straight from the
+data, one line per entry, fields separated by " | ":
+
+    [INVENTORY] name | desc | qty | value each
+    Weapons:
+    - Iron Sword | A heavy blade. | 1 | 5 Marks
+    Food:
+    - Bread | Rye loaf. | 2 | 1 Bits | meals 2 | spoils Day 4 6:00 PM
+
+ContextSerializer keeps the text of each section until its key changes.
+Tab sections are keyed on their store and its revision (state_store bumps it
+on every mutation), so a turn that only touched the inventory re-serializes
+the inventory and reuses everything else.
+
+Token counts are estimated locally (estimate_tokens), one per word or
+punctuation mark, which is close enough to compare formats and track growth
+without a tokenizer round trip.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+from spoilage import spoil_minutes
+from time_utils import from_abs_minutes
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_WORD_RE = re.compile(r"[a-z0-9']{3,}")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: words and punctuation (box-drawing characters included) count one each."""
+    return len(_TOKEN_RE.findall(text))
+
+
+def keywords(text: str) -> Set[str]:
+    """Lowercase words of 3+ characters, for matching item names against what was said."""
+    return set(_WORD_RE.findall(text.lower()))
+
+
+def _when(abs_minutes: int) -> str:
+    t = from_abs_minutes(abs_minutes)
+    return f"{t.as_day_string()} {t.as_time_string()}"
+
+
+# ---------- Entries ----------
+
+def inventory_line(item) -> str:
+    fields = [item.name, item.desc, item.amount_display, item.value.raw]
+    meta = item.meta
+    if meta is not None and meta.meals is not None:
+        fields.append(f"meals {meta.meals}")
+        spoils = spoil_minutes(item)
+        if spoils is not None:
+            fields.append(f"spoils {_when(spoils)}")
+    return " | ".join(fields)
+
+
+def skill_text(skill: dict) -> str:
+    return f"{skill['Name']} +{skill['Level']} ({skill['XP']}/{skill['Threshold']} xp)"
+
+
+def processing_line(entry: dict) -> str:
+    fields = [entry.get("name", "Unknown"), entry.get("desc", "")]
+    if entry.get("status") == "COMPLETED":
+        fields.append("READY TO COLLECT")
+    elif entry.get("type") == "process":
+        fields.append(f"done {_when(int(entry.get('target_abs_minutes', 0)))}")
+    else:
+        done = float(entry.get("work_done", 0.0) or 0.0)
+        req = float(entry.get("work_required", 0.0) or 0.0)
+        fields.append(f"{done:.1f}/{req:.1f} WA ({entry.get('skill', 'Unknown Skill')})")
+    fields.append(f"yield {entry.get('yield', 'Unknown')}")
+    return " | ".join(str(f) for f in fields)
+
+
+# ---------- Sections ----------
+
+def serialize_inventory(data: dict, relevant: Optional[Set[str]] = None) -> str:
+    """
+    relevant (see keywords()): only list items with a name word in it, plus the
+    food; the rest are counted per category.
+    """
+    lines = ["[INVENTORY] name | desc | qty | value each"]
+    for category in sorted(data.keys()):
+        items = data[category]
+        if not items:
+            continue
+        if relevant is not None:
+            shown = [item for item in items
+                     if (item.meta is not None and item.meta.meals is not None) or relevant & keywords(item.name)]
+            hidden = len(items) - len(shown)
+            items = shown
+            lines.append(f"{category}:" + (f" (+{hidden} more)" if hidden else ""))
+        else:
+            lines.append(f"{category}:")
+        lines.extend(f"- {inventory_line(item)}" for item in items)
+    if len(lines) == 1:
+        lines.append("(empty)")
+    return "\n".join(lines)
+
+
+def serialize_inventory_overview(data: dict) -> str:
+    counts = ", ".join(f"{category} {len(items)}" for category, items in sorted(data.items()) if items)
+    return f"[INVENTORY] item counts: {counts or '(empty)'}"
+
+
+def serialize_skills(data: list) -> str:
+    if not data:
+        return "[SKILLS] (none)"
+    return "[SKILLS] " + ", ".join(skill_text(s) for s in data)
+
+
+def serialize_processing(data: list) -> str:
+    if not data:
+        return "[PROCESSING] (none)"
+    return "\n".join(["[PROCESSING]"] + [f"- {processing_line(entry)}" for entry in data])
+
+
+def serialize_status(location: str, day: str, time: str, turn=None, upcoming=None) -> str:
+    line = f"[CURRENT STATUS] {location} | {day} {time}"
+    if turn is not None:
+        line += f" | turn {turn}"
+    if upcoming is not None:
+        line += f"\nUPCOMING TURN: {upcoming} (You MUST use this number in the [[STATUS]] tag)"
+    return line
+
+
+# ---------- Cache ----------
+
+class ContextSerializer:
+    """
+    Per-section text cache. section(name, key, build) returns the cached text while
+    key is unchanged, otherwise calls build() and stores the result.
+
+    After each section() call, tokens[name] holds its estimated token count;
+    rebuilds counts how often each section was actually serialized.
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, Tuple[Hashable, str]] = {}
+        self.tokens: Dict[str, int] = {}
+        self.rebuilds: Counter = Counter()
+
+    def section(self, name: str, key: Hashable, build: Callable[[], str]) -> str:
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        text = build()
+        self._cache[name] = (key, text)
+        self.tokens[name] = estimate_tokens(text)
+        self.rebuilds[name] += 1
+        return text
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.tokens.clear()
@@ -0,0 +1,206 @@
+"""
+Per-adventure currency model and running wealth totals.
+
+currency.json holds the denomination table captured during creation from the
+[[CURRENCY: Bit = 1 | Mark = 10 | Crown = 100]] tag; each ratio is in base units
+(the smallest denomination):
+
+    {"denominations": [{"name": "Bit", "units": 1}, {"name": "Mark", "units": 10}, ...]}
+
+CurrencyModel turns an item's parsed Value ("5 Marks") into integer base units
+and formats base units back into the largest denominations ("1 Crown, 2 Marks").
+
+WealthLedger keeps, per inventory category, the total value of the items in it
+(amount x value). InventoryTab updates it on every add/remove/modify, so the
+totals are always current without re-reading the item table. Values whose
+unit isn't in the table (or saves without a table) are kept per unit, not
+converted.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from state_store import atomic_write_json
+
+CURRENCY_FILENAME = "currency.json"
+# Inventory category whose items are the money the character carries
+CURRENCY_CATEGORY = "Currency"
+
+_PAIR_RE = re.compile(r"^\s*(.+?)\s*=\s*(\d+)\s*$")
+
+
+def _unit_key(unit: str) -> str:
+    """'Marks' / 'mark' / '$20 Bills' -> 'mark' / 'mark' / '$20 bill'."""
+    key = " ".join(unit.casefold().split())
+    if key.endswith("ies"):
+        return key[:-3] + "y"
+    if key.endswith("s") and not key.endswith("ss"):
+        return key[:-1]
+    return key
+
+
+class CurrencyModel:
+    def __init__(self, denominations: Optional[List[Tuple[str, int]]] = None):
+        # [(name, base units)], largest first
+        self.denominations: List[Tuple[str, int]] = sorted(denominations or [], key=lambda d: -d[1])
+        self._units: Dict[str, int] = {_unit_key(name): units for name, units in self.denominations}
+
+    def __bool__(self) -> bool:
+        return bool(self.denominations)
+
+    # ---------- Persistence ----------
+
+    @classmethod
+    def load(cls, folder: str) -> "CurrencyModel":
+        path = os.path.join(folder, CURRENCY_FILENAME)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            return cls([(d["name"], int(d["units"])) for d in raw.get("denominations", [])])
+        except Exception:
+            return cls()
+
+    def save(self, folder: str) -> None:
+        data = {"denominations": [{"name": n, "units": u} for n, u in sorted(self.denominations, key=lambda d: d[1])]}
+        atomic_write_json(os.path.join(folder, CURRENCY_FILENAME), data)
+
+    @classmethod
+    def from_tag(cls, raw_args: str) -> "CurrencyModel":
+        """Parses 'Bit = 1 | Mark = 10 | Crown = 100'. Raises ValueError if nothing usable is found."""
+        pairs = []
+        for part in raw_args.split("|"):
+            m = _PAIR_RE.match(part)
+            if m and int(m.group(2)) > 0:
+                pairs.append((m.group(1), int(m.group(2))))
+        if not pairs:
+            raise ValueError(f"No 'Name = units' pairs in '{raw_args}'.")
+        return cls(pairs)
+
+    # ---------- Conversion ----------
+
+    def units_of(self, unit: str) -> Optional[int]:
+        """Base units per one of `unit`, or None if it isn't a known denomination."""
+        return self._units.get(_unit_key(unit))
+
+    def to_base(self, value) -> Optional[int]:
+        """inventory_model.Value -> base units (None if it can't be converted)."""
+        if value.amount is None:
+            return None
+        per = self.units_of(value.unit)
+        if per is None:
+            return None
+        return int(round(value.amount * per))
+
+    def format(self, base_units: int) -> str:
+        if not self.denominations:
+            return str(base_units)
+        if base_units == 0:
+            return f"0 {self.denominations[-1][0]}"
+        parts = []
+        remaining = abs(base_units)
+        for name, units in self.denominations:
+            count, remaining = divmod(remaining, units)
+            if count:
+                parts.append(f"{count} {name}")
+        return ("-" if base_units < 0 else "") + ", ".join(parts)
+
+
+class WealthLedger:
+    """Running value totals per inventory category, maintained incrementally."""
+
+    def __init__(self, currency: Optional[CurrencyModel] = None):
+        self.currency = currency or CurrencyModel()
+        self.data: Optional[dict] = None
+        self.base: Dict[str, int] = defaultdict(int)                 # category -> base units
+        self.other: Dict[str, Counter] = defaultdict(Counter)        # category -> {unit: amount} not convertible
+        self.unpriced: Dict[str, int] = defaultdict(int)             # category -> items without a numeric value
+        # id(item) -> (category, base units, (unit, amount) or None, unpriced)
+        self._contrib: Dict[int, tuple] = {}
+
+    # ---------- Building ----------
+
+    def rebuild(self, data: dict, currency: Optional[CurrencyModel] = None) -> None:
+        if currency is not None:
+            self.currency = currency
+        self.data = data
+        self.base = defaultdict(int)
+        self.other = defaultdict(Counter)
+        self.unpriced = defaultdict(int)
+        self._contrib = {}
+        for category, items in data.items():
+            for item in items:
+                self.added(category, item)
+
+    def ensure(self, data: dict) -> "WealthLedger":
+        if data is not self.data:
+            self.rebuild(data)
+        return self
+
+    def _contribution(self, category: str, item) -> tuple:
+        value = item.value
+        if value.amount is None:
+            return (category, 0, None, True)
+        count = item.amount if item.countable else 1
+        base = self.currency.to_base(value)
+        if base is not None:
+            return (category, base * count, None, False)
+        return (category, 0, (value.unit, value.amount * count), False)
+
+    def _apply(self, contrib: tuple, sign: int) -> None:
+        category, base, other, unpriced = contrib
+        self.base[category] += sign * base
+        if other is not None:
+            unit, amount = other
+            self.other[category][unit] += sign * amount
+            if not self.other[category][unit]:
+                del self.other[category][unit]
+        if unpriced:
+            self.unpriced[category] += sign
+
+    # ---------- Maintenance (call after mutating the data) ----------
+
+    def added(self, category: str, item) -> None:
+        contrib = self._contribution(category, item)
+        self._contrib[id(item)] = contrib
+        self._apply(contrib, 1)
+
+    def removed(self, category: str, item) -> None:
+        contrib = self._contrib.pop(id(item), None)
+        if contrib is not None:
+            self._apply(contrib, -1)
+
+    def changed(self, category: str, item) -> None:
+        """Amount or value of item changed in place."""
+        self.removed(category, item)
+        self.added(category, item)
+
+    # ---------- Totals ----------
+
+    def total(self) -> int:
+        return sum(self.base.values())
+
+    def carried(self) -> int:
+        return self.base.get(CURRENCY_CATEGORY, 0)
+
+    def summary(self) -> str:
+        """Compact totals for the prompt, instead of the model adding up the item table itself."""
+        fmt = self.currency.format
+        lines = []
+        if self.currency:
+            lines.append(f"Carried money: {fmt(self.carried())}")
+            lines.append(f"Total inventory value: {fmt(self.total())}")
+        for category in sorted(set(self.base) | set(self.other) | set(self.unpriced)):
+            parts = []
+            if self.base.get(category):
+                parts.append(fmt(self.base[category]))
+            parts.extend(f"{amount:g} {unit}" for unit, amount in sorted(self.other.get(category, {}).items()))
+            if self.unpriced.get(category):
+                parts.append(f"{self.unpriced[category]} unpriced")
+            if parts:
+                lines.append(f"{category}: {'; '.join(parts)}")
+        return "\n".join(lines)
@@ -0,0 +1,196 @@
+"""
+Per-adventure event log with periodic snapshots.
+
+Every state mutation applied by a tag handler is recorded as one event, tagged
+with the turn it happened in:
+
+    item_added      {category, index, item}
+    item_removed    {category, index}
+    item_modified   {category, index, item}
+    food_consumed   {category, index, item}
+    stat_changed    {stat, value}
+    status_set      {status}
+    process_started {entry}
+    process_updated {index, entry}
+    process_completed {index, entry}
+    process_removed {index}
+    skill_changed   {skill}
+
+Events are appended to events.jsonl. Every SNAPSHOT_EVERY_TURNS turns the full
+state (inventory, skills, processing, status) is written to snapshots/ along with
+the byte offset of the log at that moment. Rewinding to turn N loads the newest
+snapshot at or before N and replays only the events after it, so the cost is
+proportional to the events since that snapshot, not to the whole adventure.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import re
+import threading
+from typing import List, Optional, Tuple
+
+from state_store import atomic_write_json
+
+EVENTS_FILENAME = "events.jsonl"
+SNAPSHOT_DIRNAME = "snapshots"
+SNAPSHOT_EVERY_TURNS = 10
+
+_SNAPSHOT_RE = re.compile(r"^turn_(\d+)\.json$")
+
+
+def empty_state() -> dict:
+    return {"inventory": {}, "skills": [], "processing": [], "status": {}}
+
+
+# ---------- Replay ----------
+
+def apply_event(state: dict, event: dict) -> None:
+    """Applies one event to a state dict in place."""
+    kind = event.get("type")
+    inv = state.setdefault("inventory", {})
+    procs = state.setdefault("processing", [])
+
+    if kind == "item_added":
+        items = inv.setdefault(event["category"], [])
+        items.insert(min(int(event["index"]), len(items)), copy.deepcopy(event["item"]))
+    elif kind in ("item_modified", "food_consumed"):
+        items = inv.setdefault(event["category"], [])
+        idx = int(event["index"])
+        if 0 <= idx < len(items):
+            items[idx] = copy.deepcopy(event["item"])
+    elif kind == "item_removed":
+        items = inv.get(event["category"], [])
+        idx = int(event["index"])
+        if 0 <= idx < len(items):
+            items.pop(idx)
+    elif kind == "stat_changed":
+        state.setdefault("status", {})[event["stat"]] = event["value"]
+    elif kind == "status_set":
+        state["status"] = copy.deepcopy(event["status"])
+    elif kind == "process_started":
+        procs.append(copy.deepcopy(event["entry"]))
+    elif kind in ("process_updated", "process_completed"):
+        idx = int(event["index"])
+        if 0 <= idx < len(procs):
+            procs[idx] = copy.deepcopy(event["entry"])
+    elif kind == "process_removed":
+        idx = int(event["index"])
+        if 0 <= idx < len(procs):
+            procs.pop(idx)
+    elif kind == "skill_changed":
+        skill = copy.deepcopy(event["skill"])
+        skills = state.setdefault("skills", [])
+        for i, s in enumerate(skills):
+            if s.get("Name") == skill.get("Name"):
+                skills[i] = skill
+                break
+        else:
+            skills.append(skill)
+        skills.sort(key=lambda x: x["Name"])
+
+
+class EventLog:
+    """events.jsonl + snapshots/ for one adventure folder."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.path = os.path.join(folder, EVENTS_FILENAME)
+        self.snapshot_dir = os.path.join(folder, SNAPSHOT_DIRNAME)
+        self.lock = threading.Lock()
+        # Events recorded this turn, serialized at record time so later in-place edits can't leak in
+        self._pending: List[str] = []
+
+    # ---------- Recording ----------
+
+    def record(self, turn: int, kind: str, **payload) -> None:
+        event = {"turn": int(turn), "type": kind}
+        event.update(payload)
+        with self.lock:
+            self._pending.append(json.dumps(event))
+
+    def flush(self) -> int:
+        """Appends this turn's events to events.jsonl. Returns how many were written."""
+        with self.lock:
+            if not self._pending:
+                return 0
+            lines, self._pending = self._pending, []
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            return len(lines)
+
+    def _log_size(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    # ---------- Snapshots ----------
+
+    def snapshot_turns(self) -> List[int]:
+        if not os.path.isdir(self.snapshot_dir):
+            return []
+        turns = []
+        for name in os.listdir(self.snapshot_dir):
+            m = _SNAPSHOT_RE.match(name)
+            if m:
+                turns.append(int(m.group(1)))
+        return sorted(turns)
+
+    def _snapshot_path(self, turn: int) -> str:
+        return os.path.join(self.snapshot_dir, f"turn_{int(turn):06d}.json")
+
+    def write_snapshot(self, turn: int, state: dict) -> None:
+        """Stores the full state as of the end of `turn`. Call after flush()."""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        with self.lock:
+            offset = self._log_size()
+        atomic_write_json(self._snapshot_path(turn), {"turn": int(turn), "log_offset": offset, "state": state}, indent=None)
+
+    def ensure_base_snapshot(self, turn: int, state: dict) -> None:
+        """Adventures that predate the log (or were just created) get a starting snapshot."""
+        if not self.snapshot_turns():
+            self.write_snapshot(turn, state)
+
+    def maybe_snapshot(self, turn: int, state_fn) -> bool:
+        if int(turn) % SNAPSHOT_EVERY_TURNS != 0 or int(turn) in self.snapshot_turns():
+            return False
+        self.write_snapshot(turn, state_fn())
+        return True
+
+    # ---------- Rewind ----------
+
+    def state_at(self, turn: int) -> Tuple[Optional[dict], int]:
+        """
+        Rebuilds the state as of the end of `turn`.
+        Returns (state, log_offset_after_turn), or (None, 0) if no snapshot is old enough.
+        """
+        candidates = [t for t in self.snapshot_turns() if t <= int(turn)]
+        if not candidates:
+            return None, 0
+        with open(self._snapshot_path(candidates[-1]), "r", encoding="utf-8") as f:
+            snap = json.load(f)
+        state = snap.get("state") or empty_state()
+        offset = int(snap.get("log_offset", 0))
+
+        if not os.path.exists(self.path):
+            return state, 0
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for raw in iter(f.readline, b""):
+                event = json.loads(raw)
+                if int(event.get("turn", 0)) > int(turn):
+                    break
+                apply_event(state, event)
+                offset += len(raw)
+        return state, offset
+
+    def truncate_after(self, turn: int, log_offset: int) -> None:
+        """Drops events and snapshots newer than `turn` so play can continue from there."""
+        with self.lock:
+            self._pending = []
+            if os.path.exists(self.path):
+                with open(self.path, "r+b") as f:
+                    f.truncate(log_offset)
+        for t in self.snapshot_turns():
+            if t > int(turn):
+                os.remove(self._snapshot_path(t))
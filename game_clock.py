@@ -0,0 +1,64 @@
+"""
+The in-game clock: absolute minutes since Day 1 12:00 AM (see time_utils).
+
+GameApp owns one GameClock and treats it as the single source of truth for
+the current time. Day/time strings from tags ("Day 3", "6:00 PM") are parsed
+once, at the tag boundary, and everything downstream works on the int.
+
+Moving the clock notifies subscribers with (now, previous) so systems that
+depend on time passing (process completions, spoilage) react without
+re-reading the status labels. A subscriber returns the System messages it
+produced (or None); set() hands them back to the caller in subscription order.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, Optional
+
+from time_utils import GameTime, from_abs_minutes, to_abs_minutes
+
+# (now, previous) -> System messages
+TickSubscriber = Callable[[int, int], Optional[List[str]]]
+
+
+class GameClock:
+    def __init__(self, minutes: int = 0):
+        self.minutes = max(0, int(minutes))
+        self._subscribers: List[TickSubscriber] = []
+
+    def subscribe(self, callback: TickSubscriber) -> None:
+        self._subscribers.append(callback)
+
+    # ---------- Moving ----------
+
+    def set(self, minutes: int, notify: bool = True) -> List[str]:
+        """
+        Moves the clock to `minutes`. With notify, subscribers run even if the time
+        didn't change (a STATUS can add things that are already due).
+        """
+        previous, self.minutes = self.minutes, max(0, int(minutes))
+        messages: List[str] = []
+        if notify:
+            for callback in self._subscribers:
+                messages.extend(callback(self.minutes, previous) or ())
+        return messages
+
+    def set_day_time(self, day: str, time: str, notify: bool = True) -> List[str]:
+        return self.set(to_abs_minutes(day, time), notify)
+
+    def advance(self, hours: float, notify: bool = True) -> List[str]:
+        return self.set(self.minutes + int(round(float(hours) * 60)), notify)
+
+    # ---------- Display ----------
+
+    @property
+    def game_time(self) -> GameTime:
+        return from_abs_minutes(self.minutes)
+
+    @property
+    def day_string(self) -> str:
+        return self.game_time.as_day_string()
+
+    @property
+    def time_string(self) -> str:
+        return self.game_time.as_time_string()
@@ -0,0 +1,295 @@
+"""
+Name index over the inventory (category -> [inventory_model.Item, ...]).
+
+Exact lookups go through a dict keyed by the normalized name, so they cost the
+same with 10 items or 100k. Names the model makes up ("the rusty sword",
+"healing potions", "Sowrd") fall back to a deterministic fuzzy match:
+
+    1. candidates  : names sharing (non-common) trigrams with the query, top FUZZY_CANDIDATES by overlap;
+                     a query word no name contains is searched as the closest word one typo away
+                     (a missing, extra or swapped letter: "Sowrd" -> "sword")
+    2. score       : max(token containment, trigram Dice, difflib ratio), 0..1
+    3. order       : score desc, then name, category and position, so ties always resolve the same way
+
+A fuzzy match is only used when it clears MIN_FUZZY_SCORE and no other name
+scores within AMBIGUITY_MARGIN of it; otherwise resolve() reports the
+candidates instead of guessing, so "Bread" no longer removes "Breadknife".
+
+The index also knows each item's position in its category list, for the
+event payloads (position()). Positions are checked on use. A category whose
+positions were shifted by a removal is re-read once, on its next lookup.
+
+InventoryTab keeps the index in step with every mutation (add/remove/rename).
+It rebuilds lazily whenever the tab's data object is swapped (load, rewind), and
+the trigram postings are only built the first time a fuzzy lookup needs them.
+"""
+
+from __future__ import annotations
+
+import difflib
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from inventory_model import Item
+
+MIN_FUZZY_SCORE = 0.7
+AMBIGUITY_MARGIN = 0.05
+FUZZY_CANDIDATES = 50
+# Trigrams shared by more names than this don't help pick candidates (e.g. " th" in 100k "the ...")
+COMMON_GRAM_LIMIT = 2000
+# Words shorter than this get no typo keys (too many accidental neighbours); numbers never do
+TYPO_MIN_LENGTH = 4
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize_name(name: str) -> str:
+    """Case-, punctuation- and spacing-insensitive key: 'Iron  Sword!' -> 'iron sword'."""
+    return " ".join(_NON_WORD_RE.sub(" ", str(name).casefold()).split())
+
+
+def _trigrams(norm: str) -> Set[str]:
+    padded = f" {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _typo_word(word: str) -> bool:
+    return len(word) >= TYPO_MIN_LENGTH and word.isalpha()
+
+
+def _typo_keys(word: str) -> Set[str]:
+    """The word and its one-letter deletions: words one typo apart share a key ("sowrd"/"sword" -> "sord")."""
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _similarity(query: str, query_grams: Set[str], name: str, name_grams: Set[str]) -> float:
+    q_tokens, n_tokens = query.split(), name.split()
+    token = 0.0
+    if q_tokens and set(q_tokens) <= set(n_tokens):
+        # Every word of the query is in the name ("bread" -> "stale bread")
+        token = 0.75 + 0.25 * len(q_tokens) / len(n_tokens)
+    elif n_tokens and set(n_tokens) <= set(q_tokens):
+        # Every word of the name is in the query ("the rusty sword" -> "rusty sword")
+        token = 0.7 + 0.2 * len(n_tokens) / len(q_tokens)
+    dice = 2 * len(query_grams & name_grams) / (len(query_grams) + len(name_grams))
+    best = max(token, dice)
+    matcher = difflib.SequenceMatcher(None, query, name)
+    # ratio() is the expensive part; its cheap upper bounds often rule it out
+    if matcher.real_quick_ratio() > best and matcher.quick_ratio() > best:
+        best = max(best, matcher.ratio())
+    return best
+
+
+@dataclass
+class Resolution:
+    query: str
+    match: Optional[Tuple[str, Item]] = None          # (category, item)
+    exact: bool = False
+    score: float = 0.0
+    # [(score, category, item), ...] best first; filled for fuzzy lookups
+    candidates: List[Tuple[float, str, Item]] = field(default_factory=list)
+
+    @property
+    def ambiguous(self) -> bool:
+        # A good enough match was found but a different name scored almost as well
+        return self.match is None and bool(self.candidates) and self.candidates[0][0] >= MIN_FUZZY_SCORE
+
+    def report(self, limit: int = 5) -> str:
+        """Player-facing explanation for a failed lookup."""
+        if self.ambiguous:
+            options = ", ".join(f"{item.name} ({cat})" for _, cat, item in self.candidates[:limit])
+            return f"System: '{self.query}' is ambiguous. Did you mean: {options}?"
+        if self.candidates:
+            _, cat, item = self.candidates[0]
+            return f"System: Could not find '{self.query}' (closest: {item.name} in {cat})."
+        return f"System: Could not find '{self.query}'."
+
+
+class InventoryIndex:
+    def __init__(self):
+        self.data: Optional[dict] = None
+        # normalized name -> [(category, item), ...] in inventory order
+        self._exact: Dict[str, List[Tuple[str, Item]]] = {}
+        # trigram -> normalized names containing it (None until the first fuzzy lookup)
+        self._grams: Optional[Dict[str, Set[str]]] = None
+        self._name_grams: Dict[str, Set[str]] = {}
+        # word -> number of names containing it, typo key -> words (built with the trigrams)
+        self._words: Dict[str, int] = defaultdict(int)
+        self._typos: Dict[str, Set[str]] = defaultdict(set)
+        # category -> {id(item): position in data[category]}, see position()
+        self._positions: Dict[str, Dict[int, int]] = {}
+
+    # ---------- Building ----------
+
+    def rebuild(self, data: dict) -> None:
+        self.data = data
+        self._exact = {}
+        self._grams = None
+        self._name_grams = {}
+        self._words = defaultdict(int)
+        self._typos = defaultdict(set)
+        self._positions = {}
+        for category in data:
+            for item in data[category]:
+                self._link(category, item)
+
+    def _build_grams(self) -> Dict[str, Set[str]]:
+        if self._grams is None:
+            self._grams = defaultdict(set)
+            for norm in self._exact:
+                self._add_grams(norm)
+        return self._grams
+
+    def _add_grams(self, norm: str) -> None:
+        grams = _trigrams(norm)
+        self._name_grams[norm] = grams
+        for g in grams:
+            self._grams[g].add(norm)
+        for word in set(norm.split()):
+            self._words[word] += 1
+            if self._words[word] == 1 and _typo_word(word):
+                for key in _typo_keys(word):
+                    self._typos[key].add(word)
+
+    def ensure(self, data: dict) -> "InventoryIndex":
+        """Rebuilds if data is not the object the index was built from."""
+        if data is not self.data:
+            self.rebuild(data)
+        return self
+
+    def _link(self, category: str, item: Item) -> None:
+        norm = normalize_name(item.name)
+        entries = self._exact.get(norm)
+        if entries is None:
+            self._exact[norm] = [(category, item)]
+            if self._grams is not None:
+                self._add_grams(norm)
+        else:
+            entries.append((category, item))
+
+    def _unlink(self, category: str, item: Item) -> None:
+        norm = normalize_name(item.name)
+        entries = self._exact.get(norm, [])
+        for i, (cat, it) in enumerate(entries):
+            if it is item:
+                entries.pop(i)
+                break
+        if not entries and norm in self._exact:
+            del self._exact[norm]
+            for g in self._name_grams.pop(norm, ()):
+                names = self._grams.get(g) if self._grams is not None else None
+                if names is not None:
+                    names.discard(norm)
+                    if not names:
+                        del self._grams[g]
+            if self._grams is not None:
+                for word in set(norm.split()):
+                    self._words[word] -= 1
+                    if self._words[word] > 0:
+                        continue
+                    del self._words[word]
+                    if not _typo_word(word):
+                        continue
+                    for key in _typo_keys(word):
+                        words = self._typos.get(key)
+                        if words is not None:
+                            words.discard(word)
+                            if not words:
+                                del self._typos[key]
+
+    # ---------- Maintenance (call after mutating the data) ----------
+
+    def added(self, category: str, item: Item) -> None:
+        """item was appended to data[category]."""
+        self._link(category, item)
+        positions = self._positions.get(category)
+        items = self.data.get(category) if self.data is not None else None
+        if positions is not None and items and items[-1] is item:
+            positions[id(item)] = len(items) - 1
+
+    def removed(self, category: str, item: Item) -> None:
+        self._unlink(category, item)
+        positions = self._positions.get(category)
+        if positions is not None:
+            positions.pop(id(item), None)
+
+    def renamed(self, category: str, item: Item, old_name: str) -> None:
+        new_name = item.name
+        item.name = old_name
+        self._unlink(category, item)
+        item.name = new_name
+        self._link(category, item)
+
+    # ---------- Lookups ----------
+
+    def find_exact(self, name: str, category: Optional[str] = None) -> List[Tuple[str, Item]]:
+        """[(category, item), ...] whose normalized name equals name's."""
+        entries = self._exact.get(normalize_name(name), [])
+        if category is not None:
+            return [e for e in entries if e[0] == category]
+        return list(entries)
+
+    def resolve(self, name: str) -> Resolution:
+        """Exact match first, then the unambiguous best fuzzy match (see module docstring)."""
+        result = Resolution(query=name)
+        norm = normalize_name(name)
+        entries = self._exact.get(norm)
+        if entries:
+            result.match, result.exact, result.score = entries[0], True, 1.0
+            return result
+        if not norm:
+            return result
+
+        postings = self._build_grams()
+        query_grams = _trigrams(norm)
+        search_grams = _trigrams(self._corrected(norm))
+        by_rarity = sorted((g for g in search_grams if g in postings), key=lambda g: (len(postings[g]), g))
+        useful = [g for g in by_rarity if len(postings[g]) <= COMMON_GRAM_LIMIT] or by_rarity[:1]
+        overlap: Dict[str, int] = defaultdict(int)
+        for g in useful:
+            for other in postings[g]:
+                overlap[other] += 1
+        shortlist = sorted(overlap, key=lambda n: (-overlap[n], n))[:FUZZY_CANDIDATES]
+
+        scored = []
+        for other in shortlist:
+            score = _similarity(norm, query_grams, other, self._name_grams[other])
+            for cat, item in self._exact[other]:
+                scored.append((score, other, cat, item))
+        scored.sort(key=lambda s: (-s[0], s[1], s[2]))
+        result.candidates = [(score, cat, item) for score, _, cat, item in scored]
+
+        if scored and scored[0][0] >= MIN_FUZZY_SCORE:
+            best_score, best_norm = scored[0][0], scored[0][1]
+            rival = next((s for s in scored if s[1] != best_norm), None)
+            if rival is None or best_score - rival[0] > AMBIGUITY_MARGIN:
+                result.match, result.score = (scored[0][2], scored[0][3]), best_score
+        return result
+
+    def _corrected(self, norm: str) -> str:
+        """The query with each unknown word replaced by its closest known word one typo away."""
+        words = []
+        for word in norm.split():
+            if word not in self._words and _typo_word(word):
+                near = set()
+                for key in _typo_keys(word):
+                    near |= self._typos.get(key, set())
+                if near:
+                    word = min(near, key=lambda w: (-difflib.SequenceMatcher(None, word, w).ratio(), w))
+            words.append(word)
+        return " ".join(words)
+
+    def position(self, category: str, item: Item) -> int:
+        """Index of item (by identity) inside data[category], -1 if it isn't there."""
+        items = self.data.get(category, ()) if self.data is not None else ()
+        positions = self._positions.get(category)
+        if positions is not None:
+            i = positions.get(id(item))
+            if i is not None and i < len(items) and items[i] is item:
+                return i
+        # First use, or a removal shifted this category: re-read it once
+        positions = {id(it): i for i, it in enumerate(items)}
+        self._positions[category] = positions
+        return positions.get(id(item), -1)
@@ -0,0 +1,173 @@
+"""
+Typed in-memory inventory items.
+
+On disk (inventory.json, adventure.db, event log, snapshots) an item stays the
+plain dict it has always been:
+
+    {"name": "Bread", "desc": "...", "amount": "3", "value": "5 Marks",
+     "meta": {"type": "food", "meals": 2, "spoil_day": "Day 4", "spoil_time": "6:00 PM"}}
+
+In memory InventoryTab works on Item objects instead: __slots__ classes with
+an int amount, a parsed Value and typed food metadata, so stacking, removing
+and spoilage checks never re-parse strings. Descriptions, units, categories
+and spoil dates repeat a lot and are interned. Conversion happens only at the
+serialization boundary: INVENTORY_CODEC is handed to the section store, which
+decodes on open and encodes on commit.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+_VALUE_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(.*?)\s*$")
+
+
+def _intern(text) -> str:
+    return sys.intern(str(text))
+
+
+def _parse_int(text) -> Optional[int]:
+    try:
+        return int(str(text).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+class Value:
+    """
+    A price like '5 Marks' split into amount 5 and unit 'Marks'. raw is kept verbatim for display.
+    Treat as immutable (replace it instead of editing it); use parse_value() to get a shared instance.
+    """
+
+    __slots__ = ("raw", "amount", "unit")
+
+    def __init__(self, raw: str):
+        self.raw = _intern(raw)
+        m = _VALUE_RE.match(self.raw)
+        if m:
+            number = float(m.group(1))
+            self.amount = int(number) if number.is_integer() else number
+            self.unit = _intern(m.group(2))
+        else:
+            # Free text such as "N/A" or "Priceless"
+            self.amount = None
+            self.unit = ""
+
+    def __str__(self) -> str:
+        return self.raw
+
+    def __repr__(self) -> str:
+        return f"Value({self.raw!r})"
+
+
+# Values are immutable and repeat a lot ("3 Bits"), so items share one instance per text
+parse_value = lru_cache(maxsize=4096)(Value)
+
+
+class ItemMeta:
+    """Item metadata; currently only food uses it (meals left and spoil date)."""
+
+    __slots__ = ("type", "meals", "spoil_day", "spoil_time", "extra")
+
+    def __init__(self, type: Optional[str] = None, meals: Optional[int] = None,
+                 spoil_day: Optional[str] = None, spoil_time: Optional[str] = None,
+                 extra: Optional[dict] = None):
+        self.type = _intern(type) if type is not None else None
+        self.meals = meals
+        self.spoil_day = _intern(spoil_day) if spoil_day is not None else None
+        self.spoil_time = _intern(spoil_time) if spoil_time is not None else None
+        # Keys this class doesn't know about survive a load/save round trip
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "ItemMeta":
+        known = ("type", "meals", "spoil_day", "spoil_time")
+        meals = raw.get("meals")
+        return cls(
+            type=raw.get("type"),
+            meals=_parse_int(meals) if meals is not None else None,
+            spoil_day=raw.get("spoil_day"),
+            spoil_time=raw.get("spoil_time"),
+            extra={k: v for k, v in raw.items() if k not in known},
+        )
+
+    def to_dict(self) -> dict:
+        out = {}
+        if self.type is not None: out["type"] = self.type
+        if self.meals is not None: out["meals"] = self.meals
+        if self.spoil_day is not None: out["spoil_day"] = self.spoil_day
+        if self.spoil_time is not None: out["spoil_time"] = self.spoil_time
+        if self.extra: out.update(self.extra)
+        return out
+
+
+class Item:
+    """
+    One inventory entry.
+    amount is an int; amount_text keeps the original text when it wasn't a number
+    (e.g. "a handful"), in which case the item can't be stacked or partially removed.
+    """
+
+    __slots__ = ("name", "desc", "amount", "amount_text", "value", "meta")
+
+    def __init__(self, name: str, desc: str = "No desc", amount=1, value="0", meta: Optional[ItemMeta] = None):
+        self.name = str(name)
+        self.desc = _intern(desc)
+        self.set_amount(amount)
+        self.value = value if isinstance(value, Value) else parse_value(str(value))
+        self.meta = meta
+
+    @property
+    def countable(self) -> bool:
+        return self.amount_text is None
+
+    @property
+    def amount_display(self) -> str:
+        return self.amount_text if self.amount_text is not None else str(self.amount)
+
+    def set_amount(self, amount) -> None:
+        parsed = _parse_int(amount)
+        self.amount = parsed if parsed is not None else 1
+        self.amount_text = None if parsed is not None else str(amount)
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Item":
+        meta = raw.get("meta")
+        return cls(
+            raw.get("name", "Unknown"),
+            raw.get("desc", "No desc"),
+            raw.get("amount", "1"),
+            raw.get("value", "0"),
+            ItemMeta.from_dict(meta) if isinstance(meta, dict) else None,
+        )
+
+    def to_dict(self) -> dict:
+        out = {"name": self.name, "desc": self.desc, "amount": self.amount_display, "value": self.value.raw}
+        if self.meta is not None:
+            out["meta"] = self.meta.to_dict()
+        return out
+
+    def __repr__(self) -> str:
+        return f"Item({self.name!r}, amount={self.amount_display!r}, value={self.value.raw!r})"
+
+
+# ---------- Serialization boundary ----------
+
+def decode_inventory(raw: dict) -> Dict[str, List[Item]]:
+    return {_intern(cat): [Item.from_dict(i) for i in items if isinstance(i, dict)]
+            for cat, items in raw.items() if isinstance(items, list)}
+
+
+def encode_inventory(data: Dict[str, List[Item]]) -> dict:
+    return {cat: [item.to_dict() for item in items] for cat, items in data.items()}
+
+
+class InventoryCodec:
+    decode = staticmethod(decode_inventory)
+    encode = staticmethod(encode_inventory)
+
+
+INVENTORY_CODEC = InventoryCodec()
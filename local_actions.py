@@ -0,0 +1,97 @@
+"""
+Local fast path for purely mechanical player actions (config.LOCAL_ACTIONS).
+
+Some inputs need no storytelling, only a look at the game state:
+
+    "check inventory", "what time is it", "how hungry am I", "show my skills",
+    "how are my projects going", "how much money do I have", "eat the bread"
+
+match_action() recognises these by whole-input patterns and returns an Action.
+GameApp answers it from the tabs right away, without a model call, and appends
+a one-line note to the history so the GM knows what happened. Anything that
+doesn't match a pattern in full ("eat the bread and run for the door") goes to
+the GM as before. So does eating something that isn't a single, unambiguous
+food item.
+
+This module only holds the patterns and the survival wording; GameApp applies them.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+INVENTORY, TIME, STATUS, SKILLS, TASKS, WEALTH, EAT = "inventory", "time", "status", "skills", "tasks", "wealth", "eat"
+
+# DEFAULT_RULES: "each Food item should restore around 15 Nutrition when consumed"
+MEAL_NUTRITION = 15
+
+# DEFAULT_RULES: the player "does not feel hungry until their Nutrition reaches around 60"
+_HUNGER = [(60, "not hungry"), (30, "hungry"), (1, "starving"), (0, "collapsing from hunger")]
+_FATIGUE = [(60, "well rested"), (30, "tired"), (1, "exhausted"), (0, "unable to go on")]
+
+_MY = r"(?:my\s+|the\s+)?"
+_LOOK = r"(?:check|show|open|view|list|look at|look in|see)\s+"
+
+_PATTERNS: List[Tuple[str, str]] = [
+    # "pack" and "bag" are verbs too ("I pack my bags"), so alone they need a look verb or "my"
+    (INVENTORY, rf"(?:{_LOOK})?{_MY}(?:inventory|inv)"
+                rf"|(?:{_LOOK}{_MY}|my\s+)(?:items|bag|pack|backpack|belongings)"
+                r"|what(?:'s| is) in my (?:bag|pack|backpack|inventory)"
+                r"|what do i (?:have|carry)(?: on me| with me)?"),
+    (TIME, r"(?:what(?:'s| is) the )?time(?: is it)?(?: now)?|what time is it(?: now)?"
+           r"|what(?:'s| is) the (?:date|day)|what day is it(?: today)?"
+           r"|(?:check|tell me) the (?:time|date|day)"),
+    (STATUS, r"how (?:hungry|tired|fed|rested|exhausted) am i|am i (?:hungry|tired|starving|exhausted)"
+             rf"|(?:{_LOOK})?{_MY}(?:status|stats|hunger|stamina|nutrition|vitals)"),
+    (SKILLS, rf"(?:{_LOOK})?{_MY}skills?(?: list)?|what skills do i have|what are my skills"),
+    (TASKS, rf"(?:{_LOOK})?{_MY}(?:processes|projects|tasks|processing)"
+            r"|how are my (?:processes|projects|tasks) (?:doing|going|coming along)"),
+    (WEALTH, r"how much (?:money|coin|coins|gold) do i have"
+             rf"|(?:{_LOOK}|count\s+)?{_MY}(?:money|coins|purse|wealth|funds)"),
+    (EAT, r"(?:eat|consume)\s+(?:(?:a meal of|some of the|some of my|a|an|the|some|my|one)\s+)?(?P<food>[\w' -]+)"),
+]
+
+# Polite or first-person openers that don't change the meaning
+_LEAD = r"(?:(?:i|please|let me|i'll|i will|i want to)\s+)?"
+_COMPILED = [(kind, re.compile(rf"{_LEAD}(?:{pattern})", re.IGNORECASE)) for kind, pattern in _PATTERNS]
+
+# A food name with one of these is more than a mechanical action
+_NARRATIVE = re.compile(r"\b(?:and|then|while|with|before|after|to|from|at|in|on)\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Action:
+    kind: str
+    arg: str = ""       # the food to eat
+
+
+def match_action(text: str) -> Optional[Action]:
+    """The mechanical action `text` asks for, or None if it is anything else."""
+    clean = " ".join((text or "").split()).strip(" .!?")
+    if not clean or len(clean) > 60:
+        return None
+    for kind, pattern in _COMPILED:
+        m = pattern.fullmatch(clean)
+        if m is None:
+            continue
+        if kind == EAT:
+            food = m.group("food").strip(" -'")
+            if not food or _NARRATIVE.search(food):
+                return None
+            return Action(EAT, food)
+        return Action(kind)
+    return None
+
+
+def _describe(value: int, scale) -> str:
+    for floor, word in scale:
+        if value >= floor:
+            return word
+    return scale[-1][1]
+
+
+def describe_status(nutrition: int, stamina: int) -> str:
+    return (f"Nutrition {nutrition}/100 ({_describe(nutrition, _HUNGER)}), "
+            f"Stamina {stamina}/100 ({_describe(stamina, _FATIGUE)}).")
@@ -1,18 +1,38 @@
 from google import genai
 from google.genai import types
 import threading
-import json
 import sys
 import os
 import customtkinter as ctk
 import random
 import re
-from time_utils import add_hours, normalize_day_time
+import time
+from collections import Counter
+from game_clock import GameClock
+from time_skip import PASS_TIME_TAG, TimeSkip, normalize_activity, simulate_stats
 from dotenv import load_dotenv
 
 # Import Config and UI
-from config import GEMINI_API_KEY, MODEL, SAVES_DIR, DEFAULT_RULES
-from ui import MainMenu, InventoryTab, SkillsTab, MarkdownEditorTab, StoryTab, ProcessingTab
+from config import GEMINI_API_KEY, MODEL, SAVES_DIR, STORAGE_BACKEND, SAVE_FORMAT, HISTORY_TAIL_CHARS, AUTOSAVE_CHECKPOINTS, AUTOSAVE_DEBOUNCE_SECONDS
+from config import CONTEXT_POLICY, SUMMARIZE_MIN_WORDS, CONTEXT_BUDGET_TOKENS, RELEVANCE_TAIL_CHARS
+from config import CONTEXT_MODE, DELTA_REFRESH_TURNS, DELTA_MAX_TOKENS, CONTEXT_CACHE_TTL_SECONDS, LOCAL_ACTIONS
+from config import SPECULATION, SPECULATION_MAX_ACTIONS, SPECULATION_WASTE_CAP_TOKENS
+from state_store import atomic_write_text, write_savegame
+from save_objects import ObjectStore
+import sqlite_store
+from event_log import EventLog
+from save_loader import AdventurePreloader
+from autosave import AutosaveService
+from currency import CurrencyModel
+from rules import RuleFacts, assemble_rules, read_rules_file
+from context_policy import ContextPolicy, EXCLUDE
+from context_budget import ContextBudget, turn_sections
+from context_delta import DeltaTracker, PrefixCache, NO_CHANGES
+from local_actions import MEAL_NUTRITION, describe_status, match_action
+from speculation import Speculator, extract_suggestions
+from context_serializer import (ContextSerializer, estimate_tokens, keywords, serialize_inventory, serialize_inventory_overview,
+                                serialize_skills, serialize_processing, serialize_status)
+from ui import MainMenu, InventoryTab, SkillsTab, MarkdownEditorTab, StoryTab, ProcessingTab, UIDispatcher
 
 # --- Configuration ---
 load_dotenv()
@@ -29,6 +49,7 @@ class GameApp(ctk.CTk):
     def __init__(self):
         super().__init__()
         self.is_creating = False
+        self.currency = CurrencyModel()
         self.game_loaded_successfully = False
         self.title("AI RPG Adventure")
         self.geometry("1000x700")
@@ -43,17 +64,60 @@ class GameApp(ctk.CTk):
 
         self.current_adventure_path = None
         self.conversation_history = ""
+        # Older chat history left on disk by the tail-only load (savegame.snap or adventure.db);
+        # write_savegame carries it over without reading it
+        self.history_archive = None
+        # File writes performed by the last turn's commit, per tab (e.g. {"Inventory": 1})
+        self.last_turn_writes = {}
+        # Event log for rewinding; active_turn is the turn number events are tagged with
+        self.event_log = None
+        self.active_turn = 1
+        # True while query_ai runs a turn on the worker thread; a rewind then has to wait
+        self.turn_running = False
+        # Status as of the last recorded event (the label cache updates asynchronously via after())
+        self.latest_status = {}
+        # Current game time; the Day/Time strings elsewhere are only for display and the prompt
+        self.clock = GameClock()
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
+        self.tabs = ["Story", "Inventory", "Skills", "Processing", "Character", "World", "Journal"]
+        # Parses saves in the background while the player browses the menu
+        self.preloader = AdventurePreloader(SAVES_DIR, ["Character", "World", "Journal"],
+                                            storage_backend=STORAGE_BACKEND, tail_chars=HISTORY_TAIL_CHARS)
+        # Milliseconds from clicking a save to the game view being drawn (see load_adventure)
+        self.last_load_ms = None
+        # Writes the whole adventure off the Tk thread after each turn (see request_autosave)
+        self.autosave = AutosaveService(self._write_save, delay=AUTOSAVE_DEBOUNCE_SECONDS)
+        # Batches UI updates from the AI worker thread into one flush per frame
+        self.ui = UIDispatcher(self)
+        # Renders per UI key during the last turn (e.g. {"chat": 1, "Inventory": 1, "status": 1})
+        self.last_turn_redraws = {}
+        # Compact state sections for the prompt, cached until their tab changes
+        self.context = ContextSerializer()
+        # Which notes tabs are sent in full, summarized or left out (config.CONTEXT_POLICY)
+        self.context_policy = ContextPolicy(CONTEXT_POLICY, self._summarize_section, SUMMARIZE_MIN_WORDS)
+        # Per-turn token budget across rules, state and history (see _plan_context)
+        self.context_budget = ContextBudget(CONTEXT_BUDGET_TOKENS)
+        self.last_context_plan = None
+        # CONTEXT_MODE "delta": state snapshot in a cached prefix, per-turn changes against it
+        self.delta = DeltaTracker()
+        self.prefix_cache = PrefixCache(client, MODEL, CONTEXT_CACHE_TTL_SECONDS)
+        self.last_delta_tokens = 0
+        # Player actions this session by who answered them: "local" (local_actions.py) or "model"
+        self.action_counts = Counter()
+        # config.SPECULATION: responses to the GM's suggested actions, generated ahead of time
+        self.speculator = Speculator(self._generate, SPECULATION_WASTE_CAP_TOKENS)
+        # The last GM response as shown, for its suggested actions
+        self.last_gm_text = ""
+
         # --- VIEW 1: Main Menu ---
-        self.main_menu = MainMenu(self, on_load_callback=self.load_adventure)
+        self.main_menu = MainMenu(self, on_load_callback=self.load_adventure, preloader=self.preloader)
         self.main_menu.grid(row=0, column=0, sticky="nsew")
 
         # --- VIEW 2: Game Tabs (Hidden initially) ---
         self.tab_view = ctk.CTkTabview(self)
-        self.tabs = ["Story", "Inventory", "Skills", "Processing", "Character", "World", "Journal"]
         self.notebook_widgets = {} 
 
         for tab_name in self.tabs:
@@ -66,7 +130,8 @@ class GameApp(ctk.CTk):
                 # Initialize StoryTab with a callback to our 'handle_player_action' method
                 self.story_tab = StoryTab(frame, 
                                           on_send_callback=self.handle_player_action,
-                                          on_main_menu_callback=self.return_to_menu)
+                                          on_main_menu_callback=self.return_to_menu,
+                                          on_rewind_callback=self.prompt_rewind)
                 self.story_tab.grid(row=0, column=0, sticky="nsew")
                 self.notebook_widgets[tab_name] = self.story_tab
             
@@ -90,6 +155,16 @@ class GameApp(ctk.CTk):
                 editor.grid(row=0, column=0, sticky="nsew")
                 self.notebook_widgets[tab_name] = editor
 
+        for tab_name in ("Inventory", "Skills", "Processing"):
+            self.notebook_widgets[tab_name].on_event = self._record_event
+
+        # Systems that react to game time passing
+        self.clock.subscribe(self._processes_due)
+        self.clock.subscribe(self._spoilage_due)
+
+        self.story_tab.dispatcher = self.ui
+        self.ui.start()
+
         self.protocol("WM_DELETE_WINDOW", self.on_close)
         
     def _get_skill_level(self, skill_name: str) -> int:
@@ -104,26 +179,172 @@ class GameApp(ctk.CTk):
             pass
         return 0
 
+    def _current_status(self):
+        # The StoryTab cache is refreshed via after(), so overlay what this turn already recorded
+        return {**self.story_tab.get_status_data(), **self.latest_status}
+
+    # --- Clock ---
+
+    def _publish_status(self, turn, location, nutrition, stamina):
+        """Records the status at the clock's current time and schedules the label update."""
+        day, time = self.clock.day_string, self.clock.time_string
+        self._record_status(turn, location, day, time, nutrition, stamina)
+        self.ui.coalesce("status", lambda: self.story_tab.update_status(
+            turn, location, day, time, nutrition=nutrition, stamina=stamina
+        ))
+
+    def _processes_due(self, now, previous):
+        finished_items = self.notebook_widgets["Processing"].check_active_tasks(now)
+        if finished_items:
+            return [f"System: Process completed - {', '.join(finished_items)}"]
+        return None
+
+    def _spoilage_due(self, now, previous):
+        return self.notebook_widgets["Inventory"].expire_spoiled(now)
+
+    def _announce(self, messages):
+        for msg in messages:
+            self.story_tab.print_text(msg, sender="System")
+            self.conversation_history += f"\n{msg}\n"
+
     def _advance_time_hours(self, hours: float):
-        cur = self.story_tab.get_status_data()
-        gt = add_hours(cur.get("day", "Day 1"), cur.get("time", "12:00 AM"), hours)
+        cur = self._current_status()
+        # Tick subscribers complete passive processes and spoil food
+        messages = self.clock.advance(hours)
+        self._publish_status(cur.get("turn", "1"), cur.get("location", "Unknown"),
+                             int(cur.get("nutrition", 100)), int(cur.get("stamina", 100)))
+        self._announce(messages)
+        return messages
+
+    def _pass_time(self, hours: float, activity: str) -> TimeSkip:
+        """Fast-forwards the clock and survival stats in one step (see time_skip.py)."""
+        cur = self._current_status()
+        activity = normalize_activity(activity)
+        hours = max(0.0, float(hours))
 
-        turn = cur.get("turn", "1")
-        location = cur.get("location", "Unknown")
         nutrition = int(cur.get("nutrition", 100))
         stamina = int(cur.get("stamina", 100))
+        new_nutrition, new_stamina = simulate_stats(nutrition, stamina, hours, activity)
+
+        # Reported once, inside the skip summary
+        events = self.clock.advance(hours)
+        self._publish_status(cur.get("turn", "1"), cur.get("location", "Unknown"), new_nutrition, new_stamina)
+        return TimeSkip(hours, activity, self.clock.day_string, self.clock.time_string,
+                        (nutrition, new_nutrition), (stamina, new_stamina), events)
+
+    # --- Event Log / Rewind ---
+
+    def _record_event(self, kind, payload):
+        self.delta.record(kind, payload)
+        if self.event_log:
+            self.event_log.record(self.active_turn, kind, **payload)
+
+    def _record_status(self, turn, location, day, time, nutrition, stamina):
+        self.latest_status = {
+            "turn": str(turn), "location": location, "day": day, "time": time,
+            "nutrition": nutrition, "stamina": stamina,
+        }
+        self._record_event("status_set", {"status": dict(self.latest_status)})
+
+    def _capture_state(self):
+        return {
+            # JSON shape (inventory Items are converted by the store's codec)
+            "inventory": self.notebook_widgets["Inventory"].store.to_raw(),
+            "skills": self.notebook_widgets["Skills"].store.to_raw(),
+            "processing": self.notebook_widgets["Processing"].store.to_raw(),
+            "status": dict(self.latest_status),
+        }
+
+    def prompt_rewind(self):
+        if not self.event_log:
+            return
+        dialog = ctk.CTkInputDialog(text=f"Rewind to the end of which turn? (current: {self.active_turn})", title="Rewind")
+        raw = dialog.get_input()
+        if not raw:
+            return
+        try:
+            turn = int(raw.strip())
+        except ValueError:
+            self.story_tab.print_text(f"System: '{raw}' is not a turn number.", sender="System")
+            return
+        self.rewind_to_turn(turn)
 
-        self.after(0, lambda: self.story_tab.update_status(
-            turn, location, gt.as_day_string(), gt.as_time_string(),
-            nutrition=nutrition, stamina=stamina
-        ))
+    def rewind_to_turn(self, turn):
+        """
+        Restores Inventory/Skills/Processing/Status to the end of `turn` from the nearest
+        snapshot plus the events after it. Chat history is kept; a note marks the rewind.
+        Refused while the GM is answering: the worker would apply its tags on top of the rewound state.
+        """
+        if self.turn_running:
+            self.story_tab.print_text("System: Wait for the GM to finish before rewinding.", sender="System")
+            return
+        self._commit_turn()
+        self.speculator.cancel()
+        state, offset = self.event_log.state_at(turn)
+        if state is None:
+            self.story_tab.print_text(f"System: No snapshot old enough to rewind to turn {turn}.", sender="System")
+            return
+
+        for tab_name, key in (("Inventory", "inventory"), ("Skills", "skills"), ("Processing", "processing")):
+            widget = self.notebook_widgets[tab_name]
+            widget.store.load_raw(state.get(key) or type(widget.store.data)())
+        self.event_log.truncate_after(turn, offset)
+        self.active_turn = turn
+
+        status = state.get("status") or {}
+        if status:
+            self.latest_status = dict(status, turn=str(turn))
+            self.clock.set_day_time(status.get("day", "Day 1"), status.get("time", "12:00 AM"), notify=False)
+            self.story_tab.update_status(
+                turn, status.get("location", "Unknown"), status.get("day", "Day 1"), status.get("time", "12:00 AM"),
+                status.get("nutrition", 100), status.get("stamina", 100)
+            )
+        self._commit_turn()
+
+        note = f"System: Rewound the game state to the end of turn {turn}."
+        self.story_tab.print_text(note, sender="System")
+        self.conversation_history += f"\n{note}\n"
+
+    # --- Turn Commit ---
+
+    def _commit_turn(self):
+        """
+        Writes every dirty data tab to disk once and schedules one redraw per changed tab.
+        Tag handlers only mutate in-memory state, so a turn with 30 ADD tags still
+        costs a single inventory.json write.
+        """
+        writes = {}
+        for name in ("Inventory", "Skills", "Processing"):
+            widget = self.notebook_widgets[name]
+            try:
+                if widget.commit():
+                    writes[name] = 1
+                    self.ui.coalesce(name, widget.refresh_display)
+            except Exception as e:
+                print(f"Error saving {name}: {e}")
+        if self.event_log:
+            try:
+                self.event_log.flush()
+                self.event_log.maybe_snapshot(self.active_turn, self._capture_state)
+            except Exception as e:
+                print(f"Error writing event log: {e}")
+        self.last_turn_writes = writes
+        return writes
 
-        
     def return_to_menu(self):
         """Saves game and goes back to main menu."""
+        self.speculator.cancel()
+        self.ui.flush()
         self.save_game()
+        if self.current_adventure_path:
+            # The preloader's copy (if any) predates this session's changes
+            self.preloader.invalidate(os.path.basename(self.current_adventure_path))
         self.current_adventure_path = None
+        self.history_archive = None
+        self.event_log = None
         self.is_creating = False
+        # Release adventure.db handles so the menu can rename/delete the folder
+        sqlite_store.close_all()
         
         # Hide Game Tabs
         self.tab_view.grid_forget()
@@ -134,13 +355,14 @@ class GameApp(ctk.CTk):
         self.main_menu.grid(row=0, column=0, sticky="nsew")
 
     def load_adventure(self, save_name):
+        load_start = time.perf_counter()
         self.game_loaded_successfully = False
         self.current_adventure_path = os.path.join(SAVES_DIR, save_name)
         self.story_tab.clear_chat()
-        # Migrate legacy inventory format (old list items -> dict items)
-        self._migrate_inventory_legacy_format()
+        # Usually already parsed in the background while the pointer was over the save.
+        # A save with pending migrations (save_schema.py) or the SQLite import is only prepared now
+        preloaded = self.preloader.take(save_name)
 
-        
         # UI Switch
         self.main_menu.grid_forget()
         self.tab_view.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
@@ -149,40 +371,48 @@ class GameApp(ctk.CTk):
         # Propagate Path (Now with Error Handling)
         for name, widget in self.notebook_widgets.items():
             try:
-                if hasattr(widget, 'set_base_path'):
-                    widget.set_base_path(self.current_adventure_path)
+                if name in preloaded.errors:
+                    raise preloaded.errors[name]
+                if hasattr(widget, 'bind_store') and name in preloaded.stores:
+                    widget.bind_store(self.current_adventure_path, preloaded.stores[name])
                 elif isinstance(widget, MarkdownEditorTab):
                     widget.filename = os.path.join(self.current_adventure_path, f"{name}.md")
-                    if os.path.exists(widget.filename):
-                        with open(widget.filename, "r", encoding="utf-8") as f:
-                            widget.set_text(f.read())
-                    else: widget.set_text(f"{name}\n")
+                    widget.set_text(preloaded.markdown.get(name, f"{name}\n"))
             except Exception as e:
                 # This prevents the "Silent Freeze" if a tab crashes
                 print(f"Error loading tab {name}: {e}")
                 self.story_tab.print_text(f"[System Error loading {name}: {e}]", sender="System")
 
+        # Section summaries already made for this adventure
+        self.context_policy.open(self.current_adventure_path)
+
+        # Denominations for the inventory value totals (empty until creation sets them)
+        self.currency = preloaded.currency
+        self.notebook_widgets["Inventory"].set_currency(self.currency)
+
         # Load History & Status
-        history_path = os.path.join(self.current_adventure_path, "savegame.json")
-        if os.path.exists(history_path):
+        if preloaded.savegame is not None or "savegame" in preloaded.errors:
             try:
-                with open(history_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.is_creating = bool(data.get("is_creating", False))
-                    hist = data.get("Chat History", [])
-                    self.conversation_history = "\n".join(hist) if isinstance(hist, list) else hist
-                    
-                    # Update StoryTab Status
-                    status = data.get("Status", {})
-                    if status:
-                        self.story_tab.update_status(
-                            status.get("turn", "1"),
-                            status.get("location", "Unknown"),
-                            status.get("day", "1"),
-                            status.get("time", "Start"),
-                            status.get("nutrition", 100),
-                            status.get("stamina", 100)
-                        )
+                if "savegame" in preloaded.errors:
+                    raise preloaded.errors["savegame"]
+                # Snapshots only decode the history tail the prompt actually uses
+                data = preloaded.savegame or {}
+                self.is_creating = bool(data.get("is_creating", False))
+                self.history_archive = data.get("History Archive")
+                hist = data.get("Chat History", [])
+                self.conversation_history = "\n".join(hist) if isinstance(hist, list) else hist
+                
+                # Update StoryTab Status
+                status = data.get("Status", {})
+                if status:
+                    self.story_tab.update_status(
+                        status.get("turn", "1"),
+                        status.get("location", "Unknown"),
+                        status.get("day", "1"),
+                        status.get("time", "Start"),
+                        status.get("nutrition", 100),
+                        status.get("stamina", 100)
+                    )
                 
                 self.story_tab.print_text(f"System: Loaded '{save_name}'.", sender="System")
                 if self.is_creating:
@@ -196,26 +426,59 @@ class GameApp(ctk.CTk):
                     self.story_tab.print_text(last_gm_msg, sender="GM")
                 else:
                     # Normal game: Generate Recap
-                    recent = self.conversation_history[-3000:]
+                    recent = self.conversation_history[-HISTORY_TAIL_CHARS:]
                     # We grab the text from Inventory, World, Character, etc. NOW, 
                     # because accessing these widgets inside the thread later might crash Tkinter.
-                    context_data = ""
-                    for name, widget in self.notebook_widgets.items():
-                        if name != "Story": 
-                            if hasattr(widget, 'get_text'):
-                                context_data += f"\n[{name.upper()}]:\n{widget.get_text().strip()}\n"
+                    context_data = self._state_context()
                     curr_stat = self.story_tab.get_status_data()
-                    context_data += f"\n[STATUS]\nLocation: {curr_stat['location']}\nDay: {curr_stat['day']}\nTime: {curr_stat['time']}\n"
+                    context_data += "\n\n" + serialize_status(curr_stat['location'], self.clock.day_string, self.clock.time_string) + "\n"
                     threading.Thread(target=self.generate_recap, args=(recent,context_data), daemon=True).start()
             except Exception as e:
                 self.story_tab.print_text(f"Error loading history: {e}", sender="System")
         else:
             self.conversation_history = ""
+            self.history_archive = None
             self.is_creating = True
             self.story_tab.print_text("System: Initialization Sequence Started...", sender="System")
             threading.Thread(target=self.start_creation_wizard, daemon=True).start()
             
+        # Start (or continue) the event log; saves without one get a base snapshot now
+        cur = self.story_tab.get_status_data()
+        self.latest_status = {k: cur.get(k) for k in ("turn", "location", "day", "time", "nutrition", "stamina")}
+        self.clock.set_day_time(cur.get("day", "Day 1"), cur.get("time", "12:00 AM"), notify=False)
+        try:
+            self.active_turn = int(cur.get("turn", 1))
+        except (TypeError, ValueError):
+            self.active_turn = 1
+        self.event_log = EventLog(self.current_adventure_path)
+        try:
+            self.event_log.ensure_base_snapshot(self.active_turn, self._capture_state())
+        except Exception as e:
+            print(f"Error creating base snapshot: {e}")
+
         self.game_loaded_successfully = True
+        # Time-to-interactive: measured once Tk has drawn the game view
+        self.after_idle(lambda: self._report_load_time(save_name, load_start, preloaded.elapsed_ms))
+
+    def _report_turn_redraws(self):
+        self.last_turn_redraws = self.ui.report()
+        renders = ", ".join(f"{key}={count}" for key, count in sorted(self.last_turn_redraws.items()))
+        print(f"Turn {self.active_turn} redraws: {renders or 'none'}")
+        if self.last_context_plan is not None:
+            print(f"Turn {self.active_turn} context: {self.last_context_plan.summary()}")
+            if CONTEXT_MODE == "delta" and self.delta.snapshot:
+                print(f"Turn {self.active_turn} delta: {self.last_delta_tokens} tokens against a "
+                      f"{estimate_tokens(self.delta.snapshot)}-token snapshot ({self.delta.turns}/{DELTA_REFRESH_TURNS} turns)")
+        total = sum(self.action_counts.values())
+        if total:
+            local = self.action_counts["local"]
+            print(f"Actions answered locally: {local}/{total} ({local / total:.0%})")
+        if SPECULATION:
+            print(f"Speculation: {self.speculator.report()}")
+
+    def _report_load_time(self, save_name, load_start, read_ms):
+        self.last_load_ms = (time.perf_counter() - load_start) * 1000
+        print(f"Loaded '{save_name}' in {self.last_load_ms:.0f} ms (file reads: {read_ms:.0f} ms)")
             
     def start_creation_wizard(self):
         """Sends the initial system prompt to start the interview."""
@@ -237,70 +500,22 @@ class GameApp(ctk.CTk):
             self.story_tab.print_text(f"Creation Error: {e}", sender="System")
 
     def load_rules(self):
+        """The adventure's own rules.md if it has one, otherwise the rule sections that apply right now."""
         if self.current_adventure_path:
-            local_rules = os.path.join(self.current_adventure_path, "rules.md")
-            if os.path.exists(local_rules):
-                try:
-                    with open(local_rules, "r") as f: return f.read()
-                except: pass
-        return DEFAULT_RULES
+            local_rules = read_rules_file(os.path.join(self.current_adventure_path, "rules.md"))
+            if local_rules is not None:
+                return local_rules
+        return assemble_rules(self._rule_facts())
+
+    def _rule_facts(self):
+        processing = self.notebook_widgets["Processing"].load_data()
+        return RuleFacts(
+            food=self.notebook_widgets["Inventory"].has_food(),
+            tasks=bool(processing),
+            projects=any(entry.get("type") == "project" and entry.get("status") != "COMPLETED" for entry in processing),
+            journal=self.context_policy.policy("Journal") != EXCLUDE,
+        )
     
-        # --- Legacy Migration Helpers ---
-
-    def _migrate_inventory_legacy_format(self):
-        """
-        Converts old inventory item lists:
-          [Name, Desc, Amount, Value]
-        into the new dict format:
-          {"name":..., "desc":..., "amount":..., "value":...}
-        """
-        if not self.current_adventure_path:
-            return
-
-        inv_path = os.path.join(self.current_adventure_path, "inventory.json")
-        if not os.path.exists(inv_path):
-            return
-
-        try:
-            with open(inv_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception:
-            return
-
-        if not isinstance(data, dict):
-            return
-
-        changed = False
-        for cat, items in list(data.items()):
-            if not isinstance(items, list):
-                continue
-
-            new_items = []
-            for item in items:
-                if isinstance(item, dict):
-                    # Already new format
-                    new_items.append(item)
-                elif isinstance(item, list):
-                    # Legacy format
-                    name = item[0] if len(item) > 0 else "Unknown"
-                    desc = item[1] if len(item) > 1 else "No desc"
-                    amt  = item[2] if len(item) > 2 else "1"
-                    val  = item[3] if len(item) > 3 else "0"
-                    new_items.append({"name": name, "desc": desc, "amount": str(amt), "value": str(val)})
-                    changed = True
-                else:
-                    # Skip broken entries
-                    changed = True
-
-            data[cat] = new_items
-
-        if changed:
-            try:
-                with open(inv_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=4)
-            except Exception:
-                pass
-
     # --- Stat Helpers ---
 
     def _apply_modify_stat(self, stat_name: str, raw_value: str) -> str:
@@ -318,7 +533,7 @@ class GameApp(ctk.CTk):
         if stat not in ("stamina", "nutrition"):
             return f"System: Unknown stat '{stat_name}'."
 
-        cur = self.story_tab.get_status_data()
+        cur = self._current_status()
         cur_val = int(cur.get(stat, 100))
 
         # Parse set vs delta
@@ -340,8 +555,7 @@ class GameApp(ctk.CTk):
         # Preserve current time/location/turn/day; only change the stat
         turn = cur.get("turn", "1")
         location = cur.get("location", "Unknown")
-        day = cur.get("day", "Day 1")
-        time = cur.get("time", "Morning")
+        day, time = self.clock.day_string, self.clock.time_string
 
         nutrition = int(cur.get("nutrition", 100))
         stamina = int(cur.get("stamina", 100))
@@ -350,7 +564,9 @@ class GameApp(ctk.CTk):
         else:
             stamina = new_val
 
-        self.after(0, lambda: self.story_tab.update_status(turn, location, day, time, nutrition=nutrition, stamina=stamina))
+        self._record_event("stat_changed", {"stat": stat, "value": new_val})
+        self.latest_status[stat] = new_val
+        self.ui.coalesce("status", lambda: self.story_tab.update_status(turn, location, day, time, nutrition=nutrition, stamina=stamina))
         return f"System: {stat.title()} is now {new_val}."
 
 
@@ -359,18 +575,10 @@ class GameApp(ctk.CTk):
     def handle_player_action(self, user_text):
         """Called by StoryTab when user clicks Act."""
         # 1. Update UI
-        self.story_tab.set_controls_state(False, "GM is thinking...")
+        self.ui.begin_turn()
         self.story_tab.print_text(user_text, sender="Player")
 
         # 2. Gather Context
-        context_data = ""
-        for name, widget in self.notebook_widgets.items():
-            # StoryTab doesn't need to feed into context, other tabs do
-            if name != "Story": 
-                # Note: Inventory/Skills tabs now have .get_text() methods from previous steps
-                if hasattr(widget, 'get_text'):
-                    context_data += f"\n[{name.upper()}]:\n{widget.get_text().strip()}\n"
-                    
         current_status = self.story_tab.get_status_data()
         try:
             current_turn_int = int(current_status['turn'])
@@ -378,23 +586,221 @@ class GameApp(ctk.CTk):
             current_turn_int = 1
         
         next_turn_int = current_turn_int + 1
-        # We tell the AI exactly what the *Next* turn is.
-        status_context = (
-            f"\n[CURRENT STATUS]\n"
-            f"Location: {current_status['location']}\n"
-            f"Day: {current_status['day']}\n"
-            f"Time: {current_status['time']}\n"
-            f"Current Turn: {current_turn_int}\n"
-            f"UPCOMING TURN: {next_turn_int} (You MUST use this number in the [[STATUS]] tag)"
-        )
-        context_data += status_context
+        # Everything applied while answering this action belongs to the upcoming turn
+        self.active_turn = next_turn_int
+
+        # Mechanical commands are answered from the game state (see local_actions.py)
+        action = match_action(user_text) if LOCAL_ACTIONS and not self.is_creating else None
+        if action is not None and self._run_local_action(action, user_text):
+            return
+        self.action_counts["model"] += 1
+        self.turn_running = True
+        self.story_tab.set_controls_state(False, "GM is thinking...")
+
+        # A response generated ahead of time for one of the GM's suggestions (see speculation.py)
+        speculation = self.speculator.claim(user_text) if SPECULATION else None
+        if speculation is not None:
+            user_text = speculation.action
 
         # 3. Build Prompt
-        recent_history = self.conversation_history[-3000:] if len(self.conversation_history) > 3000 else self.conversation_history
-        full_prompt = f"{context_data}\nHistory:\n{recent_history}\nPlayer: {user_text}\nGM:"
+        full_prompt, prefix = self._build_prompt(user_text)
+        if speculation is not None and not speculation.matches(self.load_rules(), full_prompt, prefix):
+            # Made for a different state
+            self.speculator.reject(speculation)
+            speculation = None
 
         # 4. Thread the AI Call
-        threading.Thread(target=self.query_ai, args=(full_prompt, user_text), daemon=True).start()
+        threading.Thread(target=self.query_ai, args=(full_prompt, user_text, 0, prefix, speculation), daemon=True).start()
+
+    def _build_prompt(self, user_text, peek=False):
+        """
+        (prompt, prefix) for the player's `user_text`, within the token budget (see context_budget.py).
+        peek builds the same prompt without recording that it was sent (for speculation).
+        """
+        current_status = self.story_tab.get_status_data()
+        try:
+            current_turn_int = int(current_status['turn'])
+        except (KeyError, TypeError, ValueError):
+            current_turn_int = 1
+        recent_history = self.conversation_history[-HISTORY_TAIL_CHARS:]
+        plan = self._plan_context(user_text, recent_history, current_status['location'], current_turn_int,
+                                  current_turn_int + 1, peek=peek)
+        if CONTEXT_MODE == "delta":
+            prefix, context_data = self._delta_context(plan, peek=peek)
+        else:
+            prefix, context_data = None, self._join_sections(plan, self._context_order())
+        if not peek:
+            self.last_context_plan = plan
+        return f"{context_data}\nHistory:\n{plan.get('History')}\nPlayer: {user_text}\nGM:", prefix
+
+    # --- Local Actions ---
+
+    def _run_local_action(self, action, user_text):
+        """Answers `action` without the model. False if it needs the GM after all (e.g. an unknown food)."""
+        result = getattr(self, f"_local_{action.kind}")(action)
+        if result is None:
+            return False
+        reply, note = result
+        # The state changed; no suggestion's response fits any more
+        self.speculator.cancel()
+        self.story_tab.print_text(reply, sender="System")
+        # Keeps the GM consistent with what happened off-model
+        self.conversation_history += f"Player: {user_text}\n[System: {note}]\n"
+        self.action_counts["local"] += 1
+        self.last_context_plan = None
+        self._commit_turn()
+        self.ui.call(self.request_autosave)
+        self.ui.call(self._report_turn_redraws)
+        return True
+
+    def _local_inventory(self, action):
+        inventory = self.notebook_widgets["Inventory"]
+        parts = [serialize_inventory(inventory.load_data()), inventory.wealth_summary()]
+        return "\n\n".join(part for part in parts if part), "Player checked their inventory."
+
+    def _local_time(self, action):
+        location = self._current_status().get("location", "Unknown")
+        return f"It is {self.clock.day_string}, {self.clock.time_string}, at {location}.", "Player checked the time."
+
+    def _local_status(self, action):
+        cur = self._current_status()
+        reply = describe_status(int(cur.get("nutrition", 100)), int(cur.get("stamina", 100)))
+        return reply, "Player checked their hunger and stamina."
+
+    def _local_skills(self, action):
+        skills = self.notebook_widgets["Skills"].load_data()
+        return (serialize_skills(skills) if skills else "You have no skills yet."), "Player looked over their skills."
+
+    def _local_tasks(self, action):
+        processing = self.notebook_widgets["Processing"].load_data()
+        reply = serialize_processing(processing) if processing else "No active processes or projects."
+        return reply, "Player checked on their processes and projects."
+
+    def _local_wealth(self, action):
+        reply = self.notebook_widgets["Inventory"].wealth_summary() or "You carry nothing of value."
+        return reply, "Player counted their money."
+
+    def _local_eat(self, action):
+        inventory = self.notebook_widgets["Inventory"]
+        now = self.clock.minutes
+        found = inventory.find_food(action.arg, now)
+        if found is None:
+            return None
+        item, spoiled = found
+        name = item.name
+        res = inventory.consume_food(name, now)
+        if spoiled:
+            return res, f"Player tried to eat {name}, but it had spoiled and was thrown out."
+        stat = self._apply_modify_stat("Nutrition", f"+{MEAL_NUTRITION}")
+        return f"{res}\n{stat}", f"Player ate {name} {res} Nutrition is now {self.latest_status['nutrition']}."
+
+    # --- Model Context ---
+
+    # Tabs whose state is sent in the compact format (context_serializer); the rest are notes,
+    # sent according to config.CONTEXT_POLICY
+    CONTEXT_SERIALIZERS = {"Inventory": serialize_inventory, "Skills": serialize_skills, "Processing": serialize_processing}
+
+    def _state_sections(self, peek=False):
+        """{tab: section text} for the prompt. Each section is only re-serialized when its tab changed."""
+        sections = {}
+        for name, widget in self.notebook_widgets.items():
+            # StoryTab doesn't need to feed into context, other tabs do
+            if name == "Story":
+                continue
+            serialize = self.CONTEXT_SERIALIZERS.get(name)
+            if serialize is not None:
+                store = widget.store
+                sections[name] = self.context.section(name, (store, store.revision), lambda: serialize(store.data))
+            elif hasattr(widget, 'get_text'):
+                body = self.context_policy.render(name, widget.get_text().strip(), peek=peek)
+                if body is not None:
+                    sections[name] = self.context.section(name, body, lambda: f"[{name.upper()}]\n{body}")
+        return sections
+
+    def _state_context(self):
+        return "\n\n".join(self._state_sections().values())
+
+    # Planned sections that change every turn; everything else from _context_order is state
+    LIVE_SECTIONS = ("Wealth", "Spoiling", "Status")
+
+    def _context_order(self):
+        # Where each planned section goes in the prompt (History is placed separately)
+        return [name for name in self.notebook_widgets if name != "Story"] + list(self.LIVE_SECTIONS)
+
+    @staticmethod
+    def _join_sections(plan, names):
+        return "\n\n".join(text for text in (plan.get(name) for name in names) if text)
+
+    def _delta_context(self, plan, peek=False):
+        """
+        (prefix, per-turn context) for CONTEXT_MODE "delta": the state snapshot goes in the
+        (cached) prefix, the turn only carries the changes since it (see context_delta.py).
+        The snapshot holds the full state sections, not the budget-degraded ones from `plan`,
+        since it is reused for many turns. peek returns the same without taking the snapshot
+        or counting the turn.
+        """
+        state = self._state_sections(peek)
+        state_names = [name for name in self._context_order() if name not in self.LIVE_SECTIONS]
+        snapshot = "\n\n".join(state[name] for name in state_names if state.get(name))
+        notes = {name: state.get(name, "") for name in state_names if name not in self.CONTEXT_SERIALIZERS}
+        inventory, skills, processing = (self.notebook_widgets[name].load_data() for name in ("Inventory", "Skills", "Processing"))
+        live = self._join_sections(plan, self.LIVE_SECTIONS)
+        refresh = (not self.delta.snapshot or self.delta.stale(inventory, skills, processing)
+                   or self.delta.turns >= DELTA_REFRESH_TURNS or self.delta.tokens() > DELTA_MAX_TOKENS)
+        if peek:
+            if refresh:
+                return snapshot, f"{NO_CHANGES}\n\n{live}"
+            return self.delta.snapshot, f"{self.delta.diff(notes)}\n\n{live}"
+        if refresh:
+            self.delta.reset(snapshot, inventory, skills, processing, notes)
+        self.delta.turns += 1
+        context_data = self.delta.diff(notes) + "\n\n" + live
+        self.last_delta_tokens = estimate_tokens(context_data)
+        return self.delta.snapshot, context_data
+
+    def _plan_context(self, user_text, recent_history, location, turn, upcoming, peek=False):
+        """
+        Fits the state sections and history into CONTEXT_BUDGET_TOKENS, in priority order:
+        status, processes, the inventory relevant to this turn (or counts), history (recent
+        lines), then the full inventory, skills and notes (see turn_sections). Lower priorities
+        lose detail first.
+        """
+        state = self._state_sections(peek)
+        inventory = self.notebook_widgets["Inventory"]
+        data = inventory.load_data()
+
+        # Exact totals, so the GM doesn't have to add up (or convert) the item values itself
+        wealth = self.context.section("Wealth", (inventory.store, inventory.store.revision, self.currency),
+                                      inventory.wealth_summary)
+        wealth = f"[WEALTH]\n{wealth}" if wealth else ""
+        spoiling = inventory.spoiling_soon(self.clock.minutes)
+        relevant = keywords(f"{user_text}\n{recent_history[-RELEVANCE_TAIL_CHARS:]}")
+
+        rules = self.load_rules()
+        self.context.section("Rules", rules, lambda: rules)
+        rules_tokens = self.context.tokens["Rules"]
+        sections = turn_sections(
+            # We tell the AI exactly what the *Next* turn is.
+            status=serialize_status(location, self.clock.day_string, self.clock.time_string, turn=turn, upcoming=upcoming),
+            spoiling=f"[SPOILING SOON]\n{spoiling}" if spoiling else "",
+            processing=state.pop("Processing", ""),
+            inventory=state.pop("Inventory", ""),
+            relevant_inventory=lambda: serialize_inventory(data, relevant),
+            inventory_counts=serialize_inventory_overview(data),
+            wealth=wealth,
+            skills=state.pop("Skills", ""),
+            history=recent_history,
+            notes=state,
+        )
+        return self.context_budget.plan(sections, reserved=rules_tokens)
+
+    def _summarize_section(self, name, text):
+        """Summarizer for ContextPolicy. Runs on a background thread."""
+        prompt = (f"Condense these {name} notes from a role-playing game into a compact reference for the Game Master. "
+                  f"Keep every name, place, relationship, number and unresolved thread; drop prose and repetition. "
+                  f"Plain lines, no headings.\n\n{text}")
+        resp = client.models.generate_content(model=MODEL, contents=prompt)
+        return resp.text or ""
 
     def perform_skill_check(self, skill_name):
         clean_name = skill_name.split('(')[0].strip().title()
@@ -421,6 +827,7 @@ class GameApp(ctk.CTk):
             skill_entry["Threshold"] += 2
             leveled_up = True
             
+        self._record_event("skill_changed", {"skill": skill_entry})
         skills_tab.save_data(data)
         
         bonus = skill_entry["Level"]
@@ -441,23 +848,39 @@ class GameApp(ctk.CTk):
         self.story_tab.print_text(msg, sender="System")
         return total
 
-    def query_ai(self, prompt, user_text, recursion_depth=0):
+    def _generate(self, rules, prompt, prefix=None):
+        """One model call; returns the response text."""
+        config = types.GenerateContentConfig(system_instruction=rules, temperature=0.7)
+        contents = prompt
+        if prefix:
+            # Rules + state snapshot from the context cache; inline (same bytes every turn) if there is none
+            cache_name = self.prefix_cache.ensure(rules, prefix)
+            if cache_name:
+                config = types.GenerateContentConfig(cached_content=cache_name, temperature=0.7)
+            else:
+                contents = f"{prefix}\n\n{prompt}"
+        response = client.models.generate_content(model=MODEL, contents=contents, config=config)
+        return response.text or ""
+
+    def query_ai(self, prompt, user_text, recursion_depth=0, prefix=None, speculation=None):
         from config import CREATION_RULES
         
         if self.is_creating:
             current_rules = CREATION_RULES
         else:
             current_rules = self.load_rules()
+        if recursion_depth == 0:
+            self.last_gm_text = ""
         try:
-            response = client.models.generate_content(
-                model=MODEL,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction=current_rules,
-                    temperature=0.7
-                )
-            )
-            ai_text = response.text or ""
+            # A pre-generated response (see speculation.py) gets its tags applied below, like a fresh one
+            ai_text = speculation.wait() if speculation is not None else None
+            if ai_text:
+                self.speculator.commit(speculation)
+            else:
+                if speculation is not None:
+                    self.speculator.reject(speculation)
+                ai_text = self._generate(current_rules, prompt, None if self.is_creating else prefix)
+            raw_text = ai_text
             if not ai_text: raise ValueError("Empty response")
             
             # --- PARSE CREATION TAGS (Only if creating) ---
@@ -481,14 +904,25 @@ class GameApp(ctk.CTk):
                     s_lvl = int(match.group(2))
                     self.notebook_widgets["Skills"].force_learn_skill(s_name, s_lvl)
 
-                # 4. Start Game Trigger
+                # 4. Currency -> currency.json (before the starting items are added, so they get valued)
+                # Format: [[CURRENCY: Bit = 1 | Mark = 10 | Crown = 100]]
+                currency_match = re.search(r"\[\[CURRENCY:\s*(.*?)\]\]", ai_text)
+                if currency_match:
+                    try:
+                        self.currency = CurrencyModel.from_tag(currency_match.group(1))
+                        self.currency.save(self.current_adventure_path)
+                        self.notebook_widgets["Inventory"].set_currency(self.currency)
+                    except ValueError as e:
+                        self.story_tab.print_text(f"System: Ignored currency table ({e})", sender="System")
+
+                # 5. Start Game Trigger
                 if "[[START_GAME]]" in ai_text:
                     self.is_creating = False
                     self.story_tab.print_text("\n[System: Creation Complete. Saving Data...]\n", sender="System")
                     self.save_game()
                     # Clean the tag out of the text so player doesn't see it
                     ai_text = ai_text.replace("[[START_GAME]]", "")
-                    self.conversation_history += response.text or ""
+                    self.conversation_history += raw_text
                     #return
                     
             
@@ -519,7 +953,17 @@ class GameApp(ctk.CTk):
                     self.story_tab.print_text(res, sender="System")
                     self.conversation_history += f"\n{res}\n"
 
-            
+
+            # 1.7 Time Skips
+            # Tag: [[PASS_TIME: Hours | Activity]] (Activity: Sleep / Rest / Travel / Wait)
+            skip_notes = []
+            for match in PASS_TIME_TAG.finditer(ai_text):
+                skip = self._pass_time(float(match.group(1)), match.group(2) or "wait")
+                note = skip.summary()
+                self.story_tab.print_text(note, sender="System")
+                self.conversation_history += f"\n{note}\n"
+                skip_notes.append(note)
+
             # 2. Status Update
             status_match = re.search(r"\[\[STATUS:\s*(.*?)\s*\|\s*(.*?)\s*\|\s*(.*?)\s*\|\s*(.*?)\]\]", ai_text)
             if status_match:
@@ -527,37 +971,29 @@ class GameApp(ctk.CTk):
                 location = status_match.group(2).strip()
                 day = status_match.group(3).strip()
                 time = status_match.group(4).strip()
-                cur_stats = self.story_tab.get_status_data()
-                nut = cur_stats.get("nutrition", 100)
-                sta = cur_stats.get("stamina", 100)
-                self.after(0, lambda: self.story_tab.update_status(turn, location, day, time, nutrition=nut, stamina=sta))
-
-                
-                # Check Processing Tab (Only if NOT creating)
-                if not self.is_creating and "Processing" in self.notebook_widgets:
-                    finished_items = self.notebook_widgets["Processing"].check_active_tasks(day, time)
-                    if finished_items:
-                        sys_msg = f"System: Process completed - {', '.join(finished_items)}"
-                        self.story_tab.print_text(sys_msg, sender="System")
-                        self.conversation_history += f"\n{sys_msg}\n"
+                cur_stats = self._current_status()
+                # AUTO / SAME keep the current value (e.g. after WORK or PASS_TIME moved the clock)
+                if day.upper() in ("AUTO", "SAME"): day = self.clock.day_string
+                if time.upper() in ("AUTO", "SAME"): time = self.clock.time_string
+                # The only place day/time strings are parsed; tick subscribers complete
+                # processes and spoil food (Only if NOT creating)
+                messages = self.clock.set_day_time(day, time, notify=not self.is_creating)
+                self._publish_status(turn, location, cur_stats.get("nutrition", 100), cur_stats.get("stamina", 100))
+                self._announce(messages)
                         
             # Tag: [[START_PROCESS: Name | Description | Time_Slots | Yield]]
-            # We need the CURRENT status to calculate the target time.
-            current_status = self.story_tab.get_status_data() # Gets current UI values
-            
             for match in re.finditer(r"\[\[START_PROCESS:\s*(.*?)\s*\|\s*(.*?)\s*\|\s*([\d.]+)\s*\|\s*(.*?)\]\]", ai_text):
                 p_name = match.group(1).strip()
                 p_desc = match.group(2).strip()
                 p_slots = match.group(3).strip()
                 p_yield = match.group(4).strip()
                 
-                # Pass current Day/Time to calculate target
+                # The target time is counted from the current game time
                 res = self.notebook_widgets["Processing"].add_timed_process(
                     p_name,
                     p_desc,
                     p_slots,
-                    current_status["day"],
-                    current_status["time"],
+                    self.clock.minutes,
                     p_yield
                 )
                 self.story_tab.print_text(res, sender="System")
@@ -606,18 +1042,10 @@ class GameApp(ctk.CTk):
                 req_skill = self.notebook_widgets["Processing"].get_required_skill(project_name) or ""
                 lvl = self._get_skill_level(req_skill) if req_skill else 0
 
-                # Apply progress + advance time
+                # Apply progress + advance time (which also completes passive processes and spoils food)
                 res = self.notebook_widgets["Processing"].apply_work_hours(project_name, hours_worked, lvl)
                 self._advance_time_hours(hours_worked)
 
-                # After time advances, check if any passive processes finished
-                status_now = self.story_tab.get_status_data()
-                completed = self.notebook_widgets["Processing"].check_active_tasks(status_now["day"], status_now["time"])
-                if completed:
-                    sys_msg = f"System: Process completed - {', '.join(completed)}"
-                    self.story_tab.print_text(sys_msg, sender="System")
-                    self.conversation_history += f"\n{sys_msg}\n"
-
                 if res:
                     self.story_tab.print_text(res, sender="System")
 
@@ -630,9 +1058,8 @@ class GameApp(ctk.CTk):
             # Tag: [[CONSUME: FoodName]]
             for match in re.finditer(r"\[\[CONSUME:\s*(.*?)\]\]", ai_text):
                 f_name = match.group(1).strip()
-                # Get current time to check spoilage
-                status = self.story_tab.get_status_data()
-                res = self.notebook_widgets["Inventory"].consume_food(f_name, status['day'], status['time'])
+                # Current time to check spoilage
+                res = self.notebook_widgets["Inventory"].consume_food(f_name, self.clock.minutes)
                 self.story_tab.print_text(res, sender="System")
 
             # 3. Rolls & Recursion
@@ -641,12 +1068,18 @@ class GameApp(ctk.CTk):
             if roll_match and recursion_depth < 2:
                 skill = roll_match.group(1).strip()
                 result = self.perform_skill_check(skill)
-                clean_prev = re.sub(r"\[\[(ADD|REMOVE):.*?\]\]", "", ai_text).strip()
+                clean_prev = re.sub(r"\[\[(ADD|REMOVE|PASS_TIME):.*?\]\]", "", ai_text).strip()
                 follow_up = f"{prompt}\nGM: {clean_prev}\n[System: Player rolled {result} for {skill}.]"
-                self.query_ai(follow_up, user_text, recursion_depth + 1)
+                self.query_ai(follow_up, user_text, recursion_depth + 1, prefix)
+            elif skip_notes and recursion_depth < 2:
+                # The System already applied the time skip; the GM only narrates the summary
+                clean_prev = re.sub(r"\[\[(ADD|REMOVE|PASS_TIME):.*?\]\]", "", ai_text).strip()
+                notes = "\n".join(f"[{n}]" for n in skip_notes)
+                follow_up = f"{prompt}\nGM: {clean_prev}\n{notes}\n[System: Narrate this time skip. Do NOT output [[PASS_TIME]] again.]"
+                self.query_ai(follow_up, user_text, recursion_depth + 1, prefix)
             else:
                 clean_pattern = re.compile(
-    r"\[\[(WORLD_INFO|CHARACTER_INFO|SKILL|ADD|REMOVE|MODIFY_ITEM|MODIFY_STAT|STATUS|ROLL|START_GAME|XP|START_PROCESS|REMOVE_PROCESS|START_PROJECT|WORK|ADD_FOOD|CONSUME).*?\]\]",
+    r"\[\[(WORLD_INFO|CHARACTER_INFO|CURRENCY|SKILL|ADD|REMOVE|MODIFY_ITEM|MODIFY_STAT|STATUS|ROLL|START_GAME|XP|START_PROCESS|REMOVE_PROCESS|START_PROJECT|WORK|ADD_FOOD|CONSUME|PASS_TIME).*?\]\]",
     re.DOTALL
 )
 
@@ -656,6 +1089,7 @@ class GameApp(ctk.CTk):
                 final_text = re.sub(r'\n{3,}', '\n\n', final_text)
                 # Strip leading/trailing whitespace completely
                 final_text = final_text.strip()
+                self.last_gm_text = final_text
                 # Only print if there is actually text left
                 if final_text:
                     self.story_tab.print_text(final_text, sender="GM")
@@ -664,10 +1098,26 @@ class GameApp(ctk.CTk):
         except Exception as e:
             self.story_tab.print_text(f"AI Error: {e}", sender="System")
         finally:
-            self.after(0, lambda: self.story_tab.set_controls_state(True))
+            # Roll follow-ups recurse into query_ai; only the outermost call ends the turn
+            if recursion_depth == 0:
+                self._commit_turn()
+                self.turn_running = False
+                self.ui.call(lambda: self.story_tab.set_controls_state(True))
+                # Runs after the batched status/text updates above, so the payload sees them
+                self.ui.call(self.request_autosave)
+                self.ui.call(self._report_turn_redraws)
+                self.ui.call(self._speculate)
+
+    def _speculate(self):
+        """Starts generating responses to the GM's suggested actions (config.SPECULATION)."""
+        if not SPECULATION or self.is_creating or not self.speculator.enabled:
+            return
+        actions = extract_suggestions(self.last_gm_text, SPECULATION_MAX_ACTIONS)
+        rules = self.load_rules()
+        self.speculator.start([(action, rules, *self._build_prompt(action, peek=True)) for action in actions])
 
     def generate_recap(self, history, context_data):
-        self.after(0, lambda: self.story_tab.set_controls_state(False, "Recapping..."))
+        self.ui.call(lambda: self.story_tab.set_controls_state(False, "Recapping..."))
         try:
             # We feed the AI the full Context (Inventory, World, Status) PLUS the (possibly empty) History.
             prompt = f"Context Data:\n{context_data}\n\nRecent Chat History:\n{history}\n\nTask: Summarize the current situation in a single paragraph based on the Context and Status provided above. Do not output anything that starts with \"[[\". End by asking 'What do you do?'"
@@ -690,36 +1140,83 @@ class GameApp(ctk.CTk):
         except Exception as e:
             self.story_tab.print_text(f"Recap Error: {e}", sender="System")
         finally:
-            self.after(0, lambda: self.story_tab.set_controls_state(True))
+            self.ui.call(lambda: self.story_tab.set_controls_state(True))
 
-    def save_game(self):
-        if not self.current_adventure_path or not self.game_loaded_successfully: 
-            return
+    # --- Saving ---
+
+    def _collect_save_payload(self):
+        """Everything a save writes, read from the widgets. Must run on the Tk thread."""
+        return {
+            "folder": self.current_adventure_path,
+            "markdown": {widget.filename: widget.get_text() for widget in self.notebook_widgets.values()
+                         if isinstance(widget, MarkdownEditorTab) and widget.filename},
+            "history": [line for line in self.conversation_history.split("\n") if line.strip()],
+            "status": self.story_tab.get_status_data(),
+            "is_creating": self.is_creating,
+        }
+
+    def _write_save(self, payload):
+        """Writes a payload from _collect_save_payload. Runs on any thread (serialized by AutosaveService)."""
+        folder = payload["folder"]
 
         # Save Markdown Tabs
-        for name, widget in self.notebook_widgets.items():
-            if isinstance(widget, MarkdownEditorTab):
-                try:
-                    with open(widget.filename, "w", encoding="utf-8") as f:
-                        f.write(widget.get_text())
-                except: pass
-
-        # Save History & Status
-        history_path = os.path.join(self.current_adventure_path, "savegame.json")
-        history_list = [line for line in self.conversation_history.split("\n") if line.strip()]
-        
-        # Get Status from StoryTab
-        status_data = self.story_tab.get_status_data()
-        
+        for filename, text in payload["markdown"].items():
+            try:
+                # Atomic so checkpoint blobs hard-linked to this file are never edited in place
+                atomic_write_text(filename, text)
+            except: pass
+
+        # Save History & Status (the archive is only valid for the adventure that is still loaded)
+        archive = self.history_archive if folder == self.current_adventure_path else None
+        archive = write_savegame(
+            folder,
+            {"Chat History": payload["history"], "Status": payload["status"], "is_creating": payload["is_creating"],
+             "History Archive": archive},
+            save_format=SAVE_FORMAT,
+        )
+        if folder == self.current_adventure_path:
+            self.history_archive = archive
+
+        adventure = os.path.basename(folder)
+        # Keep the menu's manifest current so it never has to re-read this save
         try:
-            with open(history_path, "w", encoding="utf-8") as f:
-                json.dump({"Chat History": history_list, "Status": status_data, "is_creating": self.is_creating}, f, indent=4)
-            print(f"Game saved to {self.current_adventure_path}")
+            self.main_menu.manifest.update(adventure, payload["status"])
         except Exception as e:
-            print(f"Save failed: {e}")
+            print(f"Manifest update failed: {e}")
+
+        # Rolling autosave checkpoints; unchanged files share blobs with earlier checkpoints
+        if payload.get("checkpoint") and AUTOSAVE_CHECKPOINTS > 0:
+            try:
+                ObjectStore(SAVES_DIR).autosave_checkpoint(adventure, keep=AUTOSAVE_CHECKPOINTS)
+            except Exception as e:
+                print(f"Autosave checkpoint failed: {e}")
+
+    def request_autosave(self):
+        """End-of-turn autosave: snapshot the state now, write it in the background once turns settle."""
+        if not self.current_adventure_path or not self.game_loaded_successfully:
+            return
+        self.autosave.request(self._collect_save_payload())
+
+    def save_game(self):
+        if not self.current_adventure_path or not self.game_loaded_successfully: 
+            return
+
+        # Flush any tab data that hasn't been committed yet
+        self._commit_turn()
+
+        # Replaces a pending autosave and waits for one that is already writing
+        self.autosave.save_now(dict(self._collect_save_payload(), checkpoint=True))
+        if self.autosave.last_error is None:
+            print(f"Game saved to {self.current_adventure_path} ({self.autosave.last_save_ms:.0f} ms)")
 
     def on_close(self):
+        # Apply queued label/text updates first; the save reads them from the widgets
+        self.ui.flush()
+        self.ui.stop()
         self.save_game()
+        self.autosave.stop()
+        self.speculator.cancel()
+        self.prefix_cache.close()
         self.destroy()
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+"""
+Timer queue over processing.json entries (see ui/processing_tab.py).
+
+Running timed processes sit in a min-heap keyed by target_abs_minutes, so a
+clock change only pops the processes that are actually due, earliest first
+(also across multi-day jumps) instead of scanning every entry.
+
+Finished tasks (COMPLETED, waiting to be collected) sit in a second heap keyed
+by the minute they completed. Once they are older than ARCHIVE_AFTER_HOURS of
+game time, or the GM collects them with REMOVE_PROCESS, ProcessingTab moves
+them out of processing.json into processing_archive.jsonl, so the active set
+(and the prompt section built from it) stays small.
+
+Entries are the plain dicts stored in processing.json; the queue tracks them
+by identity and rebuilds whenever the tab's list object is replaced (load,
+rewind). Removed entries are skipped lazily when they surface.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+from typing import Dict, List, Optional
+
+ARCHIVE_FILENAME = "processing_archive.jsonl"
+# Completed but uncollected tasks older than this (game hours) are archived
+ARCHIVE_AFTER_HOURS = 48
+
+
+def _is_running_process(entry: dict) -> bool:
+    return entry.get("type") == "process" and entry.get("status") == "In Progress"
+
+
+class ProcessQueue:
+    def __init__(self):
+        self.data: Optional[list] = None
+        # [(target minute, seq, entry)] for running timed processes
+        self._running: List[tuple] = []
+        # [(completed minute, seq, entry)] for finished, uncollected tasks
+        self._done: List[tuple] = []
+        # id(entry) -> its live heap entry (in either heap)
+        self._live: Dict[int, tuple] = {}
+        # Finished projects whose completion minute isn't known yet (WORK runs before the clock moves)
+        self._unstamped: List[dict] = []
+        self._seq = itertools.count()
+
+    # ---------- Building ----------
+
+    def rebuild(self, data: list) -> None:
+        self.data = data
+        self._running, self._done, self._live, self._unstamped = [], [], {}, []
+        for entry in data:
+            if _is_running_process(entry):
+                self._running.append(self._track(int(entry.get("target_abs_minutes", 0)), entry))
+            elif entry.get("status") == "COMPLETED":
+                if "completed_abs_minutes" in entry:
+                    self._done.append(self._track(int(entry["completed_abs_minutes"]), entry))
+                else:
+                    self._unstamped.append(entry)
+        heapq.heapify(self._running)
+        heapq.heapify(self._done)
+
+    def ensure(self, data: list) -> "ProcessQueue":
+        if data is not self.data:
+            self.rebuild(data)
+        return self
+
+    def _track(self, minute: int, entry: dict) -> tuple:
+        node = (minute, next(self._seq), entry)
+        self._live[id(entry)] = node
+        return node
+
+    # ---------- Maintenance (call after mutating the data) ----------
+
+    def added(self, entry: dict) -> None:
+        if _is_running_process(entry):
+            heapq.heappush(self._running, self._track(int(entry.get("target_abs_minutes", 0)), entry))
+
+    def removed(self, entry: dict) -> None:
+        self._live.pop(id(entry), None)
+        if self._unstamped:
+            self._unstamped = [e for e in self._unstamped if e is not entry]
+
+    def completed(self, entry: dict) -> None:
+        """entry switched to COMPLETED; it becomes archivable from completed_abs_minutes on."""
+        self._live.pop(id(entry), None)
+        if "completed_abs_minutes" in entry:
+            heapq.heappush(self._done, self._track(int(entry["completed_abs_minutes"]), entry))
+        else:
+            self._unstamped.append(entry)
+
+    # ---------- Queries ----------
+
+    def _pop(self, heap: List[tuple], now: int) -> List[dict]:
+        due = []
+        while heap and heap[0][0] <= now:
+            node = heapq.heappop(heap)
+            if self._live.get(id(node[2])) is node:
+                del self._live[id(node[2])]
+                due.append(node[2])
+        return due
+
+    def pop_due(self, now: int) -> List[dict]:
+        """Running processes whose target is <= now, in completion order."""
+        return self._pop(self._running, now)
+
+    def stamp(self, now: int) -> List[dict]:
+        """Gives finished projects without a completion minute `now`. Returns the stamped entries."""
+        stamped, self._unstamped = self._unstamped, []
+        for entry in stamped:
+            entry["completed_abs_minutes"] = now
+            heapq.heappush(self._done, self._track(now, entry))
+        return stamped
+
+    def pop_stale(self, now: int, after_minutes: int = ARCHIVE_AFTER_HOURS * 60) -> List[dict]:
+        """Finished tasks that have been waiting for collection longer than after_minutes."""
+        return self._pop(self._done, now - after_minutes)
+
+    def next_due(self) -> Optional[int]:
+        while self._running and self._live.get(id(self._running[0][2])) is not self._running[0]:
+            heapq.heappop(self._running)
+        return self._running[0][0] if self._running else None
+
+
+def append_archive(folder: str, entries: List[dict]) -> None:
+    """Appends archived entries to processing_archive.jsonl (one JSON object per line)."""
+    if not entries:
+        return
+    with open(os.path.join(folder, ARCHIVE_FILENAME), "a", encoding="utf-8") as f:
+        f.write("\n".join(json.dumps(e) for e in entries) + "\n")
@@ -0,0 +1,83 @@
+"""
+Assembles the Game Master's system instruction.
+
+config.RULE_SECTIONS holds the rules one mechanic per entry. A section with a
+predicate here is only sent while it applies to the game state; the rest are
+always sent. With no food carried, the eating/CONSUME rules are left out.
+With no tasks running, the rules for working on projects and collecting
+results are left out. The rules for starting tasks and adding food always
+stay, since the GM needs those to create the first one.
+
+Assembly is memoized by the set of applicable sections, so a turn costs a few
+predicate checks and a dict lookup.
+
+An adventure may replace the rules wholesale with its own rules.md. It is sent
+as written and re-read only when its modification time (or size) changes.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from config import RULE_SECTIONS
+
+
+@dataclass(frozen=True)
+class RuleFacts:
+    """What the predicates may look at; built by GameApp from the tabs each turn."""
+    food: bool = False           # perishable food is carried
+    tasks: bool = False          # any process or project is in the Processing tab
+    projects: bool = False       # ... of which at least one is an active project
+    journal: bool = False        # the Journal is part of the prompt (config.CONTEXT_POLICY)
+
+
+RULE_PREDICATES: Dict[str, Callable[[RuleFacts], bool]] = {
+    "eating": lambda f: f.food,
+    "project_work": lambda f: f.projects,
+    "collecting": lambda f: f.tasks,
+    "journal": lambda f: f.journal,
+}
+
+
+def applicable_sections(facts: RuleFacts) -> Tuple[str, ...]:
+    return tuple(key for key in RULE_SECTIONS if RULE_PREDICATES.get(key, lambda f: True)(facts))
+
+
+@lru_cache(maxsize=64)
+def _assemble(keys: Tuple[str, ...]) -> str:
+    return "\n" + "".join(RULE_SECTIONS[key] for key in keys)
+
+
+def assemble_rules(facts: RuleFacts) -> str:
+    return _assemble(applicable_sections(facts))
+
+
+# ---------- rules.md ----------
+
+_file_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_file_lock = threading.Lock()
+
+
+def read_rules_file(path: str) -> Optional[str]:
+    """Contents of a rules file, or None if it doesn't exist. Cached until its mtime/size changes."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _file_lock:
+        cached = _file_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    try:
+        with open(path, "r") as f:
+            text = f.read()
+    except OSError:
+        return None
+    with _file_lock:
+        _file_cache[path] = (stamp, text)
+    return text
@@ -0,0 +1,170 @@
+"""
+Background loading of adventure saves.
+
+load_adventure_files() does all of the disk work for opening a save: pending
+schema migrations (save_schema.py), the optional SQLite import, the three data stores, the
+markdown tabs, the currency table and the savegame. The independent reads run on a thread pool.
+
+AdventurePreloader runs that off the UI thread as soon as MainMenu shows
+interest in a save (hover or selection), so by the time the player clicks,
+GameApp.load_adventure only has to bind already-parsed state to the widgets.
+Preloading only reads. A save that still needs a migration or the SQLite
+import is not preloaded. take() loads it in full once the player actually
+opens it.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+import save_schema
+import sqlite_store
+from currency import CurrencyModel
+from inventory_model import INVENTORY_CODEC
+from state_store import has_savegame, open_section_store, read_savegame
+
+# Data tab name -> (file name, empty value factory, codec)
+DATA_FILES = {
+    "Inventory": ("inventory.json", dict, INVENTORY_CODEC),
+    "Skills": ("skills.json", list, None),
+    "Processing": ("processing.json", list, None),
+}
+
+# How many preloaded saves are kept around while the player browses the menu
+PRELOAD_CACHE_SIZE = 3
+
+
+@dataclass
+class PreloadedAdventure:
+    folder: str
+    stores: Dict[str, object] = field(default_factory=dict)      # tab name -> JsonStore / SqliteSectionStore
+    markdown: Dict[str, str] = field(default_factory=dict)       # tab name -> text
+    savegame: Optional[dict] = None                              # None for a brand-new adventure
+    currency: CurrencyModel = field(default_factory=CurrencyModel)
+    errors: Dict[str, Exception] = field(default_factory=dict)   # tab name / "savegame" -> error
+    elapsed_ms: float = 0.0
+
+
+def _read_markdown(path: str, default: str) -> str:
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def needs_preparation(folder: str, storage_backend: str = "json") -> bool:
+    """True if opening the save would first write to it (schema migrations, SQLite import)."""
+    return save_schema.needs_migration(folder) or (storage_backend == "sqlite" and not sqlite_store.has_database(folder))
+
+
+def load_adventure_files(folder: str, markdown_tabs: Iterable[str], storage_backend: str = "json",
+                         tail_chars: Optional[int] = None) -> PreloadedAdventure:
+    """Prepares and reads everything a save needs, in parallel. Never raises; per-part errors land in .errors."""
+    start = time.perf_counter()
+    result = PreloadedAdventure(folder=folder)
+
+    # These rewrite files the readers below depend on, so they run first
+    try:
+        save_schema.migrate_adventure(folder)
+    except Exception as e:
+        print(f"Error migrating save: {e}")
+    if storage_backend == "sqlite" and not sqlite_store.has_database(folder):
+        sqlite_store.migrate_json_to_sqlite(folder)
+
+    def read_savegame_part():
+        return read_savegame(folder, tail_chars=tail_chars) if has_savegame(folder) else None
+
+    with ThreadPoolExecutor(max_workers=8, thread_name_prefix="save-load") as pool:
+        jobs = {}
+        for name, (filename, factory, codec) in DATA_FILES.items():
+            jobs[("store", name)] = pool.submit(open_section_store, folder, filename, factory, codec)
+        for name in markdown_tabs:
+            jobs[("markdown", name)] = pool.submit(_read_markdown, os.path.join(folder, f"{name}.md"), f"{name}\n")
+        jobs[("savegame", "savegame")] = pool.submit(read_savegame_part)
+        jobs[("currency", "currency")] = pool.submit(CurrencyModel.load, folder)
+
+        for (kind, name), job in jobs.items():
+            try:
+                value = job.result()
+            except Exception as e:
+                result.errors[name] = e
+                continue
+            if kind == "store":
+                result.stores[name] = value
+            elif kind == "markdown":
+                result.markdown[name] = value
+            elif kind == "currency":
+                result.currency = value
+            else:
+                result.savegame = value
+
+    result.elapsed_ms = (time.perf_counter() - start) * 1000
+    return result
+
+
+class AdventurePreloader:
+    """Parses saves on a background worker and hands the result over on click."""
+
+    def __init__(self, saves_dir: str, markdown_tabs: Iterable[str], storage_backend: str = "json",
+                 tail_chars: Optional[int] = None):
+        self.saves_dir = saves_dir
+        self.markdown_tabs = list(markdown_tabs)
+        self.storage_backend = storage_backend
+        self.tail_chars = tail_chars
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save-preload")
+        self._cache: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, save_name: str) -> PreloadedAdventure:
+        return load_adventure_files(os.path.join(self.saves_dir, save_name), self.markdown_tabs,
+                                    self.storage_backend, self.tail_chars)
+
+    def preload(self, save_name: str) -> None:
+        """Starts parsing save_name in the background (no-op if already cached or if it needs preparing)."""
+        with self._lock:
+            if save_name in self._cache:
+                self._cache.move_to_end(save_name)
+                return
+            if needs_preparation(os.path.join(self.saves_dir, save_name), self.storage_backend):
+                # Hovering must not write to the save; take() prepares it on click
+                return
+            self._cache[save_name] = self._executor.submit(self._load, save_name)
+            while len(self._cache) > PRELOAD_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def take(self, save_name: str) -> PreloadedAdventure:
+        """Returns the preloaded save (waiting for it if still parsing), or loads it now."""
+        with self._lock:
+            future = self._cache.pop(save_name, None)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass
+        return self._load(save_name)
+
+    def invalidate(self, save_name: Optional[str] = None) -> None:
+        """
+        Drops cached results for one save (or all), e.g. after it was saved, renamed or restored.
+        Also releases the save's adventure.db handle so the folder can be renamed or deleted;
+        only call this while that save is not being played.
+        """
+        with self._lock:
+            if save_name is None:
+                dropped = list(self._cache.items())
+                self._cache.clear()
+            else:
+                dropped = [(save_name, self._cache.pop(save_name, None))]
+        for name, future in dropped:
+            if future is not None:
+                try:
+                    future.result()  # let an in-flight load finish before closing its handle
+                except Exception:
+                    pass
+            sqlite_store.close_folder(os.path.join(self.saves_dir, name))
@@ -0,0 +1,171 @@
+"""
+Cached index of the adventures in SAVES_DIR (.manifest.json).
+
+One entry per save folder:
+    {"last_played": epoch seconds, "turn": "12", "location": "...", "day": "Day 3", "size": bytes}
+
+The game updates an entry whenever it saves, and MainMenu updates it on rename,
+delete and checkpoint restore (rescan()), so showing the menu never has to open
+every save. reconcile() only scans folders that appeared without going through
+the game (e.g. new branches or saves copied in by hand) and drops entries whose
+folder is gone.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import sqlite_store
+from state_store import atomic_write_json, read_savegame
+
+MANIFEST_FILENAME = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+def folder_size(folder: str) -> int:
+    total = 0
+    for root, _, names in os.walk(folder):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _turn_key(entry: dict) -> int:
+    turn = str(entry.get("turn") or "")
+    return int(turn) if turn.isdigit() else 0
+
+
+class SaveManifest:
+    def __init__(self, saves_dir: str):
+        self.saves_dir = saves_dir
+        self.path = os.path.join(saves_dir, MANIFEST_FILENAME)
+        self.lock = threading.Lock()
+        self._entries: Optional[Dict[str, dict]] = None
+
+    # ---------- Persistence ----------
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            entries = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    entries = data.get("saves", {})
+            except Exception:
+                pass
+            self._entries = entries
+        return self._entries
+
+    def _save(self) -> None:
+        os.makedirs(self.saves_dir, exist_ok=True)
+        atomic_write_json(self.path, {"version": MANIFEST_VERSION, "saves": self._entries or {}}, indent=None)
+
+    # ---------- Updates ----------
+
+    def _scan(self, name: str) -> dict:
+        folder = os.path.join(self.saves_dir, name)
+        status = {}
+        try:
+            status = (read_savegame(folder, tail_chars=0) or {}).get("Status", {}) or {}
+        except Exception:
+            pass
+        finally:
+            # Don't keep adventure.db open while the menu may rename/delete the folder
+            if sqlite_store.has_database(folder):
+                sqlite_store.SqliteAdventureStore.for_folder(folder).close()
+        return {
+            "last_played": os.path.getmtime(folder),
+            "turn": str(status.get("turn", "")),
+            "location": status.get("location", ""),
+            "day": status.get("day", ""),
+            "size": folder_size(folder),
+        }
+
+    def update(self, name: str, status: dict) -> None:
+        """Called after the game saves `name`."""
+        with self.lock:
+            entries = self._load()
+            entries[name] = {
+                "last_played": time.time(),
+                "turn": str(status.get("turn", "")),
+                "location": status.get("location", ""),
+                "day": status.get("day", ""),
+                "size": folder_size(os.path.join(self.saves_dir, name)),
+            }
+            self._save()
+
+    def rename(self, old: str, new: str) -> None:
+        with self.lock:
+            entries = self._load()
+            if old in entries:
+                entries[new] = entries.pop(old)
+                self._save()
+
+    def rescan(self, name: str) -> None:
+        """Re-reads `name` from disk, after its files changed outside the game (e.g. a checkpoint restore)."""
+        with self.lock:
+            entries = self._load()
+            if os.path.isdir(os.path.join(self.saves_dir, name)):
+                entries[name] = self._scan(name)
+            elif entries.pop(name, None) is None:
+                return
+            self._save()
+
+    def remove(self, name: str) -> None:
+        with self.lock:
+            entries = self._load()
+            if entries.pop(name, None) is not None:
+                self._save()
+
+    def reconcile(self) -> Dict[str, dict]:
+        """Syncs entries with the folders on disk. Only unknown folders are scanned."""
+        with self.lock:
+            entries = self._load()
+            os.makedirs(self.saves_dir, exist_ok=True)
+            folders = {d for d in os.listdir(self.saves_dir)
+                       if not d.startswith(".") and os.path.isdir(os.path.join(self.saves_dir, d))}
+
+            changed = False
+            for name in list(entries):
+                if name not in folders:
+                    del entries[name]
+                    changed = True
+            for name in folders - set(entries):
+                entries[name] = self._scan(name)
+                changed = True
+            if changed:
+                self._save()
+            return dict(entries)
+
+    # ---------- Queries ----------
+
+    def query(self, search: str = "", sort_by: str = "last_played") -> List[tuple]:
+        """
+        [(name, entry), ...] filtered by a case-insensitive search over name and location.
+        Works on the cached entries; call reconcile() first to pick up folder changes.
+        """
+        with self.lock:
+            entries = dict(self._load())
+        needle = (search or "").strip().lower()
+        rows = [
+            (name, e) for name, e in entries.items()
+            if not needle or needle in name.lower() or needle in str(e.get("location", "")).lower()
+        ]
+
+        if sort_by == "name":
+            rows.sort(key=lambda r: r[0].lower())
+        elif sort_by == "turn":
+            rows.sort(key=lambda r: _turn_key(r[1]), reverse=True)
+        elif sort_by == "size":
+            rows.sort(key=lambda r: r[1].get("size", 0), reverse=True)
+        else:
+            rows.sort(key=lambda r: r[1].get("last_played", 0), reverse=True)
+        return rows
@@ -0,0 +1,252 @@
+"""
+Content-addressed object store for adventure saves.
+
+Lives next to the adventures inside SAVES_DIR:
+
+    .objects/ab/cdef...     one blob per unique file content (sha256)
+    .refs/<adventure>/<ref>.json
+                            {"created": ..., "label": ..., "files": {relative path: sha256}}
+
+A checkpoint records the current files of an adventure as a ref. Files whose
+content is already stored cost nothing; a hash cache keyed by (size, mtime, inode)
+avoids re-reading files that haven't changed since the last checkpoint.
+
+Restoring or branching materializes a ref into a folder with hard links, so
+forking is near-constant in time and disk no matter how large the history and
+world text are. Files that the game modifies in place (the event log, the
+processing archive, SQLite files) are copied instead, so they can never write
+through into a shared blob. Everything else is replaced atomically (temp file +
+os.replace), which breaks the link rather than editing the blob.
+
+gc() deletes objects that no ref points to any more.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict, List, Optional, Tuple
+
+from state_store import atomic_write_json
+
+OBJECTS_DIRNAME = ".objects"
+REFS_DIRNAME = ".refs"
+HASH_CACHE_FILENAME = ".hash_cache.json"
+AUTOSAVE_PREFIX = "auto-"
+
+# Written in place by the game, so they must never share an inode with a blob
+_IN_PLACE_FILES = {"events.jsonl", "processing_archive.jsonl",
+                   "adventure.db", "adventure.db-wal", "adventure.db-shm"}
+
+
+def _is_tracked(rel_path: str) -> bool:
+    name = os.path.basename(rel_path)
+    return not name.startswith(".tmp-") and not name.endswith("-shm")
+
+
+def _link_or_copy(src: str, dst: str, allow_link: bool) -> None:
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    if os.path.exists(dst):
+        os.remove(dst)
+    if allow_link:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # e.g. different drive or a filesystem without hard links
+    shutil.copyfile(src, dst)
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ObjectStore:
+    def __init__(self, saves_dir: str):
+        self.saves_dir = saves_dir
+        self.objects_dir = os.path.join(saves_dir, OBJECTS_DIRNAME)
+        self.refs_dir = os.path.join(saves_dir, REFS_DIRNAME)
+
+    # ---------- Paths ----------
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def _adventure_refs_dir(self, adventure: str) -> str:
+        return os.path.join(self.refs_dir, adventure)
+
+    def _ref_path(self, adventure: str, ref: str) -> str:
+        return os.path.join(self._adventure_refs_dir(adventure), f"{ref}.json")
+
+    # ---------- Objects ----------
+
+    def _load_hash_cache(self, adventure: str) -> dict:
+        path = os.path.join(self._adventure_refs_dir(adventure), HASH_CACHE_FILENAME)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_hash_cache(self, adventure: str, cache: dict) -> None:
+        os.makedirs(self._adventure_refs_dir(adventure), exist_ok=True)
+        atomic_write_json(os.path.join(self._adventure_refs_dir(adventure), HASH_CACHE_FILENAME), cache, indent=None)
+
+    def put_file(self, path: str, rel_path: str, cache: dict) -> str:
+        st = os.stat(path)
+        key = [st.st_size, st.st_mtime_ns, st.st_ino]
+        cached = cache.get(rel_path)
+        if cached and cached[0] == key and os.path.exists(self._object_path(cached[1])):
+            return cached[1]
+
+        digest = _hash_file(path)
+        obj = self._object_path(digest)
+        if not os.path.exists(obj):
+            # Atomically-replaced files can be linked straight in; in-place files are copied
+            _link_or_copy(path, obj, allow_link=os.path.basename(rel_path) not in _IN_PLACE_FILES)
+        cache[rel_path] = [key, digest]
+        return digest
+
+    # ---------- Refs ----------
+
+    def checkpoint(self, adventure: str, ref: str, label: str = "") -> dict:
+        folder = os.path.join(self.saves_dir, adventure)
+        cache = self._load_hash_cache(adventure)
+        files: Dict[str, str] = {}
+        for root, _, names in os.walk(folder):
+            for name in names:
+                full = os.path.join(root, name)
+                rel = os.path.relpath(full, folder).replace(os.sep, "/")
+                if _is_tracked(rel):
+                    files[rel] = self.put_file(full, rel, cache)
+        # Forget cache entries for files that no longer exist
+        cache = {k: v for k, v in cache.items() if k in files}
+        self._save_hash_cache(adventure, cache)
+
+        data = {"created": time.time(), "label": label, "files": files}
+        self._write_ref(adventure, ref, data)
+        return data
+
+    def _write_ref(self, adventure: str, ref: str, data: dict) -> None:
+        os.makedirs(self._adventure_refs_dir(adventure), exist_ok=True)
+        atomic_write_json(self._ref_path(adventure, ref), data, indent=None)
+
+    def read_ref(self, adventure: str, ref: str) -> Optional[dict]:
+        try:
+            with open(self._ref_path(adventure, ref), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def list_refs(self, adventure: str) -> List[Tuple[str, dict]]:
+        """[(ref name, ref data), ...], newest first."""
+        folder = self._adventure_refs_dir(adventure)
+        if not os.path.isdir(folder):
+            return []
+        refs = []
+        for name in os.listdir(folder):
+            if name.endswith(".json") and not name.startswith("."):
+                data = self.read_ref(adventure, name[:-5])
+                if data is not None:
+                    refs.append((name[:-5], data))
+        refs.sort(key=lambda r: r[1].get("created", 0), reverse=True)
+        return refs
+
+    def delete_ref(self, adventure: str, ref: str) -> None:
+        path = self._ref_path(adventure, ref)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def autosave_checkpoint(self, adventure: str, keep: int) -> dict:
+        """Adds an auto-<timestamp> checkpoint and prunes autosaves beyond the newest `keep`."""
+        data = self.checkpoint(adventure, f"{AUTOSAVE_PREFIX}{int(time.time() * 1000)}", label="Autosave")
+        autos = [name for name, _ in self.list_refs(adventure) if name.startswith(AUTOSAVE_PREFIX)]
+        for name in autos[max(0, keep):]:
+            self.delete_ref(adventure, name)
+        return data
+
+    # ---------- Materialize ----------
+
+    def materialize(self, adventure: str, ref: str, target_folder: str) -> None:
+        """Makes target_folder contain exactly the files of the ref."""
+        data = self.read_ref(adventure, ref)
+        if data is None:
+            raise FileNotFoundError(f"No checkpoint '{ref}' for '{adventure}'.")
+        files = data.get("files", {})
+
+        os.makedirs(target_folder, exist_ok=True)
+        for root, _, names in os.walk(target_folder):
+            for name in names:
+                full = os.path.join(root, name)
+                rel = os.path.relpath(full, target_folder).replace(os.sep, "/")
+                if rel not in files:
+                    os.remove(full)
+
+        for rel, digest in files.items():
+            dst = os.path.join(target_folder, *rel.split("/"))
+            _link_or_copy(self._object_path(digest), dst, allow_link=os.path.basename(rel) not in _IN_PLACE_FILES)
+
+    def restore(self, adventure: str, ref: str) -> None:
+        """Rolls the adventure back to a checkpoint. The current files are checkpointed first."""
+        self.checkpoint(adventure, f"before-restore-{int(time.time() * 1000)}", label=f"Before restoring {ref}")
+        self.materialize(adventure, ref, os.path.join(self.saves_dir, adventure))
+
+    def branch(self, adventure: str, ref: Optional[str], new_adventure: str) -> None:
+        """Creates a new adventure from a checkpoint (or from the current files when ref is None)."""
+        target = os.path.join(self.saves_dir, new_adventure)
+        if os.path.exists(target):
+            raise FileExistsError(f"An adventure named '{new_adventure}' already exists.")
+        if ref is None:
+            ref = f"branch-{int(time.time() * 1000)}"
+            self.checkpoint(adventure, ref, label=f"Branched to {new_adventure}")
+        self.materialize(adventure, ref, target)
+
+        base = self.read_ref(adventure, ref) or {}
+        data = {"created": time.time(), "label": f"Branched from {adventure} ({ref})", "files": base.get("files", {})}
+        self._write_ref(new_adventure, "branch-base", data)
+
+    # ---------- Adventure bookkeeping ----------
+
+    def rename_adventure(self, old: str, new: str) -> None:
+        src, dst = self._adventure_refs_dir(old), self._adventure_refs_dir(new)
+        if os.path.isdir(src) and not os.path.exists(dst):
+            os.rename(src, dst)
+
+    def forget_adventure(self, adventure: str) -> None:
+        """Drops an adventure's refs; its blobs are reclaimed by the next gc()."""
+        shutil.rmtree(self._adventure_refs_dir(adventure), ignore_errors=True)
+
+    # ---------- Garbage collection ----------
+
+    def gc(self) -> Tuple[int, int]:
+        """Deletes unreferenced objects. Returns (objects removed, bytes freed)."""
+        live = set()
+        if os.path.isdir(self.refs_dir):
+            for adventure in os.listdir(self.refs_dir):
+                for _, data in self.list_refs(adventure):
+                    live.update(data.get("files", {}).values())
+
+        removed, freed = 0, 0
+        if not os.path.isdir(self.objects_dir):
+            return removed, freed
+        for prefix in os.listdir(self.objects_dir):
+            sub = os.path.join(self.objects_dir, prefix)
+            if not os.path.isdir(sub):
+                continue
+            for rest in os.listdir(sub):
+                if prefix + rest in live:
+                    continue
+                path = os.path.join(sub, rest)
+                freed += os.path.getsize(path)
+                os.remove(path)
+                removed += 1
+            if not os.listdir(sub):
+                os.rmdir(sub)
+        return removed, freed
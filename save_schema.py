@@ -0,0 +1,228 @@
+"""
+Per-adventure save schema version and one-time migrations.
+
+Every adventure folder carries schema.json:
+    {"version": 1, "applied": ["inventory_items_to_dicts"]}
+
+Migrations are registered in order with @migration(version, name). On load,
+migrate_adventure() runs only the ones newer than the folder's stamp and bumps
+the stamp after each, so every migration runs exactly once per adventure and a
+save that is already current costs one small file read. Brand-new adventures are
+stamped with the current version straight away.
+
+Migrations go through state_store.open_section_store, so they work on both the
+JSON files and adventure.db. Code outside this module may assume the current
+format (see current_version()).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Callable, List, Tuple
+
+from event_log import EVENTS_FILENAME, SNAPSHOT_DIRNAME
+from state_store import atomic_write_bytes, atomic_write_json, open_section_store
+from time_utils import LEGACY_TIME_TO_CLOCK, parse_time
+
+SCHEMA_FILENAME = "schema.json"
+
+# (version, name, fn(folder)) in ascending version order
+_MIGRATIONS: List[Tuple[int, str, Callable[[str], None]]] = []
+
+
+def migration(version: int, name: str):
+    """Registers fn(folder) as the migration that brings a save up to `version`."""
+    def register(fn: Callable[[str], None]) -> Callable[[str], None]:
+        if _MIGRATIONS and version <= _MIGRATIONS[-1][0]:
+            raise ValueError(f"Migration '{name}' must have a version above {_MIGRATIONS[-1][0]}.")
+        _MIGRATIONS.append((version, name, fn))
+        return fn
+    return register
+
+
+# ---------- Version stamp ----------
+
+def schema_path_for(folder: str) -> str:
+    return os.path.join(folder, SCHEMA_FILENAME)
+
+
+def read_schema(folder: str) -> dict:
+    """{"version": 0, "applied": []} for saves that predate the stamp."""
+    try:
+        with open(schema_path_for(folder), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("version"), int):
+            data.setdefault("applied", [])
+            return data
+    except Exception:
+        pass
+    return {"version": 0, "applied": []}
+
+
+def write_schema(folder: str, data: dict) -> None:
+    atomic_write_json(schema_path_for(folder), data)
+
+
+def current_version() -> int:
+    return _MIGRATIONS[-1][0] if _MIGRATIONS else 0
+
+
+def needs_migration(folder: str) -> bool:
+    """True if migrate_adventure() would write anything (including stamping a new adventure)."""
+    return read_schema(folder)["version"] < current_version()
+
+
+# ---------- Runner ----------
+
+def migrate_adventure(folder: str) -> List[str]:
+    """Brings an adventure folder up to the current schema. Returns the names of migrations run."""
+    schema = read_schema(folder)
+    if schema["version"] >= current_version():
+        return []
+
+    if schema["version"] == 0 and not any(not n.startswith(".") for n in os.listdir(folder) if n != SCHEMA_FILENAME):
+        # Brand-new adventure: nothing on disk to migrate
+        write_schema(folder, {"version": current_version(), "applied": []})
+        return []
+
+    ran = []
+    for version, name, fn in _MIGRATIONS:
+        if version <= schema["version"]:
+            continue
+        fn(folder)
+        schema["version"] = version
+        schema["applied"].append(name)
+        # Stamped after each step, so a crash mid-way resumes at the failed migration
+        write_schema(folder, schema)
+        ran.append(name)
+    return ran
+
+
+# ---------- Migrations ----------
+
+@migration(1, "inventory_items_to_dicts")
+def _inventory_items_to_dicts(folder: str) -> None:
+    """
+    Converts old inventory item lists:
+      [Name, Desc, Amount, Value]
+    into the dict format:
+      {"name":..., "desc":..., "amount":..., "value":...}
+    and fills in missing fields on dict items, so every item has all four keys.
+    """
+    store = open_section_store(folder, "inventory.json", dict)
+    data = store.data
+
+    changed = False
+    for cat, items in list(data.items()):
+        if not isinstance(items, list):
+            data[cat] = []
+            changed = True
+            continue
+
+        new_items = []
+        for item in items:
+            if isinstance(item, dict):
+                for key, default in (("name", "Unknown"), ("desc", "No desc"), ("amount", "1"), ("value", "0")):
+                    if key not in item:
+                        item[key] = default
+                        changed = True
+                new_items.append(item)
+            elif isinstance(item, list):
+                # Legacy format
+                name = item[0] if len(item) > 0 else "Unknown"
+                desc = item[1] if len(item) > 1 else "No desc"
+                amt  = item[2] if len(item) > 2 else "1"
+                val  = item[3] if len(item) > 3 else "0"
+                new_items.append({"name": name, "desc": desc, "amount": str(amt), "value": str(val)})
+                changed = True
+            else:
+                # Skip broken entries
+                changed = True
+
+        data[cat] = new_items
+
+    if changed:
+        store.mark_dirty()
+        store.commit()
+
+
+# time_utils.parse_time before version 2: no dots or spaces inside "PM"
+_OLD_TIME_12H_RE = re.compile(r"^\s*(\d{1,2})\s*:\s*(\d{1,2})\s*([AaPp][Mm])\s*$")
+_OLD_TIME_HOUR_RE = re.compile(r"^\s*(\d{1,2})\s*([AaPp][Mm])\s*$")
+_OLD_TIME_24H_RE = re.compile(r"^\s*(\d{1,2})\s*:\s*(\d{1,2})\s*$")
+
+
+def _was_midnight_fallback(time_str) -> bool:
+    """True if the old parser read time_str as its 12:00 AM fallback and parse_time now reads something else."""
+    if not isinstance(time_str, str) or not time_str.strip():
+        return False
+    s = time_str.strip()
+    if any(bucket in s.lower() for bucket in LEGACY_TIME_TO_CLOCK):
+        return False
+    if _OLD_TIME_12H_RE.match(s) or _OLD_TIME_HOUR_RE.match(s) or _OLD_TIME_24H_RE.match(s):
+        return False
+    return parse_time(s) != (12, 0, "AM")
+
+
+def _pin_spoil_time(item) -> bool:
+    meta = item.get("meta") if isinstance(item, dict) else None
+    if isinstance(meta, dict) and _was_midnight_fallback(meta.get("spoil_time")):
+        meta["spoil_time"] = "12:00 AM"
+        return True
+    return False
+
+
+def _pin_inventory(inventory) -> bool:
+    changed = False
+    for items in (inventory or {}).values():
+        for item in items if isinstance(items, list) else ():
+            changed = _pin_spoil_time(item) or changed
+    return changed
+
+
+@migration(2, "pin_dotted_spoil_times")
+def _pin_dotted_spoil_times(folder: str) -> None:
+    """
+    parse_time now reads "11:59 P.M." (the ADD_FOOD default) as 11:59 PM; before, it fell back
+    to 12:00 AM. Stored food keeps the spoil minute it was saved with: such spoil_time values are
+    rewritten as "12:00 AM" in the inventory, the event log and its snapshots (so rewinds agree).
+    New food gets the corrected reading.
+    """
+    store = open_section_store(folder, "inventory.json", dict)
+    if _pin_inventory(store.data):
+        store.mark_dirty()
+        store.commit()
+
+    # Rewritten events change length, so snapshot log offsets are mapped from old to new line ends
+    offsets = {0: 0}
+    events_path = os.path.join(folder, EVENTS_FILENAME)
+    if os.path.exists(events_path):
+        lines, changed, old_end, new_end = [], False, 0, 0
+        with open(events_path, "rb") as f:
+            for raw in f:
+                old_end += len(raw)
+                event = json.loads(raw) if raw.strip() else None
+                if isinstance(event, dict) and _pin_spoil_time(event.get("item")):
+                    body = raw.rstrip(b"\r\n")
+                    raw = json.dumps(event).encode("utf-8") + raw[len(body):]
+                    changed = True
+                lines.append(raw)
+                new_end += len(raw)
+                offsets[old_end] = new_end
+        if changed:
+            atomic_write_bytes(events_path, b"".join(lines))
+
+    snapshot_dir = os.path.join(folder, SNAPSHOT_DIRNAME)
+    for name in sorted(os.listdir(snapshot_dir)) if os.path.isdir(snapshot_dir) else ():
+        path = os.path.join(snapshot_dir, name)
+        if not name.endswith(".json"):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            snap = json.load(f)
+        pinned = _pin_inventory((snap.get("state") or {}).get("inventory"))
+        offset = offsets.get(snap.get("log_offset", 0), snap.get("log_offset", 0))
+        if pinned or offset != snap.get("log_offset", 0):
+            snap["log_offset"] = offset
+            atomic_write_json(path, snap, indent=None)
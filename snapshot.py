@@ -0,0 +1,220 @@
+"""
+Compact binary save snapshot (savegame.snap).
+
+Replaces savegame.json for the Status / is_creating / Chat History data.
+Layout:
+
+    header  : magic, version, codec, compression, index offset, index length
+    state   : one compressed blob (Status, is_creating, ...)
+    chunks  : chat history split into compressed blocks of HISTORY_CHUNK_LINES lines
+    index   : compressed {"state": [offset, length], "chunks": [[offset, length, lines, chars], ...]}
+
+Loading reads the header, the index, the state blob and only as many history
+chunks from the end as are needed to cover the requested tail. Older chunks stay
+on disk behind a LazyHistory and are decoded only when something asks for them.
+When the snapshot is rewritten, untouched archived chunks are copied byte-for-byte.
+
+Encoding uses msgpack and zstd when those packages are installed, otherwise JSON
+and zlib. The choice is recorded in the header, so either kind of file can be read
+back as long as the matching package is available.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import tempfile
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # optional
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+SNAPSHOT_FILENAME = "savegame.snap"
+HISTORY_CHUNK_LINES = 256
+
+MAGIC = b"AIADVSNP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sBBBxQI")
+
+CODEC_JSON = 1
+CODEC_MSGPACK = 2
+COMPRESS_ZLIB = 1
+COMPRESS_ZSTD = 2
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _default_codec() -> int:
+    return CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+
+
+def _default_compression() -> int:
+    return COMPRESS_ZSTD if zstandard is not None else COMPRESS_ZLIB
+
+
+def _encode(obj, codec: int, compression: int) -> bytes:
+    if codec == CODEC_MSGPACK:
+        raw = msgpack.packb(obj, use_bin_type=True)
+    else:
+        raw = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    if compression == COMPRESS_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    return zlib.compress(raw, 6)
+
+
+def _decode(blob: bytes, codec: int, compression: int):
+    if compression == COMPRESS_ZSTD:
+        if zstandard is None:
+            raise SnapshotError("This snapshot is zstd-compressed but the 'zstandard' package is not installed.")
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    else:
+        raw = zlib.decompress(blob)
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise SnapshotError("This snapshot is msgpack-encoded but the 'msgpack' package is not installed.")
+        return msgpack.unpackb(raw, raw=False)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _read_at(f, offset: int, length: int) -> bytes:
+    f.seek(offset)
+    blob = f.read(length)
+    if len(blob) != length:
+        raise SnapshotError("Snapshot is truncated.")
+    return blob
+
+
+class LazyHistory:
+    """
+    The archived (not yet loaded) front of the chat history, still inside the snapshot file.
+    chunks: [(offset, length, n_lines, n_chars), ...] in chronological order.
+    """
+
+    def __init__(self, path: str, codec: int, compression: int, chunks: List[Tuple[int, int, int, int]]):
+        self.path = path
+        self.codec = codec
+        self.compression = compression
+        self.chunks = [tuple(c) for c in chunks]
+        self._lines: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def line_count(self) -> int:
+        return sum(c[2] for c in self.chunks)
+
+    def load_lines(self) -> List[str]:
+        """Decodes every archived chunk (once) and returns the lines."""
+        if self._lines is None:
+            lines: List[str] = []
+            with open(self.path, "rb") as f:
+                for offset, length, _, _ in self.chunks:
+                    lines.extend(_decode(_read_at(f, offset, length), self.codec, self.compression))
+            self._lines = lines
+        return self._lines
+
+    def raw_chunks(self) -> Iterator[Tuple[bytes, int, int]]:
+        """Yields (compressed bytes, n_lines, n_chars) without decoding."""
+        with open(self.path, "rb") as f:
+            for offset, length, n_lines, n_chars in self.chunks:
+                yield _read_at(f, offset, length), n_lines, n_chars
+
+
+def snapshot_path_for(folder: str) -> str:
+    return os.path.join(folder, SNAPSHOT_FILENAME)
+
+
+def write_snapshot(path: str, state: dict, history_lines: List[str], archive: Optional[LazyHistory] = None) -> LazyHistory:
+    """
+    Writes state + (archive chunks, then history_lines) atomically.
+    Returns a LazyHistory over the archived chunks in the new file, so the caller can
+    keep holding only the live tail in memory.
+    """
+    codec, compression = _default_codec(), _default_compression()
+    folder = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+
+            state_blob = _encode(state, codec, compression)
+            state_entry = [f.tell(), len(state_blob)]
+            f.write(state_blob)
+
+            chunks = []
+            if archive is not None and len(archive):
+                if (archive.codec, archive.compression) == (codec, compression):
+                    for raw, n_lines, n_chars in archive.raw_chunks():
+                        chunks.append([f.tell(), len(raw), n_lines, n_chars])
+                        f.write(raw)
+                else:
+                    # Written by a different codec set; re-encode once
+                    history_lines = list(archive.load_lines()) + list(history_lines)
+            n_archived = len(chunks)
+
+            for i in range(0, len(history_lines), HISTORY_CHUNK_LINES):
+                block = list(history_lines[i:i + HISTORY_CHUNK_LINES])
+                blob = _encode(block, codec, compression)
+                chunks.append([f.tell(), len(blob), len(block), sum(len(line) + 1 for line in block)])
+                f.write(blob)
+
+            index_blob = _encode({"state": state_entry, "chunks": chunks}, codec, compression)
+            index_offset = f.tell()
+            f.write(index_blob)
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, codec, compression, index_offset, len(index_blob)))
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return LazyHistory(path, codec, compression, chunks[:n_archived])
+
+
+def read_snapshot(path: str, tail_chars: int) -> Tuple[dict, List[str], LazyHistory]:
+    """
+    Returns (state, tail_lines, archive).
+    tail_lines covers at least tail_chars characters of the most recent history (whole chunks);
+    everything older is left in archive.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise SnapshotError("Snapshot header is truncated.")
+        magic, version, codec, compression, index_offset, index_length = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise SnapshotError("Not a save snapshot.")
+        if version > FORMAT_VERSION:
+            raise SnapshotError(f"Snapshot version {version} is newer than this game supports.")
+
+        index = _decode(_read_at(f, index_offset, index_length), codec, compression)
+        state = _decode(_read_at(f, *index["state"]), codec, compression)
+
+        chunks = index.get("chunks", [])
+        split = len(chunks)
+        covered = 0
+        while split > 0 and covered < tail_chars:
+            split -= 1
+            covered += chunks[split][3]
+
+        tail_lines: List[str] = []
+        for offset, length, _, _ in chunks[split:]:
+            tail_lines.extend(_decode(_read_at(f, offset, length), codec, compression))
+
+    return state, tail_lines, LazyHistory(path, codec, compression, chunks[:split])
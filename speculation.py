@@ -0,0 +1,169 @@
+"""
+Speculative pre-generation of the GM's suggested next actions (config.SPECULATION).
+
+The GM ends each response with a few actions the player could take next, and
+players often send one of them as written. After a turn, GameApp takes up to
+SPECULATION_MAX_ACTIONS of them (extract_suggestions) and builds the prompt
+each would produce. Building the prompt this way changes no state. The
+Speculator then generates the responses on one background thread, one request
+at a time. The raw text is kept; no tags are applied.
+
+When the player acts, claim() looks for a suggestion matching the input and
+discards the others. The precomputed response is used only if the real turn
+builds exactly the same rules, prefix and prompt. Anything that changed the
+state in between changes the prompt too (a local action, a rewind, a
+finished summary). The tags are then applied as if the response had just
+arrived. On any mismatch the turn asks the model as usual.
+
+Every discarded response counts as wasted tokens: the prompt plus the response,
+estimated with context_serializer.estimate_tokens. The cached prefix is not
+counted. Once the waste passes SPECULATION_WASTE_CAP_TOKENS, no more batches
+are started this session.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from context_serializer import estimate_tokens
+
+# (rules, prompt, prefix) -> response text
+Generator = Callable[[str, str, Optional[str]], str]
+
+_LIST_ITEM = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.+?)\s*$")
+
+
+def extract_suggestions(text: str, limit: int) -> List[str]:
+    """The list items at the end of a GM response ("- Ask the innkeeper", "2. Leave"), first `limit`."""
+    items: List[str] = []
+    for line in reversed((text or "").strip().split("\n")):
+        m = _LIST_ITEM.match(line)
+        if m is None:
+            if items or line.strip():
+                break
+            continue
+        action = m.group(1).replace("**", "").replace("__", "").strip()
+        if action:
+            items.append(action)
+    items.reverse()
+    return items[:limit]
+
+
+def normalize_action(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s']", " ", (text or "").lower()).split())
+
+
+@dataclass
+class Speculation:
+    action: str
+    rules: str
+    prompt: str
+    prefix: Optional[str]
+    text: Optional[str] = None
+    tokens: int = 0
+    discarded: bool = False
+    claimed: bool = False
+    done: threading.Event = field(default_factory=threading.Event)
+
+    def matches(self, rules: str, prompt: str, prefix: Optional[str]) -> bool:
+        return (rules, prompt, prefix) == (self.rules, self.prompt, self.prefix)
+
+    def wait(self) -> Optional[str]:
+        self.done.wait()
+        return self.text
+
+
+class Speculator:
+    def __init__(self, generate: Generator, waste_cap_tokens: int):
+        self.generate = generate
+        self.waste_cap_tokens = waste_cap_tokens
+        self.batch: List[Speculation] = []
+        self.generated = 0
+        self.hits = 0
+        self.used_tokens = 0
+        self.wasted_tokens = 0
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.wasted_tokens < self.waste_cap_tokens
+
+    def start(self, jobs: List[Tuple[str, str, str, Optional[str]]]) -> None:
+        """Discards the previous batch and generates (action, rules, prompt, prefix) for each job in order."""
+        batch = [Speculation(*job) for job in jobs]
+        with self.lock:
+            self._discard_all()
+            self.batch = batch
+        if batch:
+            threading.Thread(target=self._run, args=(batch,), daemon=True).start()
+
+    def _run(self, batch: List[Speculation]) -> None:
+        for spec in batch:
+            with self.lock:
+                if spec.discarded or not self.enabled:
+                    spec.done.set()
+                    continue
+            text = None
+            try:
+                text = self.generate(spec.rules, spec.prompt, spec.prefix)
+            except Exception as e:
+                print(f"Speculation error ({spec.action}): {e}")
+            with self.lock:
+                spec.text = text or None
+                spec.tokens = estimate_tokens(spec.prompt) + estimate_tokens(text or "")
+                self.generated += 1
+                if spec.discarded:
+                    self.wasted_tokens += spec.tokens
+                spec.done.set()
+
+    # ---------- Player input ----------
+
+    def claim(self, user_text: str) -> Optional[Speculation]:
+        """The speculation for the suggestion `user_text` picks, if any. All others are discarded."""
+        key = normalize_action(user_text)
+        with self.lock:
+            found = next((s for s in self.batch if not s.discarded and normalize_action(s.action) == key), None)
+            for spec in self.batch:
+                if spec is not found:
+                    self._discard(spec)
+            self.batch = []
+            if found is not None:
+                found.claimed = True
+        return found
+
+    def commit(self, spec: Speculation) -> None:
+        """The claimed response was used for the turn."""
+        with self.lock:
+            self.hits += 1
+            self.used_tokens += spec.tokens
+
+    def reject(self, spec: Speculation) -> None:
+        """The claimed response can't be used (the prompt changed, or it failed)."""
+        with self.lock:
+            self._discard(spec)
+
+    def cancel(self) -> None:
+        with self.lock:
+            self._discard_all()
+
+    def _discard_all(self) -> None:
+        for spec in self.batch:
+            self._discard(spec)
+        self.batch = []
+
+    def _discard(self, spec: Speculation) -> None:
+        if spec.discarded:
+            return
+        spec.discarded = True
+        # One that is still queued or running is counted by _run when it finishes
+        if spec.done.is_set():
+            self.wasted_tokens += spec.tokens
+
+    def report(self) -> str:
+        with self.lock:
+            status = "" if self.enabled else " - cap reached, off for this session"
+            return (f"{self.hits}/{self.generated} used, {self.used_tokens:,} tokens used, "
+                    f"{self.wasted_tokens:,}/{self.waste_cap_tokens:,} wasted{status}")
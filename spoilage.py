@@ -0,0 +1,132 @@
+"""
+Spoilage schedule for food items.
+
+Food carries its spoil date as text in ItemMeta ("Day 4" / "6:00 PM"). The
+schedule parses each date once, when the item enters the inventory, and keeps a
+min-heap of (spoil minute, item) in absolute game minutes (see time_utils).
+Whenever the clock moves, expire(now) pops only the items that are due:
+O(k log n) for k expiring items instead of re-checking every item.
+
+InventoryTab keeps the schedule in step with every add/remove/modify, like the
+name index and the wealth ledger. Removed items aren't dug out of the heap;
+their entries are skipped when they surface (lazy deletion) and the heap is
+compacted once stale entries outnumber live ones.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+from inventory_model import Item
+from time_utils import to_abs_minutes
+
+# How far ahead the "spoiling soon" digest looks
+SPOILING_SOON_HOURS = 24
+
+
+def spoil_minutes(item: Item) -> Optional[int]:
+    """Absolute spoil minute of a food item, or None if it has no spoil date."""
+    meta = item.meta
+    if meta is None or meta.spoil_day is None:
+        return None
+    return to_abs_minutes(meta.spoil_day, meta.spoil_time or "11:59 PM")
+
+
+class SpoilageSchedule:
+    def __init__(self):
+        self.data: Optional[dict] = None
+        # [(spoil minute, seq, category, item)]; seq keeps equal times in insertion order
+        self._heap: List[tuple] = []
+        # id(item) -> its live heap entry; anything else in the heap is stale
+        self._live: Dict[int, tuple] = {}
+        self._seq = itertools.count()
+
+    # ---------- Building ----------
+
+    def rebuild(self, data: dict) -> None:
+        self.data = data
+        self._heap = []
+        self._live = {}
+        for category, items in data.items():
+            for item in items:
+                due = spoil_minutes(item)
+                if due is not None:
+                    entry = (due, next(self._seq), category, item)
+                    self._heap.append(entry)
+                    self._live[id(item)] = entry
+        heapq.heapify(self._heap)
+
+    def ensure(self, data: dict) -> "SpoilageSchedule":
+        if data is not self.data:
+            self.rebuild(data)
+        return self
+
+    def _compact(self) -> None:
+        if len(self._heap) > 2 * len(self._live) + 32:
+            self._heap = list(self._live.values())
+            heapq.heapify(self._heap)
+
+    # ---------- Maintenance (call after mutating the data) ----------
+
+    def added(self, category: str, item: Item) -> None:
+        due = spoil_minutes(item)
+        if due is None:
+            return
+        entry = (due, next(self._seq), category, item)
+        self._live[id(item)] = entry
+        heapq.heappush(self._heap, entry)
+
+    def removed(self, category: str, item: Item) -> None:
+        if self._live.pop(id(item), None) is not None:
+            self._compact()
+
+    def changed(self, category: str, item: Item) -> None:
+        entry = self._live.get(id(item))
+        if entry is not None and entry[0] == spoil_minutes(item) and entry[2] == category:
+            return
+        self.removed(category, item)
+        self.added(category, item)
+
+    # ---------- Queries ----------
+
+    def spoils_at(self, item: Item) -> Optional[int]:
+        entry = self._live.get(id(item))
+        return entry[0] if entry is not None else spoil_minutes(item)
+
+    def next_due(self) -> Optional[int]:
+        while self._heap and self._live.get(id(self._heap[0][3])) is not self._heap[0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def expire(self, now: int) -> List[Tuple[str, Item]]:
+        """Pops and returns [(category, item)] for every item spoiled by `now`, earliest first."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            item = entry[3]
+            if self._live.get(id(item)) is entry:
+                del self._live[id(item)]
+                due.append((entry[2], item))
+        return due
+
+    def upcoming(self, now: int, within_minutes: int) -> List[Tuple[int, str, Item]]:
+        """[(spoil minute, category, item)] spoiling in (now, now + within], soonest first.
+        Walks only the part of the heap below the limit instead of sorting everything."""
+        limit = now + within_minutes
+        found, stack = [], [0]
+        heap = self._heap
+        while stack:
+            i = stack.pop()
+            if i >= len(heap) or heap[i][0] > limit:
+                continue
+            entry = heap[i]
+            if entry[0] > now and self._live.get(id(entry[3])) is entry:
+                found.append((entry[0], entry[1], entry[2], entry[3]))
+            stack.extend((2 * i + 1, 2 * i + 2))
+        found.sort()
+        return [(due, cat, item) for due, _, cat, item in found]
+
+    def __len__(self) -> int:
+        return len(self._live)
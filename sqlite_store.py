@@ -0,0 +1,512 @@
+"""
+Optional SQLite storage backend for an adventure.
+
+One file per adventure (adventure.db, WAL mode) replaces the four JSON files:
+- items:    inventory rows, one per (category, position)
+- skills:   one row per skill (names are case-sensitive, as in skills.json)
+- tasks:    processing entries, one per position
+- history:  one row per chat line
+- meta:     Status / is_creating from savegame.json
+
+A commit only writes the rows that differ from what the store last loaded or
+saved. Changing one item updates one row.
+
+The game looks items and tasks up in memory (inventory_index.py,
+process_queue.py). The name/category/due-time indexes serve the query helpers
+at the end of SqliteAdventureStore, which are for tools and
+benchmarks/bench_storage.py.
+
+An adventure uses this backend as soon as adventure.db exists in its folder.
+migrate_json_to_sqlite() imports the JSON layout, export_sqlite_to_json()
+writes it back out (e.g. to switch an adventure back to plain JSON).
+
+    python sqlite_store.py migrate "<adventure folder>"
+    python sqlite_store.py export  "<adventure folder>"
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+DB_FILENAME = "adventure.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_name ON items(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_items_category ON items(category COLLATE NOCASE, position);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_items_slot ON items(category, position);
+
+CREATE TABLE IF NOT EXISTS skills (
+    name TEXT PRIMARY KEY,
+    level INTEGER NOT NULL DEFAULT 0,
+    xp INTEGER NOT NULL DEFAULT 0,
+    threshold INTEGER NOT NULL DEFAULT 5
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT,
+    status TEXT,
+    target_abs_minutes INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_target ON tasks(status, target_abs_minutes);
+CREATE INDEX IF NOT EXISTS idx_tasks_name ON tasks(name COLLATE NOCASE);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_position ON tasks(position);
+
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    line TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# JSON filename -> section name, matching the files the tabs used to own
+SECTION_FILES = {
+    "inventory.json": "inventory",
+    "skills.json": "skills",
+    "processing.json": "processing",
+}
+
+_open_stores: Dict[str, "SqliteAdventureStore"] = {}
+_open_lock = threading.Lock()
+
+
+def db_path_for(folder: str) -> str:
+    return os.path.join(folder, DB_FILENAME)
+
+
+def has_database(folder: str) -> bool:
+    return bool(folder) and os.path.exists(db_path_for(folder))
+
+
+class SqliteAdventureStore:
+    """A single adventure.db. Use for_folder() to share one connection per adventure."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.lock = threading.RLock()
+        self.closed = False
+        # Tag handlers commit from the worker thread, so the connection is shared under a lock
+        self.conn = sqlite3.connect(db_path_for(folder), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._upgrade_skills()
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        # section -> {row key: serialized row} as last loaded/saved, to diff commits against
+        self._rows: Dict[str, Dict] = {}
+
+    def _upgrade_skills(self) -> None:
+        # Databases made before names were case-sensitive keyed skills by NOCASE, which merged "Cooking"/"cooking"
+        row = self.conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'skills'").fetchone()
+        if row and "NOCASE" in row[0].upper():
+            with self.conn:
+                self.conn.execute("ALTER TABLE skills RENAME TO skills_nocase")
+                self.conn.executescript(SCHEMA)
+                self.conn.execute("INSERT INTO skills SELECT name, level, xp, threshold FROM skills_nocase")
+                self.conn.execute("DROP TABLE skills_nocase")
+
+    @classmethod
+    def for_folder(cls, folder: str) -> "SqliteAdventureStore":
+        key = os.path.abspath(folder)
+        with _open_lock:
+            store = _open_stores.get(key)
+            if store is None:
+                store = cls(folder)
+                _open_stores[key] = store
+            return store
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+            self.closed = True
+        with _open_lock:
+            _open_stores.pop(os.path.abspath(self.folder), None)
+
+    # ---------- Section load/save (same shapes as the JSON files) ----------
+
+    def load_section(self, section: str):
+        if section == "inventory":
+            return self.load_inventory()
+        if section == "skills":
+            return self.load_skills()
+        if section == "processing":
+            return self.load_tasks()
+        raise KeyError(section)
+
+    def save_section(self, section: str, data) -> None:
+        if section == "inventory":
+            self.save_inventory(data)
+        elif section == "skills":
+            self.save_skills(data)
+        elif section == "processing":
+            self.save_tasks(data)
+        else:
+            raise KeyError(section)
+
+    # ---------- Row diffs ----------
+
+    def _stored(self, section: str, query: str, key) -> Dict:
+        """{row key: row} currently in the table; read once, then kept up to date by _apply."""
+        if section not in self._rows:
+            self._rows[section] = {key(row): row for row in self.conn.execute(query)}
+        return self._rows[section]
+
+    def _apply(self, section: str, stored: Dict, rows: Dict, upsert: str, delete: str) -> None:
+        """Writes the rows that differ from `stored` and deletes the keys that are gone, in one transaction."""
+        changed = [row for k, row in rows.items() if stored.get(k) != row]
+        removed = [k if isinstance(k, tuple) else (k,) for k in stored if k not in rows]
+        if not changed and not removed:
+            return
+        with self.conn:
+            if removed:
+                self.conn.executemany(delete, removed)
+            if changed:
+                self.conn.executemany(upsert, changed)
+        self._rows[section] = rows
+
+    def load_inventory(self) -> dict:
+        data: Dict[str, list] = {}
+        with self.lock:
+            rows = self.conn.execute("SELECT category, position, name, data FROM items ORDER BY category, position").fetchall()
+            self._rows["inventory"] = {(c, pos): (c, pos, n, raw) for c, pos, n, raw in rows}
+        for category, _, _, raw in rows:
+            data.setdefault(category, []).append(json.loads(raw))
+        return data
+
+    def save_inventory(self, data: dict) -> None:
+        rows = {}
+        for category, items in (data or {}).items():
+            for pos, item in enumerate(items or []):
+                if isinstance(item, dict):
+                    name = str(item.get("name", "Unknown"))
+                else:
+                    name = str(item[0]) if item else "Unknown"
+                rows[(category, pos)] = (category, pos, name, json.dumps(item))
+        with self.lock:
+            stored = self._stored("inventory", "SELECT category, position, name, data FROM items", lambda r: (r[0], r[1]))
+            self._apply(
+                "inventory", stored, rows,
+                "INSERT INTO items (category, position, name, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(category, position) DO UPDATE SET name = excluded.name, data = excluded.data",
+                "DELETE FROM items WHERE category = ? AND position = ?",
+            )
+
+    def load_skills(self) -> list:
+        with self.lock:
+            rows = self.conn.execute("SELECT name, level, xp, threshold FROM skills ORDER BY name").fetchall()
+            self._rows["skills"] = {row[0]: row for row in rows}
+        return [{"Name": n, "Level": lvl, "XP": xp, "Threshold": th} for n, lvl, xp, th in rows]
+
+    def save_skills(self, data: list) -> None:
+        rows = {}
+        for s in data or []:
+            name = s.get("Name", "Unknown")
+            if name in rows:
+                print(f"Skills: duplicate skill '{name}', keeping the last entry.")
+            rows[name] = (name, int(s.get("Level", 0) or 0), int(s.get("XP", 0) or 0), int(s.get("Threshold", 5) or 5))
+        with self.lock:
+            stored = self._stored("skills", "SELECT name, level, xp, threshold FROM skills", lambda r: r[0])
+            self._apply(
+                "skills", stored, rows,
+                "INSERT INTO skills (name, level, xp, threshold) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET level = excluded.level, xp = excluded.xp, threshold = excluded.threshold",
+                "DELETE FROM skills WHERE name = ?",
+            )
+
+    _TASK_COLUMNS = "position, name, type, status, target_abs_minutes, data"
+
+    def load_tasks(self) -> list:
+        with self.lock:
+            rows = self.conn.execute(f"SELECT {self._TASK_COLUMNS} FROM tasks ORDER BY position").fetchall()
+            self._rows["processing"] = {row[0]: row for row in rows}
+        return [json.loads(row[5]) for row in rows]
+
+    def save_tasks(self, data: list) -> None:
+        rows = {}
+        for pos, item in enumerate(data or []):
+            tgt = item.get("target_abs_minutes")
+            rows[pos] = (
+                pos,
+                str(item.get("name", "")),
+                item.get("type"),
+                item.get("status"),
+                int(tgt) if tgt is not None else None,
+                json.dumps(item),
+            )
+        with self.lock:
+            stored = self._stored("processing", f"SELECT {self._TASK_COLUMNS} FROM tasks", lambda r: r[0])
+            self._apply(
+                "processing", stored, rows,
+                f"INSERT INTO tasks ({self._TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(position) DO UPDATE SET name = excluded.name, type = excluded.type, status = excluded.status, "
+                "target_abs_minutes = excluded.target_abs_minutes, data = excluded.data",
+                "DELETE FROM tasks WHERE position = ?",
+            )
+
+    # ---------- savegame.json equivalent ----------
+
+    def load_savegame(self, tail_chars: Optional[int] = None) -> Optional[dict]:
+        """
+        Like state_store.read_savegame: with tail_chars, only the most recent lines covering
+        tail_chars characters are read; the rest stays in the table as "History Archive".
+        """
+        archive = None
+        with self.lock:
+            meta = dict(self.conn.execute("SELECT key, value FROM meta").fetchall())
+            if tail_chars is None:
+                lines = [line for (line,) in self.conn.execute("SELECT line FROM history ORDER BY id")]
+            else:
+                rows, covered = [], 0
+                for row in self.conn.execute("SELECT id, line FROM history ORDER BY id DESC"):
+                    if covered >= tail_chars:
+                        break
+                    rows.append(row)
+                    covered += len(row[1])
+                rows.reverse()
+                lines = [line for _, line in rows]
+                last_id = rows[0][0] - 1 if rows else self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM history").fetchone()[0]
+                older = self.conn.execute("SELECT COUNT(*) FROM history WHERE id <= ?", (last_id,)).fetchone()[0]
+                if older:
+                    archive = SqliteHistory(self, last_id, older)
+        if not meta and not lines and archive is None:
+            return None
+        data = {
+            "Chat History": lines,
+            "Status": json.loads(meta.get("status") or "{}"),
+            "is_creating": bool(json.loads(meta.get("is_creating") or "false")),
+        }
+        if archive is not None:
+            data["History Archive"] = archive
+        return data
+
+    def has_savegame(self) -> bool:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT EXISTS(SELECT 1 FROM meta) OR EXISTS(SELECT 1 FROM history)"
+            ).fetchone()[0] == 1
+
+    def save_savegame(self, data: dict, after_id: int = 0) -> None:
+        """after_id: Chat History continues the stored lines up to this id (a SqliteHistory from a tail-only load)."""
+        lines = list(data.get("Chat History", []))
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('status', ?)", (json.dumps(data.get("Status", {})),))
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('is_creating', ?)", (json.dumps(bool(data.get("is_creating", False))),))
+            # History is append-only in normal play, so only the new tail is inserted
+            stored = self.conn.execute("SELECT COUNT(*) FROM history WHERE id > ?", (after_id,)).fetchone()[0]
+            if stored > len(lines):
+                self.conn.execute("DELETE FROM history WHERE id > ?", (after_id,))
+                stored = 0
+            self.conn.executemany("INSERT INTO history (line) VALUES (?)", ((line,) for line in lines[stored:]))
+
+    # ---------- Queries (tools and benchmarks; the game uses its in-memory indexes) ----------
+
+    def find_items(self, name: str) -> List[Tuple[str, dict]]:
+        """Exact, case-insensitive name lookup. Returns [(category, item), ...]."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT category, data FROM items WHERE name = ? COLLATE NOCASE ORDER BY category, position", (name,)
+            ).fetchall()
+        return [(c, json.loads(raw)) for c, raw in rows]
+
+    def items_in_category(self, category: str) -> List[dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM items WHERE category = ? COLLATE NOCASE ORDER BY position", (category,)
+            ).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def get_skill(self, name: str) -> Optional[dict]:
+        with self.lock:
+            row = self.conn.execute("SELECT name, level, xp, threshold FROM skills WHERE name = ?", (name,)).fetchone()
+        if not row:
+            return None
+        return {"Name": row[0], "Level": row[1], "XP": row[2], "Threshold": row[3]}
+
+    def due_tasks(self, current_abs_minutes: int) -> List[dict]:
+        """In-progress processes whose target time has been reached, oldest first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM tasks WHERE status = 'In Progress' AND target_abs_minutes <= ? "
+                "ORDER BY target_abs_minutes",
+                (int(current_abs_minutes),),
+            ).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def history_tail(self, count: int) -> List[str]:
+        with self.lock:
+            rows = self.conn.execute("SELECT line FROM history ORDER BY id DESC LIMIT ?", (int(count),)).fetchall()
+        return [line for (line,) in reversed(rows)]
+
+    def history_count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+
+class SqliteHistory:
+    """
+    The older chat lines a tail-only load left in the history table (ids up to last_id).
+    Stands in for snapshot.LazyHistory under "History Archive".
+    """
+
+    def __init__(self, db: SqliteAdventureStore, last_id: int, line_count: int):
+        self.db = db
+        self.last_id = last_id
+        self.line_count = line_count
+
+    def __len__(self) -> int:
+        return self.line_count
+
+    def load_lines(self) -> List[str]:
+        with self.db.lock:
+            rows = self.db.conn.execute("SELECT line FROM history WHERE id <= ? ORDER BY id", (self.last_id,)).fetchall()
+        return [line for (line,) in rows]
+
+
+class SqliteSectionStore:
+    """
+    Drop-in replacement for state_store.JsonStore backed by one section of adventure.db.
+    The tab still works on an in-memory copy; commit() rewrites the section in one transaction.
+    """
+
+    def __init__(self, section: str, default_factory, codec=None):
+        self.section = section
+        self.path = ""
+        self._default_factory = default_factory
+        self.codec = codec
+        self.data = default_factory()
+        self.dirty = False
+        self.writes = 0
+        # Bumped on every change to data (see context_serializer)
+        self.revision = 0
+        self.lock = threading.RLock()
+        self.db: Optional[SqliteAdventureStore] = None
+
+    def open(self, path: str) -> None:
+        with self.lock:
+            self.path = path
+            self.db = SqliteAdventureStore.for_folder(os.path.dirname(path))
+            data = self.db.load_section(self.section)
+            if not isinstance(data, type(self._default_factory())):
+                data = self._default_factory()
+            self.data = self.codec.decode(data) if self.codec else data
+            self.dirty = False
+            self.revision += 1
+
+    def to_raw(self):
+        return self.codec.encode(self.data) if self.codec else self.data
+
+    def load_raw(self, raw) -> None:
+        with self.lock:
+            self.data = self.codec.decode(raw) if self.codec else raw
+            self.dirty = True
+            self.revision += 1
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+        self.revision += 1
+
+    def commit(self) -> bool:
+        with self.lock:
+            if not self.dirty or self.db is None:
+                return False
+            if self.db.closed:
+                # The handle was released (e.g. the menu scanned or renamed saves); reopen it
+                self.db = SqliteAdventureStore.for_folder(os.path.dirname(self.path))
+            self.db.save_section(self.section, self.to_raw())
+            self.dirty = False
+            self.writes += 1
+            return True
+
+
+# ---------- Migration ----------
+
+def _read_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return default
+    return data if isinstance(data, type(default)) else default
+
+
+def migrate_json_to_sqlite(folder: str) -> SqliteAdventureStore:
+    """
+    Imports inventory/skills/processing JSON and the savegame (savegame.snap or savegame.json)
+    into adventure.db. The files are left in place.
+    """
+    from state_store import read_file_savegame
+
+    db = SqliteAdventureStore.for_folder(folder)
+    db.save_inventory(_read_json(os.path.join(folder, "inventory.json"), {}))
+    db.save_skills(_read_json(os.path.join(folder, "skills.json"), []))
+    db.save_tasks(_read_json(os.path.join(folder, "processing.json"), []))
+
+    # The default SAVE_FORMAT writes savegame.snap and removes savegame.json
+    save = read_file_savegame(folder)
+    if save:
+        hist = save.get("Chat History", [])
+        if not isinstance(hist, list):
+            hist = [line for line in str(hist).split("\n") if line.strip()]
+        db.save_savegame({"Chat History": hist, "Status": save.get("Status", {}), "is_creating": save.get("is_creating", False)})
+    return db
+
+
+def export_sqlite_to_json(folder: str) -> None:
+    """Writes adventure.db back out as the JSON file layout."""
+    from state_store import atomic_write_json
+
+    db = SqliteAdventureStore.for_folder(folder)
+    atomic_write_json(os.path.join(folder, "inventory.json"), db.load_inventory())
+    atomic_write_json(os.path.join(folder, "skills.json"), db.load_skills())
+    atomic_write_json(os.path.join(folder, "processing.json"), db.load_tasks())
+    save = db.load_savegame()
+    if save is not None:
+        atomic_write_json(os.path.join(folder, "savegame.json"), save)
+
+
+def close_folder(folder: str) -> None:
+    """Closes the shared connection for one adventure, if it is open."""
+    with _open_lock:
+        store = _open_stores.get(os.path.abspath(folder))
+    if store is not None:
+        store.close()
+
+
+def close_all() -> None:
+    with _open_lock:
+        stores = list(_open_stores.values())
+    for store in stores:
+        store.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3 or sys.argv[1] not in ("migrate", "export"):
+        print(__doc__)
+        sys.exit(1)
+    if sys.argv[1] == "migrate":
+        migrate_json_to_sqlite(sys.argv[2])
+    else:
+        export_sqlite_to_json(sys.argv[2])
+    close_all()
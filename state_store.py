@@ -0,0 +1,214 @@
+"""
+In-memory state for the per-adventure JSON files.
+
+Each data tab (Inventory, Skills, Processing) keeps its file contents in a
+JsonStore. Tag handlers mutate the in-memory data and mark the store dirty;
+GameApp commits every dirty store once at the end of a turn.
+
+Commits are atomic: the data is written to a temp file in the same folder
+and then swapped in with os.replace, so a crash mid-write never leaves a
+half-written inventory.json behind.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Optional
+
+import snapshot
+import sqlite_store
+
+
+def atomic_write_text(path: str, text: str) -> None:
+    _atomic_write(path, text, "w", "utf-8")
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Like atomic_write_text, without newline translation (byte offsets into the file stay exact)."""
+    _atomic_write(path, data, "wb", None)
+
+
+def _atomic_write(path: str, content, mode: str, encoding: Optional[str]) -> None:
+    folder = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=folder)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: str, data: Any, indent: int = 4) -> None:
+    atomic_write_text(path, json.dumps(data, indent=indent))
+
+
+class JsonStore:
+    """
+    One JSON file held in memory with a dirty flag.
+
+    - open(path) reads the file once
+    - data is mutated in place by the owner, who then calls mark_dirty()
+    - commit() writes the file only if something changed
+    - writes counts how many times the file was actually written
+    - revision goes up on every change to data, so readers can cache what they derive from it
+    - codec (optional, with decode(raw) / encode(data)) converts between the JSON
+      shape and a typed in-memory form, e.g. inventory_model.INVENTORY_CODEC
+    """
+
+    def __init__(self, default_factory: Callable[[], Any], codec=None):
+        self.path = ""
+        self._default_factory = default_factory
+        self.codec = codec
+        self.data = default_factory()
+        self.dirty = False
+        self.writes = 0
+        self.revision = 0
+        self.lock = threading.RLock()
+
+    def open(self, path: str) -> None:
+        with self.lock:
+            self.path = path
+            self.data = self._read()
+            self.dirty = False
+            self.revision += 1
+
+    def _read(self):
+        default = self._default_factory()
+        if not self.path or not os.path.exists(self.path):
+            return default
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return default
+        # Guard against a file holding the wrong shape (e.g. a dict where a list belongs)
+        if not isinstance(data, type(default)):
+            return default
+        return self.codec.decode(data) if self.codec else data
+
+    def to_raw(self):
+        """The data in its JSON shape (a fresh copy when a codec is set)."""
+        return self.codec.encode(self.data) if self.codec else self.data
+
+    def load_raw(self, raw) -> None:
+        """Replaces the data from its JSON shape and marks the store dirty."""
+        with self.lock:
+            self.data = self.codec.decode(raw) if self.codec else raw
+            self.dirty = True
+            self.revision += 1
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+        self.revision += 1
+
+    def commit(self) -> bool:
+        """Writes pending changes to disk. Returns True if the file was written."""
+        with self.lock:
+            if not self.dirty or not self.path:
+                return False
+            atomic_write_json(self.path, self.to_raw())
+            self.dirty = False
+            self.writes += 1
+            return True
+
+
+# ---------- Backend selection ----------
+
+def open_section_store(folder: str, filename: str, default_factory: Callable[[], Any], codec=None):
+    """
+    Opens the store for one data file of an adventure.
+    Adventures with an adventure.db use the SQLite backend; everything else stays on JSON.
+    """
+    path = os.path.join(folder, filename)
+    if sqlite_store.has_database(folder):
+        store = sqlite_store.SqliteSectionStore(sqlite_store.SECTION_FILES[filename], default_factory, codec)
+    else:
+        store = JsonStore(default_factory, codec)
+    store.open(path)
+    return store
+
+
+def has_savegame(folder: str) -> bool:
+    if sqlite_store.has_database(folder):
+        return sqlite_store.SqliteAdventureStore.for_folder(folder).has_savegame()
+    return os.path.exists(snapshot.snapshot_path_for(folder)) or os.path.exists(os.path.join(folder, "savegame.json"))
+
+
+def read_savegame(folder: str, tail_chars: Optional[int] = None):
+    """
+    Returns the savegame dict (Chat History / Status / is_creating) or None for a fresh adventure.
+
+    When tail_chars is given, only the last tail_chars of history are read. The rest comes back
+    under "History Archive": a snapshot.LazyHistory for savegame.snap, a sqlite_store.SqliteHistory
+    for adventure.db (savegame.json is always read whole).
+    """
+    if sqlite_store.has_database(folder):
+        return sqlite_store.SqliteAdventureStore.for_folder(folder).load_savegame(tail_chars)
+    return read_file_savegame(folder, tail_chars)
+
+
+def read_file_savegame(folder: str, tail_chars: Optional[int] = None):
+    """read_savegame() for the file formats only: savegame.snap, else savegame.json (ignores adventure.db)."""
+    snap_path = snapshot.snapshot_path_for(folder)
+    if os.path.exists(snap_path):
+        state, lines, archive = snapshot.read_snapshot(snap_path, tail_chars if tail_chars is not None else 0)
+        if tail_chars is None and len(archive):
+            lines = archive.load_lines() + lines
+            archive = None
+        data = dict(state)
+        data["Chat History"] = lines
+        data["History Archive"] = archive if archive is not None and len(archive) else None
+        return data
+
+    path = os.path.join(folder, "savegame.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_savegame(folder: str, data: dict, save_format: str = "json"):
+    """
+    Writes the savegame in the adventure's backend / the requested format ("json" or "snapshot").
+    Returns the history archive the caller should keep holding (None if everything is in memory).
+    """
+    archive = data.get("History Archive")
+    lines = list(data.get("Chat History", []))
+    state = {k: v for k, v in data.items() if k not in ("Chat History", "History Archive")}
+
+    if sqlite_store.has_database(folder) and isinstance(archive, sqlite_store.SqliteHistory):
+        # The archived lines are still in the table; only the tail is written
+        sqlite_store.SqliteAdventureStore.for_folder(folder).save_savegame(dict(state, **{"Chat History": lines}),
+                                                                           after_id=archive.last_id)
+        return archive
+
+    if sqlite_store.has_database(folder) or save_format != "snapshot":
+        if archive is not None:
+            lines = archive.load_lines() + lines
+        full = dict(state)
+        full["Chat History"] = lines
+        if sqlite_store.has_database(folder):
+            sqlite_store.SqliteAdventureStore.for_folder(folder).save_savegame(full)
+        else:
+            atomic_write_json(os.path.join(folder, "savegame.json"), full)
+            # Switched back from snapshots: drop the now-stale snapshot so it isn't preferred on load
+            snap_path = snapshot.snapshot_path_for(folder)
+            if os.path.exists(snap_path):
+                os.remove(snap_path)
+        # Its lines are cached in memory by load_lines() above
+        return archive
+
+    new_archive = snapshot.write_snapshot(snapshot.snapshot_path_for(folder), state, lines, archive)
+    # savegame.json has been carried over into the snapshot
+    legacy = os.path.join(folder, "savegame.json")
+    if os.path.exists(legacy):
+        os.remove(legacy)
+    return new_archive
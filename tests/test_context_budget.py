@@ -0,0 +1,105 @@
+from context_budget import ContextBudget, Section, turn_sections
+from context_serializer import estimate_tokens
+
+
+def _words(n):
+    return " ".join(["word"] * n)
+
+
+def test_everything_fits():
+    sections = [Section("Inventory", [("full", _words(50)), ("counts", _words(5))])]
+    plan = ContextBudget(100).plan(sections)
+    assert plan.get("Inventory") == _words(50)
+    assert plan.allocations[0].label == "full"
+
+
+def test_largest_variant_that_fits():
+    sections = [Section("Inventory", [("full", _words(200)), ("relevant", _words(40)), ("counts", _words(5))])]
+    plan = ContextBudget(50).plan(sections)
+    assert plan.allocations[0].label == "relevant"
+    assert plan.total <= 50
+
+
+def test_variant_no_larger_than_the_smallest_does_not_stop_the_search():
+    # A middle variant that is not an upgrade must not hide a later one that is
+    sections = [Section("World", [("full", _words(200)), ("odd", _words(1)), ("summary", _words(20)), ("tiny", _words(3))])]
+    plan = ContextBudget(30).plan(sections)
+    assert plan.allocations[0].label == "summary"
+
+
+def test_callable_variants_are_only_built_when_needed():
+    built = []
+
+    def relevant():
+        built.append("relevant")
+        return _words(10)
+
+    sections = [Section("Inventory", [("full", _words(20)), ("relevant", relevant), ("counts", "")])]
+    ContextBudget(100).plan(sections)
+    assert built == []
+
+
+def test_tail_section_is_cut_to_its_last_lines():
+    history = "\n".join(f"line {i}" for i in range(100))
+    sections = [Section("History", [("full", history), ("left out", "")], tail=True)]
+    plan = ContextBudget(20).plan(sections)
+    allocation = plan.allocations[0]
+    assert allocation.label == "trimmed"
+    assert allocation.text.endswith("line 99")
+    assert estimate_tokens(allocation.text) <= 20
+
+
+def test_lower_priority_sections_lose_detail_first():
+    sections = [
+        Section("Inventory", [("full", _words(40)), ("counts", _words(5))]),
+        Section("World", [("full", _words(40)), ("left out", "")]),
+    ]
+    plan = ContextBudget(60).plan(sections)
+    assert plan.get("Inventory") == _words(40)
+    assert plan.get("World") == ""
+
+
+def test_reserved_tokens_count_against_the_budget():
+    sections = [Section("Inventory", [("full", _words(40)), ("counts", _words(5))])]
+    plan = ContextBudget(60).plan(sections, reserved=30)
+    assert plan.allocations[0].label == "counts"
+
+
+# config.CONTEXT_BUDGET_TOKENS (config itself needs python-dotenv)
+CONTEXT_BUDGET_TOKENS = 8000
+
+
+def _turn(inventory_words, history_lines=60):
+    history = "\n".join(f"Player: line {i} " + _words(8) for i in range(history_lines))
+    return turn_sections(status="[STATUS] Inn | Day 2", spoiling="", processing=_words(30),
+                         inventory=_words(inventory_words), relevant_inventory=_words(40),
+                         inventory_counts="[INVENTORY] item counts: Tools 3", wealth="[WEALTH] 3 Marks",
+                         skills=_words(50), history=history, notes={"World": _words(300)})
+
+
+def test_repeated_section_upgrades_the_first_entry():
+    sections = [
+        Section("Inventory", [("relevant", _words(10)), ("counts", _words(2))]),
+        Section("History", [("full", _words(30)), ("left out", "")]),
+        Section("Inventory", [("full", _words(100))]),
+    ]
+    plan = ContextBudget(45).plan(sections)
+    assert [a.name for a in plan.allocations] == ["Inventory", "History"]
+    inventory = plan.allocations[0]
+    assert (inventory.label, inventory.full_tokens) == ("relevant", 100)
+    assert plan.get("History") == _words(30)
+
+
+def test_history_survives_a_large_inventory():
+    plan = ContextBudget(CONTEXT_BUDGET_TOKENS).plan(_turn(inventory_words=5500), reserved=2000)
+    history = next(a for a in plan.allocations if a.name == "History")
+    assert history.label == "full"
+    assert next(a for a in plan.allocations if a.name == "Inventory").label == "relevant"
+    assert plan.total <= CONTEXT_BUDGET_TOKENS
+
+
+def test_full_inventory_when_it_fits_after_history():
+    plan = ContextBudget(CONTEXT_BUDGET_TOKENS).plan(_turn(inventory_words=500), reserved=2000)
+    assert plan.get("Inventory") == _words(500)
+    assert plan.get("Skills") == _words(50)
+    assert plan.get("World") == _words(300)
@@ -0,0 +1,95 @@
+import os
+
+from event_log import EventLog, apply_event, empty_state
+
+SWORD = {"name": "Sword", "desc": "Sharp.", "amount": 1, "value": "5 Marks"}
+BREAD = {"name": "Bread", "desc": "Rye.", "amount": 2, "value": "1 Bits"}
+
+
+def _play(log, turn, *events):
+    for kind, payload in events:
+        log.record(turn, kind, **payload)
+    log.flush()
+
+
+def test_apply_event_items_processes_stats_and_skills():
+    state = empty_state()
+    apply_event(state, {"type": "item_added", "category": "Weapons", "index": 0, "item": SWORD})
+    apply_event(state, {"type": "item_added", "category": "Food", "index": 0, "item": BREAD})
+    apply_event(state, {"type": "food_consumed", "category": "Food", "index": 0, "item": dict(BREAD, amount=1)})
+    apply_event(state, {"type": "item_removed", "category": "Weapons", "index": 0})
+    apply_event(state, {"type": "stat_changed", "stat": "nutrition", "value": 85})
+    apply_event(state, {"type": "process_started", "entry": {"name": "Tan", "status": "RUNNING"}})
+    apply_event(state, {"type": "process_completed", "index": 0, "entry": {"name": "Tan", "status": "COMPLETED"}})
+    apply_event(state, {"type": "skill_changed", "skill": {"Name": "Smithing", "Level": 1}})
+    apply_event(state, {"type": "skill_changed", "skill": {"Name": "Smithing", "Level": 2}})
+
+    assert state["inventory"] == {"Weapons": [], "Food": [dict(BREAD, amount=1)]}
+    assert state["status"] == {"nutrition": 85}
+    assert state["processing"] == [{"name": "Tan", "status": "COMPLETED"}]
+    assert state["skills"] == [{"Name": "Smithing", "Level": 2}]
+
+
+def test_apply_event_ignores_stale_indexes():
+    state = empty_state()
+    apply_event(state, {"type": "item_removed", "category": "Weapons", "index": 3})
+    apply_event(state, {"type": "process_removed", "index": 0})
+    assert state["inventory"] == {} and state["processing"] == []
+
+
+def test_apply_event_copies_the_payload():
+    state = empty_state()
+    event = {"type": "item_added", "category": "Weapons", "index": 0, "item": dict(SWORD)}
+    apply_event(state, event)
+    event["item"]["amount"] = 99
+    assert state["inventory"]["Weapons"][0]["amount"] == 1
+
+
+def test_state_at_replays_from_the_nearest_snapshot(tmp_path):
+    log = EventLog(str(tmp_path))
+    log.ensure_base_snapshot(0, empty_state())
+    _play(log, 1, ("item_added", {"category": "Weapons", "index": 0, "item": SWORD}))
+    _play(log, 2, ("item_added", {"category": "Food", "index": 0, "item": BREAD}))
+    _play(log, 3, ("item_removed", {"category": "Weapons", "index": 0}))
+
+    state, _ = log.state_at(2)
+    assert state["inventory"] == {"Weapons": [SWORD], "Food": [BREAD]}
+    state, _ = log.state_at(3)
+    assert state["inventory"] == {"Weapons": [], "Food": [BREAD]}
+
+
+def test_state_at_without_an_old_enough_snapshot(tmp_path):
+    log = EventLog(str(tmp_path))
+    log.write_snapshot(5, empty_state())
+    assert log.state_at(4) == (None, 0)
+
+
+def test_rewind_truncates_later_events_and_snapshots(tmp_path):
+    log = EventLog(str(tmp_path))
+    log.ensure_base_snapshot(0, empty_state())
+    _play(log, 1, ("item_added", {"category": "Weapons", "index": 0, "item": SWORD}))
+    _play(log, 2, ("item_added", {"category": "Food", "index": 0, "item": BREAD}))
+    log.write_snapshot(2, log.state_at(2)[0])
+    _play(log, 3, ("stat_changed", {"stat": "nutrition", "value": 40}))
+
+    state, offset = log.state_at(1)
+    log.truncate_after(1, offset)
+
+    assert log.snapshot_turns() == [0]
+    assert os.path.getsize(log.path) == offset
+    # Play continues from turn 1; the dropped turns don't come back
+    _play(log, 2, ("stat_changed", {"stat": "stamina", "value": 70}))
+    state, _ = log.state_at(2)
+    assert state["inventory"] == {"Weapons": [SWORD]}
+    assert state["status"] == {"stamina": 70}
+
+
+def test_truncate_drops_unflushed_events(tmp_path):
+    log = EventLog(str(tmp_path))
+    log.ensure_base_snapshot(0, empty_state())
+    _play(log, 1, ("item_added", {"category": "Weapons", "index": 0, "item": SWORD}))
+    log.record(2, "item_removed", category="Weapons", index=0)
+
+    state, offset = log.state_at(1)
+    log.truncate_after(1, offset)
+    assert log.flush() == 0
@@ -0,0 +1,47 @@
+from game_clock import GameClock
+from time_utils import to_abs_minutes
+
+
+def test_set_day_time_parses_once_into_minutes():
+    clock = GameClock()
+    clock.set_day_time("Day 2", "6:30 PM")
+    assert clock.minutes == 1440 + 18 * 60 + 30
+    assert (clock.day_string, clock.time_string) == ("Day 2", "6:30 PM")
+
+
+def test_dotted_times_parse():
+    assert to_abs_minutes("Day 1", "11:59 P.M.") == 23 * 60 + 59
+    assert to_abs_minutes("Day 1", "7 a.m.") == 7 * 60
+
+
+def test_subscribers_get_now_and_previous_in_order():
+    clock = GameClock(60)
+    calls = []
+    clock.subscribe(lambda now, previous: calls.append(("a", now, previous)) or ["first"])
+    clock.subscribe(lambda now, previous: calls.append(("b", now, previous)))
+    messages = clock.advance(1.5)
+    assert calls == [("a", 150, 60), ("b", 150, 60)]
+    assert messages == ["first"]
+
+
+def test_subscribers_run_even_if_the_time_did_not_change():
+    clock = GameClock(60)
+    calls = []
+    clock.subscribe(lambda now, previous: calls.append((now, previous)))
+    clock.set(60)
+    assert calls == [(60, 60)]
+
+
+def test_notify_false_moves_quietly():
+    clock = GameClock()
+    calls = []
+    clock.subscribe(lambda now, previous: calls.append(now))
+    assert clock.set_day_time("Day 3", "9:00 AM", notify=False) == []
+    assert calls == [] and clock.day_string == "Day 3"
+
+
+def test_clock_never_goes_below_zero():
+    clock = GameClock()
+    clock.set(-30)
+    assert clock.minutes == 0
+    assert clock.game_time.as_time_string() == "12:00 AM"
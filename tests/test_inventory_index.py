@@ -0,0 +1,95 @@
+from inventory_index import InventoryIndex, normalize_name
+from inventory_model import Item
+
+
+def _item(name):
+    return Item(name, "", 1, "1 Bits")
+
+
+def _index(data):
+    index = InventoryIndex()
+    index.rebuild(data)
+    return index
+
+
+def test_normalize_name():
+    assert normalize_name("Iron  Sword!") == "iron sword"
+
+
+def test_exact_match_ignores_case_and_punctuation():
+    data = {"Weapons": [_item("Iron Sword")]}
+    result = _index(data).resolve("iron sword!")
+    assert result.exact and result.match == ("Weapons", data["Weapons"][0])
+
+
+def test_word_containment():
+    data = {"Food": [_item("Stale Bread")], "Weapons": [_item("Rusty Sword")]}
+    index = _index(data)
+    assert index.resolve("bread").match[1].name == "Stale Bread"
+    assert index.resolve("the rusty sword").match[1].name == "Rusty Sword"
+
+
+def test_typo_resolves_among_many_similar_names():
+    # 'Sowrd' shares only the trigram "rd " with 'Sword', like every "Board"
+    data = {"Weapons": [_item("Sword")], "Junk": [_item(f"Board {i}") for i in range(60)]}
+    result = _index(data).resolve("Sowrd")
+    assert result.match is not None and result.match[1].name == "Sword"
+
+
+def test_typo_correction_forgets_removed_words():
+    data = {"Weapons": [_item("Sword")], "Junk": [_item(f"Board {i}") for i in range(60)]}
+    index = _index(data)
+    index.resolve("Sowrd")
+    sword = data["Weapons"].pop()
+    index.removed("Weapons", sword)
+    assert index.resolve("Sowrd").match is None
+
+
+def test_close_names_are_ambiguous():
+    data = {"Weapons": [_item("Iron Sword"), _item("Iron Swords")]}
+    result = _index(data).resolve("iron swrd")
+    assert result.match is None and result.ambiguous
+    assert "ambiguous" in result.report()
+
+
+def test_no_substring_matches():
+    data = {"Tools": [_item("Breadknife")]}
+    result = _index(data).resolve("Bread")
+    assert result.match is None and not result.ambiguous
+
+
+def test_index_follows_mutations():
+    sword = _item("Sword")
+    data = {"Weapons": [sword]}
+    index = _index(data)
+    index.resolve("swrod")  # builds the fuzzy postings
+    data["Weapons"].pop(0)
+    index.removed("Weapons", sword)
+    assert index.resolve("Sword").match is None
+
+    axe = _item("Axe")
+    data["Weapons"].append(axe)
+    index.added("Weapons", axe)
+    old = axe.name
+    axe.name = "Battle Axe"
+    index.renamed("Weapons", axe, old)
+    assert index.resolve("battle axe").match[1] is axe
+    assert index.find_exact("Axe") == []
+
+
+def test_positions_follow_removals():
+    items = [_item(f"Item {i}") for i in range(5)]
+    data = {"Junk": list(items)}
+    index = _index(data)
+    assert index.position("Junk", items[3]) == 3
+
+    data["Junk"].pop(1)
+    index.removed("Junk", items[1])
+    assert index.position("Junk", items[3]) == 2
+    assert index.position("Junk", items[1]) == -1
+
+    extra = _item("Extra")
+    data["Junk"].append(extra)
+    index.added("Junk", extra)
+    assert index.position("Junk", extra) == 4
+    assert index.position("Other", extra) == -1
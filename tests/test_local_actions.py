@@ -0,0 +1,48 @@
+import pytest
+
+from local_actions import EAT, INVENTORY, SKILLS, STATUS, TASKS, TIME, WEALTH, Action, describe_status, match_action
+
+
+@pytest.mark.parametrize("text, kind", [
+    ("check inventory", INVENTORY),
+    ("Inventory", INVENTORY),
+    ("inv", INVENTORY),
+    ("open my backpack", INVENTORY),
+    ("let me check my bag", INVENTORY),
+    ("my items", INVENTORY),
+    ("What's in my pack?", INVENTORY),
+    ("what time is it", TIME),
+    ("how hungry am I", STATUS),
+    ("show my skills", SKILLS),
+    ("how are my projects going", TASKS),
+    ("how much money do I have", WEALTH),
+])
+def test_mechanical_actions(text, kind):
+    assert match_action(text) == Action(kind)
+
+
+@pytest.mark.parametrize("text", [
+    "I pack my bags and leave",
+    "I pack",
+    "pack",
+    "let me pack",
+    "bag",
+    "I bag the rabbit",
+    "check inventory and run for the door",
+    "",
+])
+def test_everything_else_goes_to_the_gm(text):
+    assert match_action(text) is None
+
+
+def test_eat_a_single_food():
+    assert match_action("eat the bread") == Action(EAT, "bread")
+    assert match_action("I eat some of my dried meat.") == Action(EAT, "dried meat")
+
+
+def test_eating_with_more_going_on_goes_to_the_gm():
+    assert match_action("eat the bread and run for the door") is None
+
+
+def test_describe_status():
+    assert describe_status(70, 20) == "Nutrition 70/100 (not hungry), Stamina 20/100 (exhausted)."
@@ -0,0 +1,58 @@
+import itertools
+
+import pytest
+
+# rules.py reads its sections from config, which needs python-dotenv
+pytest.importorskip("dotenv")
+
+from config import DEFAULT_RULES, RULE_SECTIONS  # noqa: E402
+from rules import RULE_PREDICATES, RuleFacts, applicable_sections, assemble_rules  # noqa: E402
+
+# Tags the GM may need on any turn, whatever the prompt's sections hold: the first
+# food, process or project has to be created while there is no Spoiling/Processing
+# section yet, and time skips spoil food and finish tasks whether or not any exist.
+ALWAYS_NEEDED = ("[[ROLL:", "[[ADD:", "[[REMOVE:", "[[MODIFY_ITEM:", "[[ADD_FOOD:", "[[STATUS:",
+                 "[[START_PROCESS:", "[[START_PROJECT:", "[[MODIFY_STAT:", "[[PASS_TIME:")
+
+# Tags that only make sense while something is in the game state, by RuleFacts field
+NEEDED_WHILE = {
+    "food": ("[[CONSUME:",),
+    "projects": ("[[WORK:",),
+    "tasks": ("[[REMOVE_PROCESS:",),
+}
+
+
+def _all_facts():
+    for food, tasks, projects, journal in itertools.product((False, True), repeat=4):
+        if projects and not tasks:
+            continue  # an active project is itself a task
+        yield RuleFacts(food=food, tasks=tasks, projects=projects, journal=journal)
+
+
+def test_every_predicate_names_a_rule_section():
+    assert set(RULE_PREDICATES) <= set(RULE_SECTIONS)
+
+
+@pytest.mark.parametrize("facts", list(_all_facts()))
+def test_rules_the_gm_needs_are_sent_for_every_section_set(facts):
+    rules = assemble_rules(facts)
+    for tag in ALWAYS_NEEDED:
+        assert tag in rules, f"{tag} missing for {facts}"
+    for field, tags in NEEDED_WHILE.items():
+        for tag in tags:
+            assert (tag in rules) == getattr(facts, field), f"{tag} for {facts}"
+
+
+def test_no_food_and_no_tasks_still_keeps_food_time_skip_and_task_rules():
+    sections = applicable_sections(RuleFacts())
+    assert {"food", "processes", "time_skips", "survival", "status"} <= set(sections)
+    assert not {"eating", "project_work", "collecting", "journal"} & set(sections)
+
+
+def test_sections_keep_their_order_and_the_full_set_matches_default_rules():
+    facts = RuleFacts(food=True, tasks=True, projects=True, journal=True)
+    assert applicable_sections(facts) == tuple(RULE_SECTIONS)
+    assert assemble_rules(facts) == DEFAULT_RULES
+    sections = applicable_sections(RuleFacts(food=True))
+    assert list(sections) == [key for key in RULE_SECTIONS if key in sections]
+    assert sections.index("mechanics_open") < sections.index("eating") < sections.index("mechanics_close")
@@ -0,0 +1,35 @@
+import json
+import os
+
+import save_schema
+from save_loader import AdventurePreloader
+
+
+def _old_save(saves_dir, name):
+    folder = os.path.join(saves_dir, name)
+    os.makedirs(folder)
+    with open(os.path.join(folder, "inventory.json"), "w", encoding="utf-8") as f:
+        json.dump({"Tools": [["Saw", "A saw.", "1", "3 Bits"]]}, f)
+    return folder
+
+
+def test_preload_does_not_migrate(tmp_path):
+    folder = _old_save(str(tmp_path), "Old")
+    preloader = AdventurePreloader(str(tmp_path), [])
+    preloader.preload("Old")
+    preloader.invalidate()
+    assert not os.path.exists(save_schema.schema_path_for(folder))
+
+    # Opening it runs the migration
+    loaded = preloader.take("Old")
+    assert save_schema.read_schema(folder)["version"] == save_schema.current_version()
+    assert loaded.stores["Inventory"].data["Tools"][0].name == "Saw"
+
+
+def test_preload_skips_sqlite_import(tmp_path):
+    folder = _old_save(str(tmp_path), "Old")
+    save_schema.migrate_adventure(folder)
+    preloader = AdventurePreloader(str(tmp_path), [], storage_backend="sqlite")
+    preloader.preload("Old")
+    preloader.invalidate()
+    assert not os.path.exists(os.path.join(folder, "adventure.db"))
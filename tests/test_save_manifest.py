@@ -0,0 +1,42 @@
+import state_store
+from save_manifest import SaveManifest
+from save_objects import ObjectStore
+
+
+def _save(saves_dir, name, turn, location):
+    folder = saves_dir / name
+    folder.mkdir(exist_ok=True)
+    state_store.write_savegame(str(folder), {"Chat History": [f"GM: turn {turn}"], "is_creating": False,
+                                             "Status": {"turn": str(turn), "location": location, "day": "Day 1"}})
+    return folder
+
+
+def test_reconcile_scans_only_new_folders(tmp_path):
+    _save(tmp_path, "Quest", 1, "Inn")
+    manifest = SaveManifest(str(tmp_path))
+    assert manifest.reconcile()["Quest"]["location"] == "Inn"
+
+    _save(tmp_path, "Quest", 5, "Forest")
+    assert manifest.reconcile()["Quest"]["location"] == "Inn"
+
+
+def test_rescan_after_checkpoint_restore(tmp_path):
+    _save(tmp_path, "Quest", 1, "Inn")
+    store = ObjectStore(str(tmp_path))
+    store.checkpoint("Quest", "start")
+    manifest = SaveManifest(str(tmp_path))
+    _save(tmp_path, "Quest", 5, "Forest")
+    manifest.update("Quest", {"turn": "5", "location": "Forest", "day": "Day 1"})
+
+    store.restore("Quest", "start")
+    manifest.rescan("Quest")
+
+    entry = dict(manifest.query())["Quest"]
+    assert (entry["turn"], entry["location"]) == ("1", "Inn")
+
+
+def test_rescan_drops_a_missing_folder(tmp_path):
+    manifest = SaveManifest(str(tmp_path))
+    manifest.update("Gone", {"turn": "2"})
+    manifest.rescan("Gone")
+    assert manifest.query() == []
@@ -0,0 +1,37 @@
+import hashlib
+import os
+
+from process_queue import ARCHIVE_FILENAME, append_archive
+from save_objects import ObjectStore
+
+
+def _sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def test_archive_append_leaves_checkpoint_blob_intact(tmp_path):
+    folder = tmp_path / "Adventure"
+    folder.mkdir()
+    append_archive(str(folder), [{"name": "Tan hides"}])
+    store = ObjectStore(str(tmp_path))
+    ref = store.checkpoint("Adventure", "before")
+    digest = ref["files"][ARCHIVE_FILENAME]
+
+    append_archive(str(folder), [{"name": "Brew ale"}])
+
+    assert _sha256(store._object_path(digest)) == digest
+
+
+def test_restored_archive_does_not_share_the_blob(tmp_path):
+    folder = tmp_path / "Adventure"
+    folder.mkdir()
+    append_archive(str(folder), [{"name": "Tan hides"}])
+    store = ObjectStore(str(tmp_path))
+    digest = store.checkpoint("Adventure", "before")["files"][ARCHIVE_FILENAME]
+    store.restore("Adventure", "before")
+
+    append_archive(str(folder), [{"name": "Brew ale"}])
+
+    assert _sha256(store._object_path(digest)) == digest
+    assert os.path.getsize(folder / ARCHIVE_FILENAME) > os.path.getsize(store._object_path(digest))
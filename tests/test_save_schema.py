@@ -0,0 +1,97 @@
+import json
+import os
+
+import pytest
+
+import save_schema
+from event_log import EventLog
+
+
+def _write(folder, name, data):
+    with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def _read(folder, name):
+    with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_legacy_inventory_is_converted_once(tmp_path):
+    folder = str(tmp_path)
+    _write(folder, "inventory.json", {"Tools": [["Saw", "A saw.", 1, "3 Bits"], {"name": "Rope"}, 42], "Junk": "bad"})
+
+    assert save_schema.migrate_adventure(folder) == ["inventory_items_to_dicts", "pin_dotted_spoil_times"]
+    assert _read(folder, "inventory.json") == {
+        "Tools": [{"name": "Saw", "desc": "A saw.", "amount": "1", "value": "3 Bits"},
+                  {"name": "Rope", "desc": "No desc", "amount": "1", "value": "0"}],
+        "Junk": [],
+    }
+    schema = save_schema.read_schema(folder)
+    assert schema == {"version": save_schema.current_version(),
+                      "applied": ["inventory_items_to_dicts", "pin_dotted_spoil_times"]}
+
+    # Already current: nothing runs again
+    assert save_schema.migrate_adventure(folder) == []
+    assert not save_schema.needs_migration(folder)
+
+
+def test_new_adventure_is_stamped_without_migrating(tmp_path):
+    folder = str(tmp_path)
+    assert save_schema.needs_migration(folder)
+    assert save_schema.migrate_adventure(folder) == []
+    assert save_schema.read_schema(folder)["version"] == save_schema.current_version()
+
+
+def test_unreadable_stamp_counts_as_version_zero(tmp_path):
+    (tmp_path / save_schema.SCHEMA_FILENAME).write_text("not json")
+    assert save_schema.read_schema(str(tmp_path)) == {"version": 0, "applied": []}
+
+
+def test_migrations_must_be_registered_in_order():
+    with pytest.raises(ValueError):
+        save_schema.migration(save_schema.current_version(), "out_of_order")(lambda folder: None)
+
+
+def _food(name, spoil_time):
+    return {"name": name, "desc": "", "amount": "1", "value": "1 Bits",
+            "meta": {"type": "food", "meals": 1, "spoil_day": "Day 4", "spoil_time": spoil_time}}
+
+
+def _as_version(folder, version):
+    save_schema.write_schema(folder, {"version": version, "applied": []})
+
+
+def test_dotted_spoil_times_keep_their_old_reading(tmp_path):
+    folder = str(tmp_path)
+    _write(folder, "inventory.json", {"Food": [_food("Bread", "11:59 P.M."), _food("Stew", "6:00 PM"),
+                                               _food("Jerky", "Evening")]})
+    _as_version(folder, 1)
+
+    assert save_schema.migrate_adventure(folder) == ["pin_dotted_spoil_times"]
+    times = [item["meta"]["spoil_time"] for item in _read(folder, "inventory.json")["Food"]]
+    # The old parser read "11:59 P.M." as midnight at the start of Day 4
+    assert times == ["12:00 AM", "6:00 PM", "Evening"]
+
+
+def test_dotted_spoil_times_in_the_event_log_and_snapshots(tmp_path):
+    folder = str(tmp_path)
+    _write(folder, "inventory.json", {})
+    log = EventLog(folder)
+    log.ensure_base_snapshot(0, {"inventory": {"Food": [_food("Bread", "11:59 P.M.")]}, "skills": [],
+                                 "processing": [], "status": {}})
+    log.record(1, "item_added", category="Food", index=1, item=_food("Cheese", "1:00 P.M."))
+    log.flush()
+    log.write_snapshot(1, log.state_at(1)[0])
+    log.record(2, "item_added", category="Food", index=2, item=_food("Apple", "2:00 P.M."))
+    log.flush()
+    _as_version(folder, 1)
+
+    save_schema.migrate_adventure(folder)
+
+    state, offset = log.state_at(2)
+    assert [item["meta"]["spoil_time"] for item in state["inventory"]["Food"]] == ["12:00 AM"] * 3
+    assert offset == os.path.getsize(log.path)
+    # Replaying from the base snapshot gives the same result as from the rewritten turn-1 snapshot
+    os.remove(os.path.join(log.snapshot_dir, "turn_000001.json"))
+    assert log.state_at(2)[0] == state
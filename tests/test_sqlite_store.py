@@ -0,0 +1,93 @@
+import os
+import sqlite3
+
+import pytest
+
+import sqlite_store
+
+
+@pytest.fixture
+def db(tmp_path):
+    store = sqlite_store.SqliteAdventureStore.for_folder(str(tmp_path))
+    yield store
+    store.close()
+
+
+def test_commit_writes_only_changed_rows(db):
+    inventory = {"Food": [{"name": "Bread"}, {"name": "Ham"}], "Tools": [{"name": "Saw"}]}
+    db.save_inventory(inventory)
+    before = db.conn.total_changes
+    inventory["Food"][1]["amount"] = "2"
+    db.save_inventory(inventory)
+    assert db.conn.total_changes - before == 1
+
+
+def test_removed_rows_are_deleted(db):
+    db.save_inventory({"Food": [{"name": "Bread"}], "Tools": [{"name": "Saw"}]})
+    db.save_inventory({"Food": [{"name": "Apple"}, {"name": "Bread"}]})
+    assert db.load_inventory() == {"Food": [{"name": "Apple"}, {"name": "Bread"}]}
+    db.save_tasks([{"name": "a"}, {"name": "b"}])
+    db.save_tasks([{"name": "b"}])
+    assert db.load_tasks() == [{"name": "b"}]
+
+
+def test_skill_names_are_case_sensitive(db):
+    db.save_skills([{"Name": "Cooking", "Level": 1}, {"Name": "cooking", "Level": 2}])
+    assert [(s["Name"], s["Level"]) for s in db.load_skills()] == [("Cooking", 1), ("cooking", 2)]
+
+
+def test_nocase_skills_table_is_upgraded(tmp_path):
+    conn = sqlite3.connect(sqlite_store.db_path_for(str(tmp_path)))
+    conn.execute("CREATE TABLE skills (name TEXT PRIMARY KEY COLLATE NOCASE, level INTEGER NOT NULL DEFAULT 0, "
+                 "xp INTEGER NOT NULL DEFAULT 0, threshold INTEGER NOT NULL DEFAULT 5)")
+    conn.execute("INSERT INTO skills VALUES ('Cooking', 3, 1, 5)")
+    conn.commit()
+    conn.close()
+
+    store = sqlite_store.SqliteAdventureStore.for_folder(str(tmp_path))
+    try:
+        store.save_skills([{"Name": "Cooking", "Level": 3, "XP": 1}, {"Name": "cooking"}])
+        assert [s["Name"] for s in store.load_skills()] == ["Cooking", "cooking"]
+    finally:
+        store.close()
+
+
+def test_tail_load_keeps_the_archived_history(tmp_path):
+    import state_store
+
+    folder = str(tmp_path)
+    db = sqlite_store.SqliteAdventureStore.for_folder(folder)
+    try:
+        lines = [f"GM: line {i}" for i in range(100)]
+        db.save_savegame({"Chat History": lines, "Status": {"turn": "3"}, "is_creating": False})
+
+        data = state_store.read_savegame(folder, tail_chars=30)
+        tail, archive = data["Chat History"], data["History Archive"]
+        assert tail == lines[-len(tail):] and len(tail) < len(lines)
+        assert archive.load_lines() + tail == lines
+
+        # Saving the tail plus a new line must not drop the archived lines
+        state_store.write_savegame(folder, {"Chat History": tail + ["Player: hi"], "Status": {}, "History Archive": archive})
+        assert db.load_savegame()["Chat History"] == lines + ["Player: hi"]
+    finally:
+        db.close()
+
+
+def test_migration_imports_a_snapshot_format_save(tmp_path):
+    import state_store
+    from save_loader import load_adventure_files
+
+    folder = str(tmp_path)
+    lines = [f"GM: line {i}" for i in range(50)]
+    state_store.write_savegame(folder, {"Chat History": lines, "Status": {"turn": "7"}, "is_creating": False},
+                               save_format="snapshot")
+    assert not os.path.exists(os.path.join(folder, "savegame.json"))
+
+    loaded = load_adventure_files(folder, [], storage_backend="sqlite")
+    try:
+        assert sqlite_store.has_database(folder)
+        assert loaded.savegame["Chat History"] == lines
+        assert loaded.savegame["Status"] == {"turn": "7"}
+        assert loaded.savegame["is_creating"] is False
+    finally:
+        sqlite_store.close_folder(folder)
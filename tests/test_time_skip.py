@@ -0,0 +1,79 @@
+from game_clock import GameClock
+from inventory_model import Item, ItemMeta
+from process_queue import ProcessQueue
+from spoilage import SpoilageSchedule
+from time_skip import PASS_TIME_TAG, TimeSkip, normalize_activity, simulate_stats
+from time_utils import to_abs_minutes
+
+
+def _tags(text):
+    return [(m.group(1), m.group(2)) for m in PASS_TIME_TAG.finditer(text)]
+
+
+def test_pass_time_tag_reads_hours_and_activity():
+    assert _tags("[[PASS_TIME: 8 | Sleep]]") == [("8", "Sleep")]
+    assert _tags("[[PASS_TIME: 1.5]]") == [("1.5", None)]
+
+
+def test_pass_time_tag_ignores_malformed_hours():
+    text = "[[PASS_TIME: .. | Sleep]] [[PASS_TIME: 1.2.3 | Travel]] [[PASS_TIME: abc]] [[PASS_TIME: -4]]"
+    assert _tags(text) == []
+    # A malformed tag doesn't swallow a good one after it
+    assert _tags("[[PASS_TIME: 1.2.3 | Wait]] then [[PASS_TIME: 2 | Rest]]") == [("2", "Rest")]
+
+
+def test_simulate_stats_for_sleep_and_travel():
+    assert simulate_stats(80, 30, 8, normalize_activity("Sleeping")) == (40, 80)
+    assert simulate_stats(80, 30, 8, normalize_activity("Travel")) == (40, 20)
+    assert simulate_stats(20, 100, 8, normalize_activity("Juggling")) == (0, 100)
+
+
+def _food(name, day, time):
+    return Item(name, meta=ItemMeta(type="food", meals=1, spoil_day=day, spoil_time=time))
+
+
+def _process(name, day, time):
+    return {"type": "process", "name": name, "status": "In Progress",
+            "target_abs_minutes": to_abs_minutes(day, time), "yield": name}
+
+
+def test_one_skip_crosses_several_spoil_and_process_deadlines():
+    food = {"Food": [_food("Bread", "Day 2", "6:00 AM"), _food("Milk", "Day 1", "11:00 PM"),
+                     _food("Jerky", "Day 9", "12:00 PM")]}
+    processes = [_process("Tanning", "Day 2", "8:00 AM"), _process("Brewing", "Day 1", "10:00 PM"),
+                 _process("Smelting", "Day 5", "12:00 PM")]
+    spoilage, queue = SpoilageSchedule(), ProcessQueue()
+    spoilage.rebuild(food)
+    queue.rebuild(processes)
+    calls = []
+
+    # Same order as GameApp: processes complete before food spoils
+    def processes_due(now, previous):
+        calls.append((now, previous))
+        done = [p["name"] for p in queue.pop_due(now)]
+        return [f"System: Process completed - {', '.join(done)}"] if done else None
+
+    def spoilage_due(now, previous):
+        return [f"System: {item.name} has spoiled." for _, item in spoilage.expire(now)]
+
+    clock = GameClock(to_abs_minutes("Day 1", "8:00 PM"))
+    clock.subscribe(processes_due)
+    clock.subscribe(spoilage_due)
+    events = clock.advance(14)
+
+    start = to_abs_minutes("Day 1", "8:00 PM")
+    assert calls == [(start + 14 * 60, start)]
+    assert (clock.day_string, clock.time_string) == ("Day 2", "10:00 AM")
+    assert events == [
+        "System: Process completed - Brewing, Tanning",
+        "System: Milk has spoiled.",
+        "System: Bread has spoiled.",
+    ]
+    # Later deadlines are left for a later skip
+    assert queue.next_due() == to_abs_minutes("Day 5", "12:00 PM")
+    assert spoilage.next_due() == to_abs_minutes("Day 9", "12:00 PM")
+
+    skip = TimeSkip(14, "sleep", clock.day_string, clock.time_string, (80, 10), (30, 80), events)
+    assert skip.summary().endswith(
+        "Meanwhile: Process completed - Brewing, Tanning; Milk has spoiled; Bread has spoiled."
+    )
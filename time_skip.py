@@ -0,0 +1,92 @@
+"""
+Deterministic fast-forward for time skips ([[PASS_TIME: Hours | Activity]]).
+
+Instead of the GM emitting a STATUS and a pile of MODIFY_STAT tags for a night's
+sleep or a two-day journey, GameApp advances the clock in one step:
+
+    1. survival stats, using the DEFAULT_RULES rates below
+    2. the clock (its tick subscribers, GameApp._processes_due and
+       GameApp._spoilage_due, pop the processes that finish and the food that
+       spoils on the way, earliest first)
+    3. a one-line summary the GM only has to narrate
+
+This module only holds the tag pattern, the stat rules and the summary; GameApp
+applies them.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+# Hours must be a plain number ("8", "1.5"); tags like "1.2.3" or ".." don't match
+PASS_TIME_TAG = re.compile(r"\[\[PASS_TIME:\s*(\d+(?:\.\d+)?)\s*(?:\|\s*(.*?))?\s*\]\]")
+
+# DEFAULT_RULES: "Decrease by -5 about every 1 hour in-game"
+NUTRITION_PER_HOUR = -5
+# DEFAULT_RULES: "-5 to -15 for hard labor or long travel" -> ~-10 per 8 hours on the road
+STAMINA_PER_HOUR = {
+    "travel": -1.25,
+    "wait": 0.0,
+}
+# DEFAULT_RULES: "+50 on sleeping/long rest", "+10/+15 on short rest"
+RESTING_ACTIVITIES = ("sleep", "rest")
+LONG_REST_HOURS = 6
+LONG_REST_STAMINA = 50
+SHORT_REST_STAMINA = 15
+
+# Words the GM may use for each activity
+_ACTIVITY_ALIASES = {
+    "sleep": "sleep", "sleeping": "sleep", "nap": "rest", "camp": "sleep",
+    "rest": "rest", "resting": "rest", "long rest": "sleep", "short rest": "rest",
+    "travel": "travel", "traveling": "travel", "travelling": "travel", "walk": "travel", "ride": "travel",
+    "wait": "wait", "waiting": "wait", "idle": "wait",
+}
+
+
+def normalize_activity(raw: str) -> str:
+    """'Sleeping' -> 'sleep'. Unknown activities count as waiting."""
+    return _ACTIVITY_ALIASES.get((raw or "").strip().lower(), "wait")
+
+
+def _clamp(value: float) -> int:
+    return max(0, min(100, int(round(value))))
+
+
+def simulate_stats(nutrition: int, stamina: int, hours: float, activity: str):
+    """Returns (nutrition, stamina) after `hours` of `activity`."""
+    new_nutrition = _clamp(nutrition + NUTRITION_PER_HOUR * hours)
+    if activity in RESTING_ACTIVITIES:
+        # One rest bonus per started day of the skip
+        days = max(1, int(hours // 24) + (1 if hours % 24 else 0))
+        per_rest = LONG_REST_STAMINA if hours / days >= LONG_REST_HOURS else SHORT_REST_STAMINA
+        new_stamina = _clamp(stamina + per_rest * days) if hours >= 1 else _clamp(stamina)
+    else:
+        new_stamina = _clamp(stamina + STAMINA_PER_HOUR.get(activity, 0.0) * hours)
+    return new_nutrition, new_stamina
+
+
+@dataclass
+class TimeSkip:
+    hours: float
+    activity: str
+    day: str
+    time: str
+    nutrition: tuple          # (before, after)
+    stamina: tuple            # (before, after)
+    events: List[str] = field(default_factory=list)   # System messages raised on the way
+
+    def summary(self) -> str:
+        parts = [
+            f"System: {self.hours:g} hours pass ({self.activity}). Now {self.day}, {self.time}.",
+            f"Nutrition {self.nutrition[0]} -> {self.nutrition[1]}, Stamina {self.stamina[0]} -> {self.stamina[1]}.",
+        ]
+        if self.nutrition[1] < 40:
+            parts.append("The Player is starving.")
+        elif self.nutrition[1] < 60:
+            parts.append("The Player is hungry.")
+        events = [e.replace("System: ", "", 1) for e in self.events]
+        if events:
+            parts.append("Meanwhile: " + "; ".join(e.rstrip(".") for e in events) + ".")
+        return " ".join(parts)
@@ -8,12 +8,18 @@ Internal canonical representation:
     abs_minutes = (day-1)*1440 + minutes_since_midnight
 
 Supports legacy "time buckets" like "Morning".
+
+The string parsers are memoized: the same few day/time strings ("Day 3",
+"6:00 PM") come back every turn, so only the first sighting runs the regexes.
+Game code keeps time as absolute minutes (see game_clock.GameClock) and only
+parses at the tag boundary.
 """
 
 from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Tuple
 
 # Legacy buckets (backwards compatibility)
@@ -28,6 +34,11 @@ LEGACY_TIME_TO_CLOCK = {
     "midnight": (12, 0, "AM"),
 }
 
+_DAY_RE = re.compile(r"(\d+)")
+_TIME_12H_RE = re.compile(r"^\s*(\d{1,2})\s*:\s*(\d{1,2})\s*([AaPp])\.?\s*([Mm])\.?\s*$")
+_TIME_HOUR_RE = re.compile(r"^\s*(\d{1,2})\s*([AaPp])\.?\s*([Mm])\.?\s*$")
+_TIME_24H_RE = re.compile(r"^\s*(\d{1,2})\s*:\s*(\d{1,2})\s*$")
+
 
 @dataclass(frozen=True)
 class GameTime:
@@ -51,11 +62,12 @@ def clamp_day(day: int) -> int:
     return max(1, day)
 
 
+@lru_cache(maxsize=1024)
 def parse_day(day_str: str) -> int:
     if day_str is None:
         return 1
     s = str(day_str).strip()
-    m = re.search(r"(\d+)", s)
+    m = _DAY_RE.search(s)
     if not m:
         return 1
     return clamp_day(int(m.group(1)))
@@ -109,6 +121,7 @@ def format_time(hour: int, minute: int, ampm: str) -> str:
     return f"{h}:{m:02d} {ap}"
 
 
+@lru_cache(maxsize=1024)
 def parse_time(time_str: str) -> Tuple[int, int, str]:
     if not time_str:
         return (12, 0, "AM")
@@ -122,22 +135,22 @@ def parse_time(time_str: str) -> Tuple[int, int, str]:
             return (h, m, ap)
 
     # HH:MM AM/PM
-    m = re.match(r"^\s*(\d{1,2})\s*:\s*(\d{1,2})\s*([AaPp][Mm])\s*$", s)
+    m = _TIME_12H_RE.match(s)
     if m:
         h = max(1, min(12, int(m.group(1))))
         mi = max(0, min(59, int(m.group(2))))
-        ap = m.group(3).upper()
+        ap = (m.group(3) + m.group(4)).upper()
         return (h, mi, ap)
 
     # H AM/PM
-    m = re.match(r"^\s*(\d{1,2})\s*([AaPp][Mm])\s*$", s)
+    m = _TIME_HOUR_RE.match(s)
     if m:
         h = max(1, min(12, int(m.group(1))))
-        ap = m.group(2).upper()
+        ap = (m.group(2) + m.group(3)).upper()
         return (h, 0, ap)
 
     # 24h like 15:30
-    m = re.match(r"^\s*(\d{1,2})\s*:\s*(\d{1,2})\s*$", s)
+    m = _TIME_24H_RE.match(s)
     if m:
         h24 = int(m.group(1)) % 24
         mi = max(0, min(59, int(m.group(2))))
@@ -147,6 +160,7 @@ def parse_time(time_str: str) -> Tuple[int, int, str]:
     return (12, 0, "AM")
 
 
+@lru_cache(maxsize=4096)
 def to_abs_minutes(day_str: str, time_str: str) -> int:
     day = parse_day(day_str)
     h, m, ap = parse_time(time_str)
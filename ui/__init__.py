@@ -3,4 +3,5 @@ from .skills_tab import SkillsTab
 from .editor_tab import MarkdownEditorTab
 from .inventory_tab import InventoryTab
 from .story_tab import StoryTab
-from .processing_tab import ProcessingTab
\ No newline at end of file
+from .processing_tab import ProcessingTab
+from .dispatcher import UIDispatcher
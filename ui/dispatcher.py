@@ -0,0 +1,101 @@
+import threading
+from collections import Counter, OrderedDict
+
+# One frame at ~60 fps; queued UI work is applied at most this often
+FRAME_MS = 16
+
+
+class UIDispatcher:
+    """
+    Thread-safe queue of UI work, flushed on the Tk main thread once per frame.
+
+    The AI worker thread produces bursts of UI updates (one chat line per tag,
+    a status label update per STATUS/MODIFY_STAT, a redraw per changed tab).
+    Instead of one after(0) each, they are queued here and applied together:
+
+      append(key, chunk, flush_fn)  chunks are batched; flush_fn(chunks) runs once per frame
+      coalesce(key, fn)             only the latest fn per key runs (redraws, label updates)
+      call(fn)                      runs once, in order, after the batched work above
+
+    renders counts how many times each key was actually drawn since begin_turn(),
+    so a 30-tag turn can be checked to cost one render per affected tab.
+    """
+
+    def __init__(self, root, frame_ms=FRAME_MS):
+        self.root = root
+        self.frame_ms = frame_ms
+        self._lock = threading.Lock()
+        self._appends = OrderedDict()   # key -> (flush_fn, [chunks])
+        self._latest = OrderedDict()    # key -> fn
+        self._calls = []
+        self._running = False
+        self.renders = Counter()
+
+    # --- Lifecycle (Tk thread) ---
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            self.root.after(self.frame_ms, self._tick)
+
+    def stop(self):
+        self._running = False
+
+    def _tick(self):
+        try:
+            self.flush()
+        finally:
+            if self._running:
+                self.root.after(self.frame_ms, self._tick)
+
+    # --- Producers (any thread) ---
+
+    def append(self, key, chunk, flush_fn):
+        with self._lock:
+            entry = self._appends.get(key)
+            if entry is None:
+                self._appends[key] = (flush_fn, [chunk])
+            else:
+                entry[1].append(chunk)
+
+    def coalesce(self, key, fn):
+        with self._lock:
+            self._latest[key] = fn
+
+    def call(self, fn):
+        with self._lock:
+            self._calls.append(fn)
+
+    # --- Flushing (Tk thread) ---
+
+    def flush(self):
+        with self._lock:
+            if not (self._appends or self._latest or self._calls):
+                return
+            appends, self._appends = self._appends, OrderedDict()
+            latest, self._latest = self._latest, OrderedDict()
+            calls, self._calls = self._calls, []
+
+        for key, (flush_fn, chunks) in appends.items():
+            self._run(key, flush_fn, chunks)
+        for key, fn in latest.items():
+            self._run(key, fn)
+        for fn in calls:
+            self._run(None, fn)
+
+    def _run(self, key, fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"UI Update Error ({key or getattr(fn, '__name__', fn)}): {e}")
+        if key is not None:
+            self.renders[key] += 1
+
+    # --- Per-turn stats ---
+
+    def begin_turn(self):
+        self.renders = Counter()
+
+    def report(self):
+        """{key: renders} since begin_turn()."""
+        return dict(self.renders)
@@ -1,115 +1,217 @@
 import customtkinter as ctk
 import os
-import json
-from tabulate import tabulate
-from time_utils import to_abs_minutes
+from time_utils import to_abs_minutes, from_abs_minutes
+from state_store import JsonStore, open_section_store
+from inventory_index import InventoryIndex
+from currency import WealthLedger
+from spoilage import SpoilageSchedule, SPOILING_SOON_HOURS
+from inventory_model import INVENTORY_CODEC, Item, ItemMeta, parse_value
+from .table_view import TableView
 
 class InventoryTab(ctk.CTkFrame):
     """Displays Inventory dynamically based on Item Types."""
+
+    HEADERS = ["Name", "Description", "Amount", "Value (each)"]
+
     def __init__(self, parent):
         super().__init__(parent)
         self.data_path = ""
+        # Holds inventory_model.Item objects; the codec converts to/from the JSON dicts
+        self.store = JsonStore(dict, INVENTORY_CODEC)
+        # Name -> item lookups, per-category value totals and food spoil times;
+        # kept in step by every mutation below
+        self.index = InventoryIndex()
+        self.wealth = WealthLedger()
+        self.spoilage = SpoilageSchedule()
+        # Set by GameApp: called as on_event(kind, payload) for every applied mutation
+        self.on_event = None
+        # Rows changed since the last refresh: id(item) -> (category, item or None if removed)
+        self._view_dirty = {}
+        self._view_data = None
         
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1) 
         
-        self.display = ctk.CTkTextbox(self, font=("Consolas", 14), wrap="none", state="disabled")
-        self.display.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        self.table = TableView(self, "INVENTORY", self.HEADERS,
+                               widths={"Name": 240, "Description": 420, "Amount": 80, "Value (each)": 120})
+        self.table.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
 
     def set_base_path(self, folder_path):
+        self.bind_store(folder_path, open_section_store(folder_path, "inventory.json", dict, INVENTORY_CODEC))
+
+    def bind_store(self, folder_path, store):
+        # store may come pre-opened from the background preloader (see save_loader.py)
         self.data_path = os.path.join(folder_path, "inventory.json")
+        self.store = store
         self.refresh_display()
 
-    def get_text(self):
-        return self.display.get("0.0", "end")
-
     def load_data(self):
-        if not self.data_path or not os.path.exists(self.data_path):
-            return {}
-        try:
-            with open(self.data_path, "r") as f:
-                return json.load(f)
-        except:
-            return {}
+        # In-memory copy; callers mutate it in place and hand it back to save_data()
+        return self.store.data
 
     def save_data(self, data):
+        # Deferred: GameApp commits the store (and redraws the tab) once per turn
         if not self.data_path: return
-        with open(self.data_path, "w") as f:
-            json.dump(data, f, indent=4)
-        self.refresh_display()
+        self.store.data = data
+        self.store.mark_dirty()
+
+    def commit(self):
+        """Writes pending changes to inventory.json. Returns True if the file was written."""
+        return self.store.commit()
+
+    def _index(self):
+        # Rebuilt only when the data object itself was replaced (load, rewind).
+        # Mutators call this before changing anything, then report the change via _track_*.
+        self.wealth.ensure(self.store.data)
+        self.spoilage.ensure(self.store.data)
+        return self.index.ensure(self.store.data)
+
+    def _mark_row(self, category, item, removed=False):
+        self._view_dirty[id(item)] = (category, None if removed else item)
+
+    def _track_added(self, category, item):
+        self._mark_row(category, item)
+        self.index.added(category, item)
+        self.wealth.added(category, item)
+        self.spoilage.added(category, item)
+
+    def _track_removed(self, category, item):
+        self._mark_row(category, item, removed=True)
+        self.index.removed(category, item)
+        self.wealth.removed(category, item)
+        self.spoilage.removed(category, item)
+
+    def _track_changed(self, category, item, old_name=None):
+        self._mark_row(category, item)
+        if old_name is not None and old_name != item.name:
+            self.index.renamed(category, item, old_name)
+        self.wealth.changed(category, item)
+        self.spoilage.changed(category, item)
+
+    # --- Wealth ---
+
+    def set_currency(self, currency):
+        """Switches the denomination table (currency.CurrencyModel) used for the value totals."""
+        self.wealth.rebuild(self.store.data, currency)
+
+    def wealth_summary(self):
+        self._index()
+        return self.wealth.summary()
+
+    # --- Spoilage ---
+
+    def expire_spoiled(self, now):
+        """Throws out food that has spoiled by `now` (absolute minutes). Returns one message per item."""
+        index = self._index()
+        expired = self.spoilage.expire(now)
+        if not expired:
+            return []
+        data = self.load_data()
+        # Positions are looked up before anything moves; each category list is then rebuilt once
+        by_category = {}
+        for category, item in expired:
+            i = index.position(category, item)
+            if i >= 0:
+                by_category.setdefault(category, []).append((i, item))
+        thrown = set()
+        for category, found in by_category.items():
+            gone = {id(item) for _, item in found}
+            data[category][:] = [item for item in data[category] if id(item) not in gone]
+            # Highest index first, so each event's index is still right when the log replays it
+            for i, item in sorted(found, key=lambda entry: entry[0], reverse=True):
+                self._track_removed(category, item)
+                self._emit("item_removed", category=category, index=i)
+            thrown |= gone
+        self.save_data(data)
+        return [f"System: {item.name} has spoiled and was thrown out." for _, item in expired if id(item) in thrown]
+
+    def has_food(self):
+        """True while any food is carried (ADD_FOOD always gives it a spoil date, so it is on the schedule)."""
+        self._index()
+        return len(self.spoilage) > 0
+
+    def find_food(self, name, now):
+        """(item, spoiled) for the one food item `name` resolves to, or None if it isn't exactly one food item."""
+        lookup = self._index().resolve(name)
+        if lookup.match is None or lookup.match[1].meta is None:
+            return None
+        item = lookup.match[1]
+        spoils_at = self.spoilage.spoils_at(item)
+        return item, spoils_at is not None and now >= spoils_at
+
+    def spoiling_soon(self, now, hours=SPOILING_SOON_HOURS):
+        """One line per food item that spoils within `hours` of `now`, soonest first ("" if none)."""
+        self._index()
+        lines = []
+        for due, category, item in self.spoilage.upcoming(now, int(hours * 60)):
+            gt = from_abs_minutes(due)
+            left = due - now
+            lines.append(f"{item.name} ({category}): spoils {gt.as_day_string()} at {gt.as_time_string()} (in {left // 60}h {left % 60:02d}m)")
+        return "\n".join(lines)
+
+    def _emit(self, kind, **payload):
+        if self.on_event:
+            # Events are stored in the on-disk item shape
+            if "item" in payload:
+                payload["item"] = payload["item"].to_dict()
+            self.on_event(kind, payload)
         
     # --- Time Helper ---
     def _get_ticks(self, day, time_str):
         return int(to_abs_minutes(day, time_str))
 
+    # --- Display ---
+
+    def _describe(self, item):
+        desc = item.desc
+        meta = item.meta
+        if meta is not None and meta.meals is not None:
+            extra_info = f" [Meals: {meta.meals}"
+            if meta.spoil_day is not None:
+                extra_info += f", Spoils: Day {meta.spoil_day} at {meta.spoil_time}."
+            extra_info += "]"
+            desc += extra_info
+        return desc
+
+    def _row(self, item):
+        return (item.name, self._describe(item), item.amount_display, item.value.raw)
+
     def refresh_display(self):
+        """
+        Applies the rows changed since the last refresh to the table (see _mark_row).
+        Only rebuilds everything when the data object was replaced (load, rewind).
+        """
         data = self.load_data()
-        headers = ["Name", "Description", "Amount", "Value (each)"]
-        full_text = "INVENTORY\n"
-        display_map = {}
-        
-        for category in sorted(data.keys()):
-            items = data[category]
-            if items:
-                display_cat = self._make_plural(category)
-                display_map[category] = display_cat
-                full_text += f"\n{category}\n"
-                
-                table_rows = []
-                for item in items:
-                    # --- SAFETY CHECK: Handle both Dicts and Lists ---
-                    if isinstance(item, dict):
-                        # New Format
-                        name = item.get("name", "Unknown")
-                        desc = item.get("desc", "No desc")
-                        amt = item.get("amount", "1")
-                        val = item.get("value", "0")
-                        
-                        # Handle Metadata
-                        if "meta" in item:
-                            meta = item["meta"]
-                            if "meals" in meta:
-                                extra_info = f" [Meals: {meta['meals']}"
-                                if "spoil_day" in meta:
-                                    extra_info += f", Spoils: Day {meta['spoil_day']} at {meta['spoil_time']}."
-                                extra_info += "]"
-                                desc += extra_info
-                    
-                    elif isinstance(item, list):
-                        # Old Format (Legacy Support)
-                        # [Name, Desc, Amount, Value]
-                        name = item[0] if len(item) > 0 else "Unknown"
-                        desc = item[1] if len(item) > 1 else "No desc"
-                        amt = item[2] if len(item) > 2 else "1"
-                        val = item[3] if len(item) > 3 else "0"
-                    
-                    else:
-                        continue # Skip broken items
-
-                    table_rows.append([name, desc, amt, val])
-
-                full_text += tabulate(table_rows, headers, tablefmt="simple_grid")
-                full_text += "\n"
-        
-        self.display.configure(state="normal")
-        self.display.delete("0.0", "end")
-        self.display.insert("0.0", full_text)
-        self._apply_styles(display_map.values())
-        self.display.configure(state="disabled")
-
-    def _apply_styles(self, categories):
-        """Applies visual tags to specific words."""
-        txt = self.display._textbox
-        
-        # Define Styles
-        txt.tag_config("h1", font=("Consolas", 24, "bold"), foreground="#FFD700", spacing3=10)
-
-        # 1. Main Title
-        start_pos = "1.0"
-        pos = txt.search("INVENTORY", start_pos, stopindex="end")
-        if pos:
-            txt.tag_add("h1", pos, f"{pos} lineend")
-            
+        if data is not self._view_data:
+            self._view_data = data
+            self._view_dirty = {}
+            self.table.clear()
+            for category in sorted(data.keys()):
+                for item in data[category]:
+                    self._show_row(category, item)
+            return
+
+        dirty, self._view_dirty = self._view_dirty, {}
+        touched = set()
+        for key, (category, item) in dirty.items():
+            touched.add(category)
+            if item is None:
+                self.table.delete(f"item:{key}")
+            else:
+                self._show_row(category, item)
+        for category in touched:
+            if not data.get(category):
+                self.table.delete(f"cat:{category}")
+
+    def _show_row(self, category, item):
+        group = f"cat:{category}"
+        if not self.table.has(group):
+            # Categories stay sorted: insert before the first one that sorts after it
+            later = [k for k in self.table.keys() if k[4:] > category]
+            index = self.table.keys().index(later[0]) if later else "end"
+            self.table.upsert(group, (self._make_plural(category), "", "", ""), index=index, group=True)
+        self.table.upsert(f"item:{id(item)}", self._row(item), parent=group)
+
     def modify_item(self, raw_args):
         # Format: TargetName | NewName | NewDesc | NewAmount | NewValue
         # Use "SAME" or "SKIP" to keep the current value for that field
@@ -130,40 +232,28 @@ class InventoryTab(ctk.CTkFrame):
             new_val  = parts[4] if should_update(4) else None
             
             data = self.load_data()
-            found = False
-            
-            for cat, items in data.items():
-                for item in items:
-                    # check name (handle both dict and list format for safety)
-                    if isinstance(item, dict):
-                        current_name = item.get("name", "Unknown")
-                    else:
-                        current_name = item[0] if item else "Unknown"
-                    
-                    if current_name.lower() == target.lower():
-                        # Found it! Update in place.
-                        if isinstance(item, dict):
-                            if new_name: item["name"] = new_name
-                            if new_desc: item["desc"] = new_desc
-                            if new_amt:  item["amount"] = new_amt
-                            if new_val:  item["value"] = new_val
-                        else:
-                            # Legacy List Support
-                            if new_name: item[0] = new_name
-                            if new_desc: item[1] = new_desc
-                            if new_amt:  item[2] = new_amt
-                            if new_val:  item[3] = new_val
-                        found = True
-                        break
-                if found: break
-            
+            lookup = self._index().resolve(target)
+            found = lookup.match is not None
+
             if found:
+                # Found it! Update in place.
+                cat, item = lookup.match
+                old_name = item.name
+                if new_name: item.name = new_name
+                if new_desc: item.desc = new_desc
+                if new_amt:  item.set_amount(new_amt)
+                if new_val:  item.value = parse_value(new_val)
+                self._track_changed(cat, item, old_name)
+                self._emit("item_modified", category=cat, index=self._index().position(cat, item), item=item)
+
                 self.save_data(data)
                 changes = []
                 if new_name: changes.append(f"Name->{new_name}")
                 if new_desc: changes.append("Description updated")
                 if new_val:  changes.append("Value updated")
                 return f"(Updated {target}: {', '.join(changes)})"
+            elif lookup.ambiguous:
+                return lookup.report()
             else:
                 return f"System: Could not find item '{target}' to modify."
         except Exception as e:
@@ -194,31 +284,26 @@ class InventoryTab(ctk.CTkFrame):
             # 5. Value
             value = parts[4] if len(parts) > 4 else "N/A"
 
-            # NEW: Dictionary Structure
-            new_item = {
-                "name": name,
-                "desc": desc,
-                "amount": amount,
-                "value": value
-            }
+            new_item = Item(name, desc, amount, value)
 
             data = self.load_data()
             if category not in data: data[category] = []
             
-            # Stack Logic (using dict keys)
+            # Stack Logic (exact name in the same category, never food with metadata)
             found = False
-            for item in data[category]:
-                if item["name"].lower() == name.lower() and "meta" not in item:
-                    try:
-                        cur_amt = int(item["amount"])
-                        add_amt = int(amount)
-                        item["amount"] = str(cur_amt + add_amt)
+            for _, item in self._index().find_exact(name, category):
+                if item.meta is None:
+                    if item.countable and new_item.countable:
+                        item.amount += new_item.amount
+                        self._track_changed(category, item)
+                        self._emit("item_modified", category=category, index=self._index().position(category, item), item=item)
                         found = True
-                    except: pass
                     break
             
             if not found:
                 data[category].append(new_item)
+                self._track_added(category, new_item)
+                self._emit("item_added", category=category, index=len(data[category]) - 1, item=new_item)
 
             self.save_data(data)
             return f"(Added {amount}x {name} to inventory as \"{category}\"!)."
@@ -242,28 +327,17 @@ class InventoryTab(ctk.CTkFrame):
             spoil_day = parts[6] if len(parts) > 6 else "Day 99"
             spoil_time = parts[7] if len(parts) > 7 else "11:59 P.M."
 
-            # Metadata Dict
-            meta = {
-                "type": "food",
-                "meals": int(meals),
-                "spoil_day": spoil_day,
-                "spoil_time": spoil_time
-            }
-            
-            # NEW: Dictionary Structure with 'meta' key
-            new_item = {
-                "name": name,
-                "desc": desc,
-                "amount": amount,
-                "value": value,
-                "meta": meta
-            }
+            meta = ItemMeta(type="food", meals=int(meals), spoil_day=spoil_day, spoil_time=spoil_time)
+            new_item = Item(name, desc, amount, value, meta)
 
             data = self.load_data()
+            self._index()
             if category not in data: data[category] = []
             
             # We do NOT stack food items with metadata to preserve specific spoilage dates
             data[category].append(new_item)
+            self._track_added(category, new_item)
+            self._emit("item_added", category=category, index=len(data[category]) - 1, item=new_item)
 
             self.save_data(data)
             return f"(Added {name} [Meals: {meals}, Spoils: Day {spoil_day} at {spoil_time}])."
@@ -272,44 +346,57 @@ class InventoryTab(ctk.CTkFrame):
             return f"System Error adding food: {e}"
         
     # --- NEW: Consume Logic ---
-    def consume_food(self, name, current_day, current_time):
+    def consume_food(self, name, now):
+        # now: current game time in absolute minutes (GameApp.clock)
         data = self.load_data()
-        current_ticks = self._get_ticks(current_day, current_time)
-        
-        for category, items in data.items():
-            for i, item in enumerate(items):
-                if item["name"].lower() == name.lower():
-                    # Check if it has Metadata
-                    if "meta" in item:
-                        meta = item["meta"]
-                        
-                        # 1. Spoilage Check
-                        spoil_ticks = self._get_ticks(meta.get("spoil_day", "Day 99"), meta.get("spoil_time", "Midnight"))
-                        
-                        if current_ticks >= spoil_ticks:
-                            items.pop(i)
-                            return f"System: You cannot eat {name}. It smells rotten (Spoiled on day {meta.get('spoil_day')} at {meta.get('spoil_time')}. You decide it's best to get rid of it.)."
-
-                        # 2. Consumption Logic
-                        meta["meals"] -= 1
-                        remaining = meta["meals"]
-                        msg = ""
-                        if remaining <= 0:
-                            # Finished
-                            items.pop(i)
-                            msg = f"(Ate the last of {name}. It is finished.)"
-                        else:
-                            # Edited in place
-                            msg = f"(Ate a meal of {name}. {remaining} meals remaining.)"
-                        
-                        self.save_data(data)
-                        return msg
-                    
-                    else:
-                        # Fallback for old/simple food items (just remove 1 count)
-                        return self.autonomous_remove(f"{name}|1")
-
-        return f"System: Could not find food '{name}'."
+        current_ticks = now
+
+        lookup = self._index().resolve(name)
+        if lookup.match is None:
+            return lookup.report() if lookup.ambiguous else f"System: Could not find food '{name}'."
+        category, item = lookup.match
+        items = data[category]
+        name = item.name
+
+        # Check if it has Metadata
+        if item.meta is not None:
+            meta = item.meta
+            i = self._index().position(category, item)
+
+            # 1. Spoilage Check
+            spoil_ticks = self.spoilage.spoils_at(item)
+            if spoil_ticks is None:
+                spoil_ticks = self._get_ticks("Day 99", "Midnight")
+
+            if current_ticks >= spoil_ticks:
+                items.pop(i)
+                self._track_removed(category, item)
+                self._emit("item_removed", category=category, index=i)
+                self.save_data(data)
+                return f"System: You cannot eat {name}. It smells rotten (Spoiled on day {meta.spoil_day} at {meta.spoil_time}. You decide it's best to get rid of it.)."
+
+            # 2. Consumption Logic
+            meta.meals = (meta.meals or 0) - 1
+            remaining = meta.meals
+            msg = ""
+            if remaining <= 0:
+                # Finished
+                items.pop(i)
+                self._track_removed(category, item)
+                self._emit("item_removed", category=category, index=i)
+                msg = f"(Ate the last of {name}. It is finished.)"
+            else:
+                # Edited in place
+                self._track_changed(category, item)
+                self._emit("food_consumed", category=category, index=i, item=item)
+                msg = f"(Ate a meal of {name}. {remaining} meals remaining.)"
+
+            self.save_data(data)
+            return msg
+
+        else:
+            # Fallback for old/simple food items (just remove 1 count)
+            return self.autonomous_remove(f"{name}|1")
 
     def autonomous_remove(self, raw_args):
         # Format: Item Name | Amount
@@ -324,23 +411,27 @@ class InventoryTab(ctk.CTkFrame):
 
             data = self.load_data()
             removed = False
-            
-            # Search through every category (Weapons, Potions, etc.)
-            for cat, items in data.items():
-                for i in range(len(items) - 1, -1, -1):
-                    # NEW: Access by Key
-                    if target_name.lower() in items[i]["name"].lower():
-                        try:
-                            curr = int(items[i]["amount"]) 
-                            new_val = curr - amount
-                            if new_val <= 0: items.pop(i)
-                            else: items[i]["amount"] = str(new_val)
-                            removed = True
-                        except:
-                            items.pop(i)
-                            removed = True
-                        if removed: break
-                if removed: break
+
+            # Exact name first, then an unambiguous fuzzy match (never a bare substring)
+            lookup = self._index().resolve(target_name)
+            if lookup.match is not None:
+                cat, item = lookup.match
+                items = data[cat]
+                i = self._index().position(cat, item)
+                # Uncountable amounts ("a handful") go all at once
+                new_val = item.amount - amount if item.countable else 0
+                if new_val <= 0:
+                    items.pop(i)
+                    self._track_removed(cat, item)
+                    self._emit("item_removed", category=cat, index=i)
+                else:
+                    item.amount = new_val
+                    self._track_changed(cat, item)
+                    self._emit("item_modified", category=cat, index=i, item=item)
+                removed = True
+                target_name = item.name
+            elif lookup.ambiguous:
+                return lookup.report()
             
             if removed:
                 self.save_data(data)
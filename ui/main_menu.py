@@ -1,71 +1,187 @@
 import customtkinter as ctk
 import os
 import shutil
+import time
 from config import SAVES_DIR
+from save_objects import ObjectStore
+from save_manifest import SaveManifest
 
 class MainMenu(ctk.CTkFrame):
     """The startup screen to select a save file."""
-    def __init__(self, parent, on_load_callback):
+
+    # Rows are widgets; only this many exist no matter how many saves there are
+    VISIBLE_ROWS = 7
+    SORT_OPTIONS = {"Last Played": "last_played", "Name": "name", "Turn": "turn", "Size": "size"}
+
+    def __init__(self, parent, on_load_callback, preloader=None):
         super().__init__(parent)
         self.on_load = on_load_callback
+        # Optional save_loader.AdventurePreloader: parses a save while the pointer is over it
+        self.preloader = preloader
+        self.objects = ObjectStore(SAVES_DIR)
+        self.manifest = SaveManifest(SAVES_DIR)
+        self.rows = []          # filtered + sorted [(name, entry), ...]
+        self.offset = 0         # index of the first visible row
 
         # Title
         ctk.CTkLabel(self, text="ADVENTURES", font=("Consolas", 32, "bold")).pack(pady=(40, 20))
 
-        # Scrollable list of games
-        self.scroll_frame = ctk.CTkScrollableFrame(self, width=400, height=300)
-        self.scroll_frame.pack(pady=10)
+        # Search / Sort
+        controls = ctk.CTkFrame(self, fg_color="transparent")
+        controls.pack(pady=(0, 5))
+        self.search_var = ctk.StringVar(value="")
+        self.search_var.trace_add("write", lambda *_: self.apply_filter())
+        ctk.CTkEntry(controls, textvariable=self.search_var, placeholder_text="Search name or location...",
+                     width=300).pack(side="left", padx=(0, 5))
+        self.sort_var = ctk.StringVar(value="Last Played")
+        ctk.CTkOptionMenu(controls, variable=self.sort_var, values=list(self.SORT_OPTIONS.keys()), width=140,
+                          command=lambda _: self.apply_filter()).pack(side="left")
+
+        # Virtualized list of games: a fixed pool of rows + a scrollbar over the filtered list
+        self.list_frame = ctk.CTkFrame(self, width=560)
+        self.list_frame.pack(pady=10)
+        self.rows_frame = ctk.CTkFrame(self.list_frame, fg_color="transparent")
+        self.rows_frame.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+        self.scrollbar = ctk.CTkScrollbar(self.list_frame, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.empty_label = ctk.CTkLabel(self.rows_frame, text="No saved games found.")
+        self.row_widgets = [self._make_row() for _ in range(self.VISIBLE_ROWS)]
+        for widget in (self.list_frame, self.rows_frame):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda e: self.scroll_by(-1))
+            widget.bind("<Button-5>", lambda e: self.scroll_by(1))
 
         # New Game Button
         ctk.CTkButton(self, text="+ New Adventure", fg_color="green", height=40, width=200, 
                       command=self.open_new_game_dialog).pack(pady=20)
 
+        # Storage cleanup (drops checkpoint blobs nothing refers to any more)
+        ctk.CTkButton(self, text="🧹 Clean Up Storage", fg_color="gray", height=28, width=200,
+                      command=self.collect_garbage).pack()
+        self.storage_label = ctk.CTkLabel(self, text="", text_color="gray")
+        self.storage_label.pack(pady=(5, 0))
+
         self.refresh_list()
 
+    # --- Virtualized List ---
+
+    def _make_row(self):
+        row = ctk.CTkFrame(self.rows_frame, fg_color="transparent")
+        row.grid_columnconfigure(0, weight=1)
+
+        # Load Button (Takes up most space)
+        row.btn_load = ctk.CTkButton(row, text="", height=32, width=360, anchor="w")
+        row.btn_load.grid(row=0, column=0, sticky="ew", padx=(0, 5))
+        row.lbl_meta = ctk.CTkLabel(row, text="", text_color="gray", font=("Consolas", 11), anchor="w")
+        row.lbl_meta.grid(row=1, column=0, sticky="w", padx=(4, 5))
+
+        # Checkpoints / Branches Button
+        row.btn_branch = ctk.CTkButton(row, text="⎇", width=40, height=40, fg_color="#5E35B1", hover_color="#4527A0")
+        row.btn_branch.grid(row=0, column=1, rowspan=2, padx=(0, 5))
+
+        # Rename Button (Middle, Teal)
+        row.btn_rename = ctk.CTkButton(row, text="✏️", width=40, height=40, fg_color="teal", hover_color="#00695C")
+        row.btn_rename.grid(row=0, column=2, rowspan=2, padx=(0, 5))
+
+        # Delete Button (Small, Red)
+        row.btn_del = ctk.CTkButton(row, text="❌", width=40, height=40, fg_color="red", hover_color="darkred")
+        row.btn_del.grid(row=0, column=3, rowspan=2)
+
+        for widget in (row, row.btn_load, row.lbl_meta):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda e: self.scroll_by(-1))
+            widget.bind("<Button-5>", lambda e: self.scroll_by(1))
+        # Start parsing as soon as the player points at a save
+        row.save_name = None
+        row.btn_load.bind("<Enter>", lambda e, r=row: self.preload(r.save_name))
+        return row
+
+    def preload(self, save_name):
+        if self.preloader is not None and save_name:
+            self.preloader.preload(save_name)
+
+    def _save_changed(self, save_name):
+        # Folder contents changed behind the preloader's back (rename, delete, restore, ...)
+        if self.preloader is not None:
+            self.preloader.invalidate(save_name)
+
+    @staticmethod
+    def _describe(entry):
+        parts = []
+        if entry.get("turn"): parts.append(f"Turn {entry['turn']}")
+        if entry.get("day"): parts.append(str(entry["day"]))
+        if entry.get("location"): parts.append(str(entry["location"])[:28])
+        parts.append(f"{entry.get('size', 0) / (1024 * 1024):.1f} MB")
+        played = entry.get("last_played")
+        if played:
+            parts.append(time.strftime("%Y-%m-%d %H:%M", time.localtime(played)))
+        return " · ".join(parts)
+
     def refresh_list(self):
-        # Clear list
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
+        # Picks up folders created/removed outside the game; known saves are not re-read
+        try:
+            self.manifest.reconcile()
+        except Exception as e:
+            print(f"Error reading saves: {e}")
+        self.apply_filter()
 
-        # Ensure saves folder exists
-        if not os.path.exists(SAVES_DIR):
-            os.makedirs(SAVES_DIR)
+    def apply_filter(self):
+        self.rows = self.manifest.query(self.search_var.get(), self.SORT_OPTIONS.get(self.sort_var.get(), "last_played"))
+        self.offset = 0
+        self.render_rows()
 
-        # List folders
-        saves = [d for d in os.listdir(SAVES_DIR) if os.path.isdir(os.path.join(SAVES_DIR, d))]
-        
-        if not saves:
-            ctk.CTkLabel(self.scroll_frame, text="No saved games found.").pack(pady=20)
+    def render_rows(self):
+        max_offset = max(0, len(self.rows) - self.VISIBLE_ROWS)
+        self.offset = max(0, min(self.offset, max_offset))
+
+        if not self.rows:
+            self.empty_label.pack(pady=20)
+        else:
+            self.empty_label.pack_forget()
+
+        for i, row in enumerate(self.row_widgets):
+            idx = self.offset + i
+            if idx >= len(self.rows):
+                row.pack_forget()
+                continue
+            save_name, entry = self.rows[idx]
+            row.save_name = save_name
+            row.btn_load.configure(text=f"📂 {save_name}", command=lambda s=save_name: self.on_load(s))
+            row.lbl_meta.configure(text=self._describe(entry))
+            row.btn_branch.configure(command=lambda s=save_name: self.open_checkpoints(s))
+            row.btn_rename.configure(command=lambda s=save_name: self.rename_adventure(s))
+            row.btn_del.configure(command=lambda s=save_name: self.confirm_delete(s))
+            if not row.winfo_manager():
+                row.pack(fill="x", padx=5, pady=4)
+
+        total = max(1, len(self.rows))
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.VISIBLE_ROWS) / total))
+
+    def scroll_by(self, rows):
+        self.offset += rows
+        self.render_rows()
+
+    def _on_mousewheel(self, event):
+        self.scroll_by(-1 if event.delta > 0 else 1)
+
+    def _on_scrollbar(self, *args):
+        if not args:
             return
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.rows))
+            self.render_rows()
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.VISIBLE_ROWS if len(args) > 2 and args[2] == "pages" else 1)
+            self.scroll_by(step)
 
-        # Create rows for each save
-        for i, save_name in enumerate(saves):
-            # Row container
-            row = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
-            row.pack(fill="x", padx=5, pady=5)
-            
-            # Load Button (Takes up most space)
-            btn_load = ctk.CTkButton(row, text=f"📂 {save_name}", height=40,
-                                     command=lambda s=save_name: self.on_load(s))
-            btn_load.pack(side="left", fill="x", expand=True, padx=(0, 5))
-            
-            # Rename Button (Middle, Teal)
-            btn_rename = ctk.CTkButton(row, text="✏️", width=40, height=40, fg_color="teal", hover_color="#00695C",
-                                       command=lambda s=save_name: self.rename_adventure(s))
-            btn_rename.pack(side="right", padx=(0, 5))
-            
-            # Delete Button (Small, Red)
-            btn_del = ctk.CTkButton(row, text="❌", width=40, height=40, fg_color="red", hover_color="darkred",
-                                    command=lambda s=save_name: self.confirm_delete(s))
-            btn_del.pack(side="right")
-            
     def rename_adventure(self, old_name):
         dialog = ctk.CTkInputDialog(text=f"Rename '{old_name}' to:", title="Rename Adventure")
         new_name = dialog.get_input()
         
         if new_name:
             # Sanitize the new name
-            clean_name = "".join(c for c in new_name if c.isalnum() or c in (' ', '_', '-')).strip()
+            clean_name = _clean_save_name(new_name)
             
             # Only proceed if name is valid and actually different
             if clean_name and clean_name != old_name:
@@ -78,7 +194,10 @@ class MainMenu(ctk.CTkFrame):
                     return
 
                 try:
+                    self._save_changed(old_name)
                     os.rename(old_path, new_path)
+                    self.objects.rename_adventure(old_name, clean_name)
+                    self.manifest.rename(old_name, clean_name)
                     self.refresh_list() # Refresh to show new name
                 except Exception as e:
                     print(f"Error renaming: {e}")
@@ -90,7 +209,10 @@ class MainMenu(ctk.CTkFrame):
         if response and response.strip() == "DELETE":
             full_path = os.path.join(SAVES_DIR, save_name)
             try:
+                self._save_changed(save_name)
                 shutil.rmtree(full_path)
+                self.objects.forget_adventure(save_name)
+                self.manifest.remove(save_name)
                 self.refresh_list()
             except Exception as e:
                 print(f"Error deleting: {e}")
@@ -100,10 +222,130 @@ class MainMenu(ctk.CTkFrame):
         name = dialog.get_input()
         if name:
             # Sanitize name
-            clean_name = "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).strip()
+            clean_name = _clean_save_name(name)
             if clean_name:
                 full_path = os.path.join(SAVES_DIR, clean_name)
                 if not os.path.exists(full_path):
                     os.makedirs(full_path)
                     # Trigger load immediately
-                    self.on_load(clean_name)
\ No newline at end of file
+                    self.on_load(clean_name)
+
+    # --- Checkpoints / Branches ---
+
+    def open_checkpoints(self, save_name):
+        self._save_changed(save_name)
+        CheckpointDialog(self, save_name, self.objects, on_change=lambda: self._checkpoints_changed(save_name))
+
+    def _checkpoints_changed(self, save_name):
+        self._save_changed(save_name)
+        # A restore rewrote the folder; reconcile() alone keeps the old turn/day/location
+        try:
+            self.manifest.rescan(save_name)
+        except Exception as e:
+            print(f"Error reading save: {e}")
+        self.refresh_list()
+
+    def collect_garbage(self):
+        try:
+            removed, freed = self.objects.gc()
+            self.storage_label.configure(text=f"Removed {removed} unused objects ({freed / 1024:.0f} KB freed).")
+        except Exception as e:
+            self.storage_label.configure(text=f"Cleanup failed: {e}")
+
+
+def _clean_save_name(name):
+    return "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).strip()
+
+
+class CheckpointDialog(ctk.CTkToplevel):
+    """Lists an adventure's checkpoints and lets the player create, restore, branch or delete them."""
+    def __init__(self, parent, save_name, objects, on_change):
+        super().__init__(parent)
+        self.save_name = save_name
+        self.objects = objects
+        self.on_change = on_change
+
+        self.title(f"Checkpoints - {save_name}")
+        self.geometry("560x420")
+        self.attributes("-topmost", True)
+
+        toolbar = ctk.CTkFrame(self, fg_color="transparent")
+        toolbar.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(toolbar, text="+ Checkpoint", width=120, command=self.create_checkpoint).pack(side="left", padx=(0, 5))
+        ctk.CTkButton(toolbar, text="⎇ Branch Current", width=120, command=lambda: self.branch(None)).pack(side="left")
+
+        self.list_frame = ctk.CTkScrollableFrame(self, width=520, height=300)
+        self.list_frame.pack(fill="both", expand=True, padx=10, pady=(0, 5))
+
+        self.status = ctk.CTkLabel(self, text="", text_color="gray")
+        self.status.pack(pady=(0, 5))
+
+        self.refresh()
+
+    def refresh(self):
+        for widget in self.list_frame.winfo_children():
+            widget.destroy()
+
+        refs = self.objects.list_refs(self.save_name)
+        if not refs:
+            ctk.CTkLabel(self.list_frame, text="No checkpoints yet.").pack(pady=20)
+            return
+
+        for ref, data in refs:
+            row = ctk.CTkFrame(self.list_frame, fg_color="transparent")
+            row.pack(fill="x", padx=5, pady=3)
+
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(data.get("created", 0)))
+            label = data.get("label") or ref
+            ctk.CTkLabel(row, text=f"{when}  {label}", anchor="w").pack(side="left", fill="x", expand=True)
+
+            ctk.CTkButton(row, text="❌", width=32, fg_color="red", hover_color="darkred",
+                          command=lambda r=ref: self.delete(r)).pack(side="right")
+            ctk.CTkButton(row, text="⎇", width=32, fg_color="#5E35B1", hover_color="#4527A0",
+                          command=lambda r=ref: self.branch(r)).pack(side="right", padx=(0, 5))
+            ctk.CTkButton(row, text="↺ Restore", width=80, fg_color="teal", hover_color="#00695C",
+                          command=lambda r=ref: self.restore(r)).pack(side="right", padx=(0, 5))
+
+    def create_checkpoint(self):
+        dialog = ctk.CTkInputDialog(text="Checkpoint name:", title="New Checkpoint")
+        label = dialog.get_input()
+        if not label:
+            return
+        try:
+            self.objects.checkpoint(self.save_name, f"manual-{int(time.time() * 1000)}", label=label.strip())
+            self.status.configure(text=f"Saved checkpoint '{label.strip()}'.")
+        except Exception as e:
+            self.status.configure(text=f"Checkpoint failed: {e}")
+        self.refresh()
+
+    def restore(self, ref):
+        dialog = ctk.CTkInputDialog(text="Type 'RESTORE' to roll this adventure back.\n(The current state is checkpointed first.)",
+                                    title="Restore Checkpoint")
+        response = dialog.get_input()
+        if not response or response.strip() != "RESTORE":
+            return
+        try:
+            self.objects.restore(self.save_name, ref)
+            self.status.configure(text="Restored.")
+            self.on_change()
+        except Exception as e:
+            self.status.configure(text=f"Restore failed: {e}")
+        self.refresh()
+
+    def branch(self, ref):
+        dialog = ctk.CTkInputDialog(text="Name the new branch:", title="Branch Adventure")
+        name = dialog.get_input()
+        clean_name = _clean_save_name(name or "")
+        if not clean_name:
+            return
+        try:
+            self.objects.branch(self.save_name, ref, clean_name)
+            self.status.configure(text=f"Created '{clean_name}'.")
+            self.on_change()
+        except Exception as e:
+            self.status.configure(text=f"Branch failed: {e}")
+        self.refresh()
+
+    def delete(self, ref):
+        self.objects.delete_ref(self.save_name, ref)
+        self.refresh()
\ No newline at end of file
@@ -1,10 +1,11 @@
 import customtkinter as ctk
 import os
-import json
-from tabulate import tabulate
+from state_store import JsonStore, open_section_store
 from tqdm import tqdm
 
-from time_utils import to_abs_minutes, from_abs_minutes
+from time_utils import from_abs_minutes
+from process_queue import ProcessQueue, append_archive
+from .table_view import TableView
 
 
 class ProcessingTab(ctk.CTkFrame):
@@ -21,44 +22,89 @@ class ProcessingTab(ctk.CTkFrame):
        - skill (string), skill_level_at_start (int)
 
     Work speed per hour = 10 + (10 * relevant skill level)
+
+    Completion times and archival of finished tasks go through a ProcessQueue
+    (process_queue.py); archived entries leave processing.json on the next commit.
     """
 
+    HEADERS = ["Activity", "Type", "Progress", "Yield", "Status", "Description"]
+
     def __init__(self, parent):
         super().__init__(parent)
         self.data_path = ""
+        self.store = JsonStore(list)
+        # Timer queue over the entries; kept in step by every mutation below
+        self.queue = ProcessQueue()
+        # Entries removed from processing.json this turn, appended to the archive on commit
+        self._pending_archive = []
+        # Set by GameApp: called as on_event(kind, payload) for every applied mutation
+        self.on_event = None
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
-        self.display = ctk.CTkTextbox(self, font=("Consolas", 14), wrap="none", state="disabled")
-        self.display.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        self.table = TableView(self, "ONGOING TASKS", self.HEADERS,
+                               widths={"Activity": 200, "Progress": 220, "Description": 320})
+        self.table.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
 
     def set_base_path(self, folder_path):
+        self.bind_store(folder_path, open_section_store(folder_path, "processing.json", list))
+
+    def bind_store(self, folder_path, store):
+        # store may come pre-opened from the background preloader (see save_loader.py)
         self.data_path = os.path.join(folder_path, "processing.json")
+        self.store = store
         self.refresh_display()
 
     def load_data(self):
-        if not self.data_path or not os.path.exists(self.data_path):
-            return []
-        try:
-            with open(self.data_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
-        except Exception:
-            return []
+        # In-memory copy; callers mutate it in place and hand it back to save_data()
+        return self.store.data
 
     def save_data(self, data):
+        # Deferred: GameApp commits the store (and redraws the tab) once per turn
         if not self.data_path:
             return
-        with open(self.data_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
-        self.refresh_display()
+        self.store.data = data
+        self.store.mark_dirty()
+
+    def commit(self):
+        """Writes pending changes to processing.json. Returns True if the file was written."""
+        if self._pending_archive and self.data_path:
+            append_archive(os.path.dirname(self.data_path), self._pending_archive)
+            self._pending_archive = []
+        return self.store.commit()
+
+    def _queue(self):
+        # Rebuilt only when the list object itself was replaced (load, rewind)
+        return self.queue.ensure(self.store.data)
+
+    def _archive(self, data, entries, current_abs=None):
+        """Moves entries out of the active list (into the archive file on commit)."""
+        for entry in entries:
+            idx = next((i for i, e in enumerate(data) if e is entry), -1)
+            if idx < 0:
+                continue
+            data.pop(idx)
+            self.queue.removed(entry)
+            self._emit("process_removed", index=idx)
+            archived = dict(entry)
+            if current_abs is not None:
+                archived["archived_abs_minutes"] = current_abs
+            self._pending_archive.append(archived)
+        if entries:
+            self.save_data(data)
+
+    def _emit(self, kind, **payload):
+        if self.on_event:
+            self.on_event(kind, payload)
 
     # ---------- Add ----------
 
-    def add_timed_process(self, name, desc, duration_hours, current_day, current_time_str, expected_yield):
+    def add_timed_process(self, name, desc, duration_hours, start_abs, expected_yield):
+        # start_abs: current game time in absolute minutes (GameApp.clock)
         data = self.load_data()
+        self._queue()
 
-        start_abs = to_abs_minutes(current_day, current_time_str)
+        start_abs = int(start_abs)
         dur_minutes = int(round(float(duration_hours) * 60))
         dur_minutes = max(0, dur_minutes)
 
@@ -73,6 +119,8 @@ class ProcessingTab(ctk.CTkFrame):
             "target_abs_minutes": start_abs + dur_minutes,
         }
         data.append(entry)
+        self.queue.added(entry)
+        self._emit("process_started", entry=entry)
         self.save_data(data)
 
         finish = from_abs_minutes(entry["target_abs_minutes"])
@@ -105,6 +153,7 @@ class ProcessingTab(ctk.CTkFrame):
             "work_done": 0.0,
         }
         data.append(entry)
+        self._emit("process_started", entry=entry)
         self.save_data(data)
 
         speed = 10 + (10 * lvl)
@@ -117,9 +166,16 @@ class ProcessingTab(ctk.CTkFrame):
 
     def remove_process(self, name):
         data = self.load_data()
+        self._queue()
         for i, item in enumerate(list(data)):
             if str(item.get("name", "")).lower() == str(name).lower():
+                if item.get("status") == "COMPLETED":
+                    # Collected: keep a record in the archive
+                    self._archive(data, [item])
+                    return None
                 data.pop(i)
+                self.queue.removed(item)
+                self._emit("process_removed", index=i)
                 self.save_data(data)
                 return None
         return None
@@ -136,35 +192,44 @@ class ProcessingTab(ctk.CTkFrame):
 
     # ---------- Completion / Progress ----------
 
-    def check_active_tasks(self, current_day, current_time_str):
+    def check_active_tasks(self, current_abs):
+        """
+        Completes every process due by current_abs (absolute minutes), earliest first, and
+        archives finished tasks left uncollected for longer than process_queue.ARCHIVE_AFTER_HOURS.
+        """
         data = self.load_data()
         if not data:
             return []
 
-        current_abs = to_abs_minutes(current_day, current_time_str)
+        current_abs = int(current_abs)
+        queue = self._queue()
         completed = []
         changed = False
 
-        for item in data:
-            if item.get("status") != "In Progress":
-                continue
-            if item.get("type") != "process":
-                continue
+        for item in queue.pop_due(current_abs):
+            item["status"] = "COMPLETED"
+            item["completed_abs_minutes"] = int(item.get("target_abs_minutes", current_abs))
+            queue.completed(item)
+            idx = next(i for i, e in enumerate(data) if e is item)
+            self._emit("process_completed", index=idx, entry=item)
+            y = item.get("yield", "Unknown")
+            completed.append(f"{item.get('name', 'Unknown')} (Yield: {y})")
+            changed = True
 
-            tgt = int(item.get("target_abs_minutes", 0))
-            if current_abs >= tgt:
-                item["status"] = "COMPLETED"
-                y = item.get("yield", "Unknown")
-                completed.append(f"{item.get('name', 'Unknown')} (Yield: {y})")
-                changed = True
+        for item in queue.stamp(current_abs):
+            idx = next(i for i, e in enumerate(data) if e is item)
+            self._emit("process_updated", index=idx, entry=item)
+            changed = True
 
         if changed:
             self.save_data(data)
+        self._archive(data, queue.pop_stale(current_abs), current_abs)
 
         return completed
 
     def apply_work_hours(self, name, hours_worked, skill_level):
         data = self.load_data()
+        self._queue()
 
         try:
             hrs = float(hours_worked)
@@ -181,7 +246,7 @@ class ProcessingTab(ctk.CTkFrame):
         speed = 10 + (10 * lvl)
         completed = speed * hrs
 
-        for item in data:
+        for idx, item in enumerate(data):
             if str(item.get("name", "")).lower() == str(name).lower() and item.get("type") == "project":
                 if item.get("status") != "In Progress":
                     return f"System: {name} is already done."
@@ -193,96 +258,54 @@ class ProcessingTab(ctk.CTkFrame):
 
                 if req <= 0 or done >= req:
                     item["status"] = "COMPLETED"
+                    self.queue.completed(item)
+                    self._emit("process_completed", index=idx, entry=item)
                     self.save_data(data)
                     return f"(Work Complete! {name} is finished. Yield: {item.get('yield', 'Unknown')})"
 
                 remaining = max(0.0, req - done)
+                self._emit("process_updated", index=idx, entry=item)
                 self.save_data(data)
                 return f"(Worked on {name} for {hrs:g} hrs. Remaining Work Amount: {remaining:.1f}.)"
 
         return f"System: Could not find project '{name}'."
 
-    # ---------- Context / UI ----------
+    # ---------- UI ----------
 
-    def get_text(self):
-        data = self.load_data()
-        if not data:
-            return "No active processes."
+    def _row(self, item):
+        t = item.get("type", "process")
+        y = item.get("yield", "N/A")
+        status = item.get("status", "Unknown")
+        description = item.get("desc", "Unknown")
 
-        txt = "ACTIVE TASKS:\n"
-        for item in data:
-            y = item.get("yield", "Unknown")
-            status = item.get("status", "Unknown")
-
-            if item.get("type") == "process":
-                if status == "COMPLETED":
-                    state = f"READY TO COLLECT (Yield: {y})"
-                else:
-                    tgt = from_abs_minutes(int(item.get("target_abs_minutes", 0)))
-                    state = f"Finishes {tgt.as_day_string()}, {tgt.as_time_string()} (Yield: {y})"
-                txt += f"- {item.get('name','Unknown')}: {item.get('desc','')} [{state}]\n"
+        if t == "process":
+            if status == "COMPLETED":
+                bar = tqdm.format_meter(n=100, total=100, elapsed=0, ncols=12, bar_format='{bar}', ascii=False).strip('|')
+                prog = bar
+                stat = "DONE"
             else:
-                skill = item.get("skill", "Unknown Skill")
-                req = float(item.get("work_required", 0.0) or 0.0)
-                done = float(item.get("work_done", 0.0) or 0.0)
-                if status == "COMPLETED":
-                    state = f"READY TO COLLECT (Yield: {y})"
-                else:
-                    state = f"Progress: {done:.1f}/{req:.1f} WA (Skill: {skill}) (Yield: {y})"
-                txt += f"- {item.get('name','Unknown')}: {item.get('desc','')} [{state}]\n"
-
-        return txt
+                tgt = from_abs_minutes(int(item.get("target_abs_minutes", 0)))
+                prog = f"Due: {tgt.as_day_string()}, {tgt.as_time_string()}"
+                stat = "Waiting..."
+            return (item.get("name",""), "PROCESS", prog, y, stat, description)
+
+        req = float(item.get("work_required", 0.0) or 0.0)
+        done = float(item.get("work_done", 0.0) or 0.0)
+
+        if status == "COMPLETED":
+            bar = tqdm.format_meter(n=100, total=100, elapsed=0, ncols=12, bar_format='{bar}', ascii=False).strip('|')
+            prog = bar
+            stat = "DONE"
+        else:
+            bar_str = tqdm.format_meter(n=done, total=max(req, 1.0), elapsed=0, ncols=12, bar_format='{bar}', ascii=False).strip('|')
+            lvl = int(item.get("skill_level_at_start", 0) or 0)
+            speed = 10 + (10 * lvl)
+            remaining = max(0.0, req - done)
+            hrs_left = (remaining / speed) if speed > 0 else 0.0
+            prog = f"{bar_str} ~{hrs_left:.1f} hrs left"
+            stat = "In Progress"
+        return (item.get("name",""), "PROJECT", prog, y, stat, description)
 
     def refresh_display(self):
-        data = self.load_data()
-        headers = ["Activity", "Type", "Progress", "Yield", "Status", "Description"]
-        rows = []
-
-        for item in data:
-            t = item.get("type", "process")
-            y = item.get("yield", "N/A")
-            status = item.get("status", "Unknown")
-            description = item.get("desc", "Unknown")
-
-            if t == "process":
-                if status == "COMPLETED":
-                    bar = tqdm.format_meter(n=100, total=100, elapsed=0, ncols=12, bar_format='{bar}', ascii=False).strip('|')
-                    prog = bar
-                    stat = "DONE"
-                else:
-                    tgt = from_abs_minutes(int(item.get("target_abs_minutes", 0)))
-                    prog = f"Due: {tgt.as_day_string()}, {tgt.as_time_string()}"
-                    stat = "Waiting..."
-                rows.append([item.get("name",""), "PROCESS", prog, y, stat, description])
-            else:
-                req = float(item.get("work_required", 0.0) or 0.0)
-                done = float(item.get("work_done", 0.0) or 0.0)
-
-                if status == "COMPLETED":
-                    bar = tqdm.format_meter(n=100, total=100, elapsed=0, ncols=12, bar_format='{bar}', ascii=False).strip('|')
-                    prog = bar
-                    stat = "DONE"
-                else:
-                    bar_str = tqdm.format_meter(n=done, total=max(req, 1.0), elapsed=0, ncols=12, bar_format='{bar}', ascii=False).strip('|')
-                    lvl = int(item.get("skill_level_at_start", 0) or 0)
-                    speed = 10 + (10 * lvl)
-                    remaining = max(0.0, req - done)
-                    hrs_left = (remaining / speed) if speed > 0 else 0.0
-                    prog = f"{bar_str} ~{hrs_left:.1f} hrs left"
-                    stat = "In Progress"
-
-                rows.append([item.get("name",""), "PROJECT", prog, y, stat, description])
-
-        full_text = "ONGOING TASKS\n" + tabulate(rows, headers, tablefmt="simple_grid")
-
-        self.display.configure(state="normal")
-        self.display.delete("0.0", "end")
-        self.display.insert("0.0", full_text)
-
-        txt = self.display._textbox
-        txt.tag_config("h1", font=("Consolas", 24, "bold"), foreground="#FFD700")
-        pos = txt.search("ONGOING TASKS", "1.0", stopindex="end")
-        if pos:
-            txt.tag_add("h1", pos, f"{pos} lineend")
-
-        self.display.configure(state="disabled")
+        # Only rows whose values changed are touched
+        self.table.sync([(f"task:{id(item)}", self._row(item)) for item in self.load_data()])
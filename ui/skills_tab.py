@@ -1,39 +1,53 @@
 import customtkinter as ctk
 import os
-import json
-from tabulate import tabulate
+from state_store import JsonStore, open_section_store
+from .table_view import TableView
 
 class SkillsTab(ctk.CTkFrame):
-    """Displays Skills.json using Tabulate. Handles XP Logic."""
+    """Displays Skills.json in a table view (context_serializer writes it for the prompt). Handles XP Logic."""
+
+    HEADERS = ["Skill Name", "Level (Bonus)", "XP", "Next Level"]
+
     def __init__(self, parent):
         super().__init__(parent)
         self.data_path = ""
+        self.store = JsonStore(list)
+        # Set by GameApp: called as on_event(kind, payload) for every applied mutation
+        self.on_event = None
         
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
         
-        self.display = ctk.CTkTextbox(self, font=("Consolas", 14), wrap="none", state="disabled")
-        self.display.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        self.table = TableView(self, "SKILLS", self.HEADERS)
+        self.table.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
 
     def set_base_path(self, folder_path):
+        self.bind_store(folder_path, open_section_store(folder_path, "skills.json", list))
+
+    def bind_store(self, folder_path, store):
+        # store may come pre-opened from the background preloader (see save_loader.py)
         self.data_path = os.path.join(folder_path, "skills.json")
+        self.store = store
         self.refresh_display()
 
     def load_data(self):
-        if not self.data_path or not os.path.exists(self.data_path):
-            return []
-        try:
-            with open(self.data_path, "r") as f:
-                return json.load(f)
-        except:
-            return []
+        # In-memory copy; callers mutate it in place and hand it back to save_data()
+        return self.store.data
 
     def save_data(self, data):
+        # Deferred: GameApp commits the store (and redraws the tab) once per turn
         data.sort(key=lambda x: x["Name"])
         if not self.data_path: return
-        with open(self.data_path, "w") as f:
-            json.dump(data, f, indent=4)
-        self.refresh_display()
+        self.store.data = data
+        self.store.mark_dirty()
+
+    def commit(self):
+        """Writes pending changes to skills.json. Returns True if the file was written."""
+        return self.store.commit()
+
+    def _emit(self, kind, **payload):
+        if self.on_event:
+            self.on_event(kind, payload)
 
     def force_learn_skill(self, skill_name, level):
         clean_name = skill_name.split('(')[0].strip().title()
@@ -45,6 +59,7 @@ class SkillsTab(ctk.CTkFrame):
                 item["Level"] = level
                 item["XP"] = 0
                 item["Threshold"] = 5 + (level * 2)
+                self._emit("skill_changed", skill=item)
                 found = True
                 break
         
@@ -56,40 +71,14 @@ class SkillsTab(ctk.CTkFrame):
                 "Threshold": 5 + (level * 2)
             }
             data.append(new_skill)
+            self._emit("skill_changed", skill=new_skill)
             
         self.save_data(data)
         return f"System: Set skill {clean_name} to Level {level}."
 
-    def get_text(self):
-        return self.display.get("0.0", "end")
+    def _rows(self):
+        return [(s["Name"], f"+{s['Level']}", s["XP"], s["Threshold"]) for s in self.load_data()]
 
     def refresh_display(self):
-        data = self.load_data()
-        headers = ["Skill Name", "Level (Bonus)", "XP", "Next Level"]
-        table_data = []
-        
-        for s in data:
-            lvl_str = f"+{s['Level']}"
-            table_data.append([s["Name"], lvl_str, s["XP"], s["Threshold"]])
-            
-        # Clean Title (No #)
-        full_text = "SKILLS\n" + tabulate(table_data, headers, tablefmt="simple_grid")
-        
-        self.display.configure(state="normal")
-        self.display.delete("0.0", "end")
-        self.display.insert("0.0", full_text)
-        
-        # Apply Styles
-        self._apply_styles()
-        
-        self.display.configure(state="disabled")
-
-    def _apply_styles(self):
-        """Applies styling to the main Header."""
-        txt = self.display._textbox
-        txt.tag_config("h1", font=("Consolas", 24, "bold"), foreground="#FFD700", spacing3=10)
-        
-        start_pos = "1.0"
-        pos = txt.search("SKILLS", start_pos, stopindex="end")
-        if pos:
-            txt.tag_add("h1", pos, f"{pos} lineend")
\ No newline at end of file
+        # Only rows whose values changed are touched
+        self.table.sync([(f"skill:{row[0]}", row) for row in self._rows()])
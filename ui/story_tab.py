@@ -3,10 +3,13 @@ from tqdm import tqdm
 from time_utils import normalize_day_time
 
 class StoryTab(ctk.CTkFrame):
-    def __init__(self, parent, on_send_callback, on_main_menu_callback):
+    def __init__(self, parent, on_send_callback, on_main_menu_callback, on_rewind_callback=None):
         super().__init__(parent)
         self.on_send_callback = on_send_callback
         self.on_main_menu_callback = on_main_menu_callback
+        self.on_rewind_callback = on_rewind_callback
+        # Set by GameApp (ui.UIDispatcher): chat lines printed in one frame are inserted together
+        self.dispatcher = None
         
         # --- DATA CACHE ---
         self.status_cache = {
@@ -36,6 +39,11 @@ class StoryTab(ctk.CTkFrame):
         self.btn_menu = ctk.CTkButton(self.top_row, text="🏠 Menu", width=60, height=24, 
                                       fg_color="gray", command=self.on_main_menu_callback)
         self.btn_menu.pack(side="left", padx=(0, 10))
+
+        if self.on_rewind_callback:
+            self.btn_rewind = ctk.CTkButton(self.top_row, text="⏪ Rewind", width=60, height=24,
+                                            fg_color="gray", command=self.on_rewind_callback)
+            self.btn_rewind.pack(side="left", padx=(0, 10))
         
         self.lbl_turn = ctk.CTkLabel(self.top_row, text="Turn: 1", font=("Consolas", 12, "bold"), text_color="#FFD700")
         self.lbl_turn.pack(side="left", padx=10)
@@ -86,16 +94,23 @@ class StoryTab(ctk.CTkFrame):
             self.on_send_callback(user_text)
 
     def print_text(self, text, sender="System"):
-        self.after(0, lambda: self._internal_print(text, sender))
+        # Safe from any thread
+        if self.dispatcher:
+            self.dispatcher.append("chat", (text, sender), self._print_batch)
+        else:
+            self.after(0, lambda: self._print_batch([(text, sender)]))
 
-    def _internal_print(self, text, sender):
-        self.chat_display.configure(state="normal")
+    def _format_line(self, text, sender):
         if sender == "Player":
-            self.chat_display.insert("end", f"\n> {text}\n")
+            return f"\n> {text}\n"
         elif sender == "GM":
-            self.chat_display.insert("end", f"\n{text}\n")
-        else:
-            self.chat_display.insert("end", f"\n[{text}]\n")
+            return f"\n{text}\n"
+        return f"\n[{text}]\n"
+
+    def _print_batch(self, lines):
+        # One insert and one scroll for everything printed since the last frame
+        self.chat_display.configure(state="normal")
+        self.chat_display.insert("end", "".join(self._format_line(text, sender) for text, sender in lines))
         self.chat_display.configure(state="disabled")
         self.chat_display.see("end")
 
@@ -161,6 +176,9 @@ class StoryTab(ctk.CTkFrame):
         state = "normal" if enable else "disabled"
         self.input_entry.configure(state=state)
         self.send_btn.configure(state=state)
+        # A rewind mid-turn would swap the stores under the worker thread
+        if hasattr(self, "btn_rewind"):
+            self.btn_rewind.configure(state=state)
         self.status_label.configure(text=status_text)
         if enable:
             self.input_entry.focus()
\ No newline at end of file
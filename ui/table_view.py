@@ -0,0 +1,119 @@
+import customtkinter as ctk
+from collections import Counter
+from tkinter import ttk
+
+
+class TableView(ctk.CTkFrame):
+    """
+    Title + ttk.Treeview table that is updated row by row instead of redrawn.
+
+    Rows are addressed by a caller-chosen key (the Treeview iid). The first
+    column is the tree column, so group rows (inventory categories) can hold
+    child rows. Tk only lays out the rows inside the viewport, and upsert()/
+    delete() touch a single row, so a refresh costs what changed, not the size
+    of the table. upsert() with unchanged values is a no-op.
+
+    ops counts the Tk row operations since the last reset_ops() (for benchmarks).
+    """
+
+    def __init__(self, parent, title, columns, widths=None):
+        super().__init__(parent)
+        self.columns = list(columns)
+        self._values = {}      # key -> values tuple as displayed
+        self._parent = {}      # key -> parent key ("" for top level)
+        self.ops = Counter()
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        ctk.CTkLabel(self, text=title, font=("Consolas", 24, "bold"), text_color="#FFD700",
+                     anchor="w").grid(row=0, column=0, columnspan=2, sticky="w", padx=5, pady=(5, 10))
+
+        style = ttk.Style(self)
+        style.configure("Game.Treeview", background="#2b2b2b", fieldbackground="#2b2b2b",
+                        foreground="#DCE4EE", rowheight=24, font=("Consolas", 12), borderwidth=0)
+        style.configure("Game.Treeview.Heading", background="#3a3a3a", foreground="#DCE4EE",
+                        font=("Consolas", 12, "bold"), relief="flat")
+        style.map("Game.Treeview", background=[("selected", "#1f538d")])
+
+        self.tree = ttk.Treeview(self, columns=self.columns[1:], style="Game.Treeview", selectmode="browse")
+        widths = widths or {}
+        self.tree.heading("#0", text=self.columns[0], anchor="w")
+        self.tree.column("#0", width=widths.get(self.columns[0], 220), stretch=False)
+        for col in self.columns[1:]:
+            self.tree.heading(col, text=col, anchor="w")
+            self.tree.column(col, width=widths.get(col, 120), stretch=col == self.columns[1])
+        self.tree.tag_configure("group", font=("Consolas", 13, "bold"), foreground="#FFD700")
+        self.tree.grid(row=1, column=0, sticky="nsew", padx=(5, 0), pady=5)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.tree.yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns", pady=5)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+
+    # --- Row operations ---
+
+    def has(self, key):
+        return key in self._values
+
+    def keys(self, parent=""):
+        return list(self.tree.get_children(parent))
+
+    def upsert(self, key, values, parent="", index="end", group=False):
+        values = tuple(str(v) for v in values)
+        if key in self._values:
+            if self._parent[key] != parent:
+                self.tree.move(key, parent, index)
+                self._parent[key] = parent
+                self.ops["move"] += 1
+            if self._values[key] != values:
+                self.tree.item(key, text=values[0], values=values[1:])
+                self._values[key] = values
+                self.ops["update"] += 1
+            return
+        self.tree.insert(parent, index, iid=key, text=values[0], values=values[1:],
+                         open=True, tags=("group",) if group else ())
+        self._values[key] = values
+        self._parent[key] = parent
+        self.ops["insert"] += 1
+
+    def delete(self, key):
+        if key not in self._values:
+            return
+        self._forget(key)
+        self.tree.delete(key)
+        self.ops["delete"] += 1
+
+    def _forget(self, key):
+        for child in self.tree.get_children(key):
+            self._forget(child)
+        self._values.pop(key, None)
+        self._parent.pop(key, None)
+
+    def clear(self):
+        top = self.tree.get_children("")
+        if top:
+            self.tree.delete(*top)
+        self._values.clear()
+        self._parent.clear()
+        self.ops["clear"] += 1
+
+    def sync(self, rows, parent=""):
+        """
+        Makes the children of `parent` exactly rows ([(key, values), ...] in order).
+        For small tables that don't report individual mutations; still only the
+        rows that differ are touched.
+        """
+        wanted = [key for key, _ in rows]
+        wanted_set = set(wanted)
+        for key in self.keys(parent):
+            if key not in wanted_set:
+                self.delete(key)
+        for key, values in rows:
+            self.upsert(key, values, parent)
+        if self.keys(parent) != wanted:
+            for i, key in enumerate(wanted):
+                self.tree.move(key, parent, i)
+            self.ops["move"] += len(wanted)
+
+    def reset_ops(self):
+        self.ops = Counter()